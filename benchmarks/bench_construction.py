@@ -0,0 +1,80 @@
+"""Benchmark constructArrangement on random lines, optionally against an earlier revision of the code.
+
+Usage:
+    python benchmarks/bench_construction.py --sizes 100 500 2000 --baseline HEAD~1
+    python benchmarks/bench_construction.py --sizes 5000 --storage arrays --workers 1 2 4 8 16
+
+With --baseline, src/LineArrangement.py is loaded from that git revision and timed on the same lines.
+Sizes larger than --baseline-max are skipped for the baseline, since the old code can take hours there.
+With --workers, each size is also built in parallel slabs with each number of processes and the speedup over
+the serial build is reported. The cyclic garbage collector is paused while an arrangement is built.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from bench_line import gcPaused, randomLines
+
+
+def loadRevision(rev: str) -> types.ModuleType:
+    """Load src/LineArrangement.py as it was at the given git revision"""
+    source = subprocess.check_output(["git", "show", f"{rev}:src/LineArrangement.py"], cwd=ROOT)
+    module = types.ModuleType(f"LineArrangement@{rev}")
+    exec(compile(source, f"{rev}:src/LineArrangement.py", "exec"), module.__dict__)
+    return module
+
+
+def timeConstruction(module: types.ModuleType, points: list, workers: int = 1, **options) -> tuple:
+    """Return (seconds, max intersection) for constructing the arrangement of the lines through points"""
+    lines = [module.Line(p1, p2) for p1, p2 in points]
+    arrangement = module.LineArrangement(lines, **options)
+    with gcPaused():
+        start = time.perf_counter()
+        if workers > 1:
+            arrangement.constructArrangement(workers=workers)
+        else:
+            arrangement.constructArrangement()
+        seconds = time.perf_counter() - start
+    return seconds, arrangement.maxIntersection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--baseline", help="git revision to compare against")
+    parser.add_argument("--baseline-max", type=int, default=500, help="largest size to run the baseline on")
+    parser.add_argument("--arithmetic", default="filtered")
+    parser.add_argument("--storage", default="objects")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[], help="process counts to build in parallel with")
+    args = parser.parse_args()
+
+    baseline = loadRevision(args.baseline) if args.baseline else None
+    for n in args.sizes:
+        points = randomLines(n, args.seed)
+        seconds, degree = timeConstruction(LA, points, arithmetic=args.arithmetic, storage=args.storage)
+        line = f"n={n}: {seconds:.2f} s (max intersection {degree})"
+        if baseline is not None and n <= args.baseline_max:
+            baseSeconds, baseDegree = timeConstruction(baseline, points)
+            line += f", baseline {args.baseline}: {baseSeconds:.2f} s ({baseSeconds/seconds:.1f}x)"
+            if baseDegree != degree:
+                line += f" MISMATCH: baseline max intersection {baseDegree}"
+        print(line, flush=True)
+        for workers in args.workers:
+            if workers > 1:
+                parallelSeconds, parallelDegree = timeConstruction(LA, points, workers, arithmetic=args.arithmetic,
+                                                                   storage=args.storage)
+                line = f"  {workers} workers: {parallelSeconds:.2f} s ({seconds/parallelSeconds:.2f}x)"
+                if parallelDegree != degree:
+                    line += f" MISMATCH: max intersection {parallelDegree}"
+                print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
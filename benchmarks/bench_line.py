@@ -0,0 +1,84 @@
+"""Microbenchmark for Line construction and Line.intercept on random line sets.
+
+Usage: python benchmarks/bench_line.py [n] [repeats]
+"""
+import contextlib
+import gc
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import LineArrangement as LA
+
+
+def randomLines(n: int, seed: int = 0, coordRange: int = 1000) -> list:
+    """Return n distinct lines through random integer points, a tenth of them horizontal and a tenth vertical"""
+    rng = random.Random(seed)
+    lines = []
+    seen = set()
+    while len(lines) < n:
+        x1, y1 = rng.randint(-coordRange, coordRange), rng.randint(-coordRange, coordRange)
+        if len(lines) % 10 == 0:
+            x2, y2 = x1 + rng.randint(1, coordRange), y1
+        elif len(lines) % 10 == 1:
+            x2, y2 = x1, y1 + rng.randint(1, coordRange)
+        else:
+            x2, y2 = x1 + rng.randint(1, coordRange), y1 + rng.randint(-coordRange, coordRange)
+        coefficients = LA.Line((x1, y1), (x2, y2)).coefficients()
+        if coefficients not in seen:
+            seen.add(coefficients)
+            lines.append(((x1, y1), (x2, y2)))
+    return lines
+
+
+@contextlib.contextmanager
+def gcPaused():
+    """Pause the cyclic garbage collector inside the block, restoring its previous state after
+
+    The DCEL only grows during construction, but every collection would still traverse all of its objects,
+    which makes the construction times superquadratic.
+    """
+    wasEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if wasEnabled:
+            gc.enable()
+
+
+def bestOf(repeats: int, f) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    points = randomLines(n)
+    fractionPoints = [((Fraction(x1, 3), Fraction(y1, 7)), (Fraction(x2, 3), Fraction(y2, 7))) for (x1, y1), (x2, y2) in points]
+
+    for name, pointSet in (("integer points", points), ("fraction points", fractionPoints)):
+        construct = bestOf(repeats, lambda: [LA.Line(p1, p2) for p1, p2 in pointSet])
+        lines = [LA.Line(p1, p2) for p1, p2 in pointSet]
+
+        def intersectAll():
+            for i, l1 in enumerate(lines):
+                for l2 in lines[i+1:]:
+                    l1.intercept(l2)
+
+        intersect = bestOf(repeats, intersectAll)
+        pairs = n*(n-1)//2
+        print(f"{name}: {n} lines constructed in {construct*1e3:.1f} ms, "
+              f"{pairs} intersections in {intersect:.3f} s ({pairs/intersect/1e3:.0f}k intersections/s)")
+
+
+if __name__ == "__main__":
+    main()
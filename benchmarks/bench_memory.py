@@ -0,0 +1,55 @@
+"""Measure the memory of a constructed arrangement per half edge, for each storage.
+
+Usage:
+    python benchmarks/bench_memory.py --sizes 120 250
+
+For each size, the arrangement of n random lines (as in bench_line) is built with each storage, and everything
+it allocates is measured with tracemalloc. The numbers depend on the Python version and its allocator, which
+is why the DCELArrays docstring gives them and the tests only compare the storages with each other.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from bench_line import randomLines
+
+
+def bytesPerHalfEdge(points: list, storage: str) -> tuple:
+    """Return the bytes allocated by constructing the arrangement of the lines through points, per half edge,
+    and the number of half edges"""
+    lines = [LA.Line(p1, p2) for p1, p2 in points]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        arrangement = LA.LineArrangement(lines, storage=storage)
+        arrangement.constructArrangement()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    halfEdges = sum(1 for _ in arrangement.iterHalfEdges())
+    return size / halfEdges, halfEdges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[120, 250])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        points = randomLines(n, args.seed)
+        objects, halfEdges = bytesPerHalfEdge(points, "objects")
+        arrays, _ = bytesPerHalfEdge(points, "arrays")
+        print(f"n={n} ({halfEdges:,} half edges): objects {objects:.1f} B, arrays {arrays:.1f} B per half edge "
+              f"({objects / arrays:.1f}x)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark PointLocator: build time on the arrangement of random lines, and query throughput.
+
+Usage:
+    python benchmarks/bench_point_location.py --sizes 50 200 --queries 100000
+
+Queries are uniform random points in the bounding box, located one at a time with locate() (on at most
+--single of them) and all together with locateMany().
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from PointLocation import PointLocator
+from bench_line import randomLines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--single", type=int, default=10000, help="number of queries to time locate() on")
+    parser.add_argument("--storage", default="arrays")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        arrangement = LA.LineArrangement([LA.Line(p1, p2) for p1, p2 in randomLines(n, args.seed)],
+                                         storage=args.storage)
+        arrangement.constructArrangement()
+        start = time.perf_counter()
+        locator = PointLocator(arrangement, seed=args.seed)
+        build = time.perf_counter() - start
+
+        left, right, top, bottom = (float(v) for v in arrangement._box)
+        rng = random.Random(args.seed)
+        points = [(rng.uniform(left, right), rng.uniform(bottom, top)) for _ in range(args.queries)]
+        start = time.perf_counter()
+        for p in points[:args.single]:
+            locator.locate(p)
+        single = min(args.single, len(points)) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        locator.locateMany(points)
+        batch = len(points) / (time.perf_counter() - start)
+        print(f"n={n} ({arrangement.faceCount()} faces): build {build:.2f} s, locate {single:,.0f} points/s, "
+              f"locateMany {batch:,.0f} points/s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark QLinesSolver against the naive approach of building the arrangement of all the lines.
+
+Usage:
+    python benchmarks/bench_qlines.py --sizes 100 300 1000 --Q 5 --workers 1 2
+
+Each workload is n random lines (as in bench_line), with Q - 1 of them replaced by lines through a random point
+on the first one when --planted is given, so that a point on Q lines exists. Compared are constructArrangement
+followed by maxIntersection, maxConcurrency, and QLinesSolver with each number of workers; all must agree on
+whether there is a point on Q lines.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from QLinesSolver import QLinesSolver
+from bench_line import randomLines
+
+
+def plantedLines(n: int, Q: int, seed: int) -> list:
+    """Return n random lines, Q of them through a random point of the first one"""
+    lines = [LA.Line(p1, p2) for p1, p2 in randomLines(n, seed)]
+    rng = random.Random(seed)
+    x = rng.randint(-1000, 1000)
+    a, b, c = lines[0].coefficients()
+    point = (x, LA.Fraction(c - a*x, b)) if b != 0 else (LA.Fraction(c, a), x)
+    for i in range(1, Q):
+        lines[i] = LA.Line(point, (point[0] + rng.randint(1, 1000), point[1] + rng.randint(-1000, 1000)))
+    return lines
+
+
+def timed(f):
+    start = time.perf_counter()
+    result = f()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--Q", type=int, default=5)
+    parser.add_argument("--planted", action="store_true", help="make sure a point on Q lines exists")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--k", type=int, default=None, help="lines sampled per level, by default sqrt of those left")
+    parser.add_argument("--naive-max", type=int, default=1000, help="largest size to build the full arrangement for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        if args.planted:
+            lines = plantedLines(n, args.Q, args.seed)
+        else:
+            lines = [LA.Line(p1, p2) for p1, p2 in randomLines(n, args.seed)]
+        results = []
+        if n <= args.naive_max:
+            def naive():
+                arrangement = LA.LineArrangement(lines)
+                arrangement.constructArrangement()
+                return arrangement.maxIntersection() >= args.Q
+            results.append(("full arrangement",) + timed(naive))
+        results.append(("maxConcurrency",) + timed(lambda: LA.maxConcurrency(lines)[0] >= args.Q))
+        for workers in args.workers:
+            solver = QLinesSolver(lines, k=args.k, workers=workers, seed=args.seed)
+            seconds, point = timed(lambda: solver.solve(args.Q))
+            results.append((f"QLinesSolver, {workers} workers ({solver.arrangements} arrangements, "
+                            f"{solver.regionsSearched} regions, {solver.pruned} pruned)", seconds, point is not None))
+        print(f"n={n}, Q={args.Q}:")
+        for name, seconds, found in results:
+            print(f"  {name}: {seconds:.3f} s, {'found' if found else 'none'}"
+                  + ("" if found == results[0][2] else " MISMATCH"), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark LineRanking: build time, memory, and query throughput against sorting the lines for each query.
+
+Usage:
+    python benchmarks/bench_ranking.py --sizes 100 300 --queries 100000
+
+Queries are at uniform random x (and y) over the range of the vertices of n random lines (as in bench_line), at
+a uniform random rank. kthLineAt and countAbove are timed on at most --single queries, and the naive approach,
+which computes the y of every line at x, on at most --naive of them.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from LineRanking import LineRanking
+from bench_line import randomLines
+
+
+def naiveKth(coefficients: list, x: float, k: int) -> int:
+    ys = [(c - a*x) / b for a, b, c in coefficients]
+    return sorted(range(len(ys)), key=ys.__getitem__, reverse=True)[k - 1]
+
+
+def rate(count: int, f) -> float:
+    start = time.perf_counter()
+    f()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--single", type=int, default=10000, help="number of queries to time one at a time")
+    parser.add_argument("--naive", type=int, default=1000, help="number of queries to time the naive approach on")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        lines = [LA.Line(p1, p2) for p1, p2 in randomLines(n, args.seed)]
+        start = time.perf_counter()
+        ranking = LineRanking(lines)
+        build = time.perf_counter() - start
+        size = sum(len(a) * a.itemsize for a in (ranking._offsets, ranking._changeX, ranking._changeLine))
+
+        left, right, top, bottom = (float(v) for v in LA.LineArrangement(lines).extremePoints())
+        rng = random.Random(args.seed)
+        xs = [rng.uniform(left, right) for _ in range(args.queries)]
+        ks = [rng.randint(1, ranking.count) for _ in xs]
+        points = [(x, rng.uniform(bottom, top)) for x in xs]
+        single = min(args.single, len(xs))
+        naive = min(args.naive, len(xs))
+        coefficients = [[float(v) for v in line.coefficients()] for line in lines if not line.isVertical()]
+
+        print(f"n={n}: build {build:.2f} s, {len(ranking._changeLine):,} rank changes in {size / 2**20:.1f} MiB",
+              flush=True)
+        kth = rate(single, lambda: [ranking.kthLineAt(x, k) for x, k in zip(xs[:single], ks)])
+        kthMany = rate(len(xs), lambda: ranking.kthLineAtMany(xs, ks))
+        kthNaive = rate(naive, lambda: [naiveKth(coefficients, x, k) for x, k in zip(xs[:naive], ks)])
+        print(f"  kthLineAt {kth:,.0f}/s, kthLineAtMany {kthMany:,.0f}/s, naive {kthNaive:,.0f}/s", flush=True)
+        above = rate(single, lambda: [ranking.countAbove(p) for p in points[:single]])
+        aboveMany = rate(len(points), lambda: ranking.countAboveMany(points))
+        print(f"  countAbove {above:,.0f}/s, countAboveMany {aboveMany:,.0f}/s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark exportArrays and the rendering of large arrangements to PNG and SVG.
+
+Usage:
+    python benchmarks/bench_rendering.py --sizes 100 330 --formats png svg
+
+For each size, the arrangement of n random lines (as in bench_line) is built with storage="arrays", then timed
+are exportArrays, drawing it (faces, edges and vertices, one collection each) and writing each format, without
+a display. 330 lines make an arrangement of about 100k edges.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from Rendering import drawArrangement, exportArrays
+from bench_line import randomLines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 330])
+    parser.add_argument("--formats", nargs="+", default=["png", "svg"])
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in args.sizes:
+            arrangement = LA.LineArrangement([LA.Line(p1, p2) for p1, p2 in randomLines(n, args.seed)],
+                                             storage="arrays")
+            arrangement.constructArrangement()
+
+            start = time.perf_counter()
+            arrays = exportArrays(arrangement)
+            export = time.perf_counter() - start
+            print(f"n={n} ({len(arrays['segments']):,} edges, {arrangement.faceCount():,} faces): "
+                  f"exportArrays {export:.2f} s", flush=True)
+            for fmt in args.formats:
+                start = time.perf_counter()
+                ax = drawArrangement(arrangement, arrays=arrays)
+                draw = time.perf_counter() - start
+                path = os.path.join(directory, f"arrangement.{fmt}")
+                ax.figure.savefig(path, dpi=args.dpi, bbox_inches="tight")
+                write = time.perf_counter() - start - draw
+                print(f"  {fmt}: draw {draw:.2f} s, write {write:.2f} s, {os.path.getsize(path) / 2**20:.1f} MiB",
+                      flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Benchmark suite: time each stage of the construction on reproducible workloads, over a range of sizes.
+
+Usage:
+    python benchmarks/bench_suite.py --sizes 10 100 1000 --output results.json
+    python benchmarks/bench_suite.py --sizes 10 100 1000 --compare results.json --tolerance 0.25
+    python benchmarks/bench_suite.py --workloads concurrent axisAligned --sizes 100 500 5000 --budget 600
+
+Workloads (each a list of n distinct lines, the same for the same n and --seed):
+    general       lines through random integer points, never horizontal or vertical
+    concurrent    lines through about sqrt(n) shared points, so vertices have degree about sqrt(n)
+    nearParallel  lines with slopes 1 + k/10^6, meeting far away, at points with large coordinates
+    axisAligned   45% horizontal and 45% vertical lines, and 10% random ones crossing the grid they form
+
+Stages, each timed on an arrangement set up for it but not built any further, best of --repeats:
+    extremePoints, boundingBox, addLine (the distinct lines into the bounding box moved clear of them, as
+    constructArrangement adds them), and the whole of constructArrangement.
+
+Results are written as JSON with --output. With --compare, every time is checked against a saved result file
+and a time more than --tolerance slower than the baseline is reported as a regression (times under --floor
+seconds are too noisy to compare and are skipped), and the exit status is 1 if there was any. The scaling
+exponent printed for each workload and stage is the slope of log(time) against log(n) over the sizes run.
+A workload stops at the first size whose construction takes more than --budget seconds.
+"""
+import argparse
+import datetime
+import gc
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from bench_line import gcPaused
+
+STAGES = ("extremePoints", "boundingBox", "addLine", "constructArrangement")
+
+
+def distinctLines(n: int, rng: random.Random, pointPair) -> list:
+    """Return n point pairs drawn with pointPair(rng), skipping any that repeat an earlier line"""
+    lines = []
+    seen = set()
+    while len(lines) < n:
+        p, q = pointPair(rng)
+        if p == q:
+            continue
+        coefficients = LA.Line(p, q).coefficients()
+        if coefficients not in seen:
+            seen.add(coefficients)
+            lines.append((p, q))
+    return lines
+
+
+def generalLines(n: int, seed: int) -> list:
+    def pointPair(rng):
+        x1, y1 = rng.randint(-1000, 1000), rng.randint(-1000, 1000)
+        return (x1, y1), (x1 + rng.randint(1, 1000), y1 + rng.choice((-1, 1)) * rng.randint(1, 1000))
+    return distinctLines(n, random.Random(seed), pointPair)
+
+
+def concurrentLines(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    centers = [(rng.randint(-1000, 1000), rng.randint(-1000, 1000)) for _ in range(max(2, math.isqrt(n)))]
+
+    def pointPair(rng):
+        center = rng.choice(centers)
+        return center, (center[0] + rng.randint(1, 1000), center[1] + rng.randint(-1000, 1000))
+    return distinctLines(n, rng, pointPair)
+
+
+def nearParallelLines(n: int, seed: int) -> list:
+    def pointPair(rng):
+        y = rng.randint(-1000, 1000)
+        return (0, y), (10**6, y + 10**6 + rng.randint(-n, n))
+    return distinctLines(n, random.Random(seed), pointPair)
+
+
+def axisAlignedLines(n: int, seed: int) -> list:
+    def pointPair(rng):
+        x, y = rng.randint(-1000, 1000), rng.randint(-1000, 1000)
+        kind = rng.random()
+        if kind < 0.45:
+            return (x, y), (x + 1, y)
+        if kind < 0.9:
+            return (x, y), (x, y + 1)
+        return (x, y), (x + rng.randint(1, 1000), y + rng.randint(-1000, 1000))
+    lines = distinctLines(n, random.Random(seed), pointPair)
+    # at least one line that is neither horizontal nor vertical, so the lines always intersect
+    if all(p[0] == q[0] or p[1] == q[1] for p, q in lines):
+        lines[-1] = ((0, 0), (997, 991))
+    return lines
+
+
+WORKLOADS = {"general": generalLines, "concurrent": concurrentLines, "nearParallel": nearParallelLines,
+             "axisAligned": axisAlignedLines}
+
+
+def bestOf(repeats: int, setup, timed) -> tuple:
+    """Return the shortest time of timed(setup()), with setup() left out and the garbage collector paused, and
+    the arrangement it ran on"""
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        arrangement = setup()
+        gc.collect()
+        with gcPaused():
+            start = time.perf_counter()
+            timed(arrangement)
+            seconds = time.perf_counter() - start
+        if seconds < best:
+            best, result = seconds, arrangement
+    return best, result
+
+
+def timeStages(points: list, repeats: int, arithmetic: str, storage: str) -> dict:
+    """Return the best time of each stage for the lines through points, and the arrangement's summary"""
+    lines = [LA.Line(p, q) for p, q in points]
+
+    def fresh():
+        return LA.LineArrangement(list(lines), arithmetic=arithmetic, storage=storage)
+
+    def boxed():
+        # the box and the distinct lines exactly as constructArrangement makes them
+        arrangement = fresh()
+        return arrangement, arrangement._boxLines()
+
+    times = {}
+    times["extremePoints"], _ = bestOf(repeats, fresh, lambda a: a.extremePoints())
+    extremes = fresh().extremePoints()
+    times["boundingBox"], _ = bestOf(repeats, fresh, lambda a: a.boundingBox(*extremes))
+    times["addLine"], _ = bestOf(repeats, boxed, lambda boxed: boxed[0]._addLines(boxed[1]))
+    times["constructArrangement"], arrangement = bestOf(repeats, fresh, lambda a: a.constructArrangement())
+    return times, arrangement.summary()
+
+
+def scalingExponent(sizes: list, times: list) -> float:
+    """Return the least squares slope of log(time) against log(n), or None with fewer than two usable points"""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+    meanX = sum(x for x, _ in points) / len(points)
+    meanY = sum(y for _, y in points) / len(points)
+    spread = sum((x - meanX)**2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - meanX) * (y - meanY) for x, y in points) / spread
+
+
+def gitRevision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list, baseline: dict, tolerance: float, floor: float) -> list[str]:
+    """Return a description of each time in results more than tolerance slower than the same one in baseline"""
+    baseTimes = {(r["workload"], r["n"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        base = baseTimes.get((r["workload"], r["n"], r["stage"]))
+        if base is None or max(base, r["seconds"]) < floor:
+            continue
+        if r["seconds"] > base * (1 + tolerance):
+            regressions.append(f"{r['workload']} n={r['n']} {r['stage']}: {r['seconds']:.4f} s, baseline "
+                               f"{base:.4f} s ({r['seconds']/base:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100, 300, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--arithmetic", default="filtered")
+    parser.add_argument("--storage", default="objects")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=300, help="seconds of construction after which a workload stops")
+    parser.add_argument("--output", help="file to write the results to, as JSON")
+    parser.add_argument("--compare", help="result file to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed before it is a regression")
+    parser.add_argument("--floor", type=float, default=0.005, help="seconds under which times are not compared")
+    args = parser.parse_args()
+
+    results = []
+    for workload in args.workloads:
+        sizes = []
+        for n in sorted(args.sizes):
+            times, (maxDegree, vertices, faces) = timeStages(WORKLOADS[workload](n, args.seed), args.repeats,
+                                                             args.arithmetic, args.storage)
+            sizes.append(n)
+            for stage in STAGES:
+                results.append({"workload": workload, "n": n, "stage": stage, "seconds": times[stage],
+                                "maxDegree": maxDegree, "vertices": vertices, "faces": faces})
+            print(f"{workload} n={n}: " + ", ".join(f"{stage} {times[stage]:.4f} s" for stage in STAGES)
+                  + f" (max degree {maxDegree}, {vertices} vertices)", flush=True)
+            if times["constructArrangement"] > args.budget:
+                print(f"{workload}: over the budget, skipping larger sizes", flush=True)
+                break
+        for stage in STAGES:
+            exponent = scalingExponent(sizes, [r["seconds"] for r in results
+                                               if r["workload"] == workload and r["stage"] == stage])
+            if exponent is not None:
+                print(f"  {stage}: time ~ n^{exponent:.2f}")
+
+    report = {
+        "meta": {"date": datetime.datetime.now().isoformat(timespec="seconds"), "revision": gitRevision(),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "arithmetic": args.arithmetic, "storage": args.storage, "seed": args.seed,
+                 "repeats": args.repeats},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.floor)
+        revision = baseline["meta"].get("revision")
+        print(f"{len(regressions)} regressions against {args.compare}" + (f" ({revision})" if revision else ""))
+        for regression in regressions:
+            print("  " + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
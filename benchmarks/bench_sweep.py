@@ -0,0 +1,71 @@
+"""Benchmark sweepVertices against constructArrangement for counting the vertices of each degree.
+
+Usage:
+    python benchmarks/bench_sweep.py --sizes 100 300 1000 --arrangement-max 300
+
+For each size, the degree histogram of the intersection points of n random lines (as in bench_line) is computed
+by streaming them from sweepVertices and by building the arrangement, which must agree. The peak memory of each
+is measured with tracemalloc in a second run, as tracing slows everything down. The topological sweep takes
+O(n^2) time and O(n) memory, so its time grows about fourfold and its memory about twofold when n doubles, while
+the arrangement keeps all O(n^2) of its vertices and edges.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+import LineArrangement as LA
+from LineSweep import sweepVertices
+from bench_line import randomLines
+
+
+def sweepHistogram(lines: list) -> dict:
+    histogram = {}
+    for _, indices in sweepVertices(lines):
+        histogram[len(indices)] = histogram.get(len(indices), 0) + 1
+    return dict(sorted(histogram.items()))
+
+
+def arrangementHistogram(lines: list) -> dict:
+    arrangement = LA.LineArrangement(lines, storage="arrays")
+    arrangement.constructArrangement()
+    # the vertices of degree 1 are where the lines cross the bounding box
+    return {degree: count for degree, count in arrangement.degreeHistogram().items() if degree > 1}
+
+
+def measure(f, lines: list) -> tuple:
+    """Return the seconds f(lines) takes, its peak memory in bytes, and its result"""
+    start = time.perf_counter()
+    result = f(lines)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    f(lines)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--arrangement-max", type=int, default=300,
+                        help="largest size to build the arrangement for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        lines = [LA.Line(p1, p2) for p1, p2 in randomLines(n, args.seed)]
+        seconds, peak, histogram = measure(sweepHistogram, lines)
+        print(f"n={n} ({sum(histogram.values())} vertices):", flush=True)
+        print(f"  sweepVertices: {seconds:.2f} s, peak {peak / 2**20:.1f} MiB", flush=True)
+        if n <= args.arrangement_max:
+            seconds, peak, expected = measure(arrangementHistogram, lines)
+            check = "" if expected == histogram else " MISMATCH"
+            print(f"  constructArrangement: {seconds:.2f} s, peak {peak / 2**20:.1f} MiB{check}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
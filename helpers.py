@@ -0,0 +1,113 @@
+"""Line generators and assertions shared by the test modules"""
+import random
+
+from src.LineArrangement import *
+
+
+def smallLines(n: int, seed: int) -> list[Line]:
+    """Return n distinct lines through points with small integer coordinates"""
+    rng = random.Random(seed)
+    lines = []
+    seen = set()
+    while len(lines) < n:
+        p = (rng.randint(-9, 9), rng.randint(-9, 9))
+        q = (rng.randint(-9, 9), rng.randint(-9, 9))
+        if p == q:
+            continue
+        line = Line(p, q)
+        if line.coefficients() not in seen:
+            seen.add(line.coefficients())
+            lines.append(line)
+    return lines
+
+
+def spreadLines(n: int, seed: int) -> list[Line]:
+    """Return n distinct lines through random points, spread out enough to keep them off the box corners"""
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < n:
+        p = (rng.randint(-1000, 1000), rng.randint(-1000, 1000))
+        q = (rng.randint(-1000, 1000), rng.randint(-1000, 1000))
+        if p != q and all(Line(p, q).coefficients() != line.coefficients() for line in lines):
+            lines.append(Line(p, q))
+    return lines
+
+
+def crowdedLines(n: int, seed: int, spread: int = 4) -> list[Line]:
+    """Return n lines through random points in a square grid, by default 9x9, with copies, parallel lines, lines
+    through box corners and, if the grid is small, many concurrent lines"""
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < n:
+        p = (rng.randint(-spread, spread), rng.randint(-spread, spread))
+        q = (rng.randint(-spread, spread), rng.randint(-spread, spread))
+        if p != q:
+            lines.append(Line(p, q))
+    return lines
+
+
+def halfEdges(LA: LineArrangement) -> list[HalfEdge]:
+    """Return every half edge reachable from outsideEdge"""
+    edges = []
+    visited = set()
+    stack = [LA.outsideEdge]
+    while stack:
+        edge = stack.pop()
+        if edge in visited:
+            continue
+        visited.add(edge)
+        edges.append(edge)
+        stack.append(edge.next())
+        stack.append(edge.twin())
+    return edges
+
+
+def topology(LA: LineArrangement):
+    """Return the sorted half edges (origin, dest, boundedFace) and vertices (coord, degree) reachable from outsideEdge"""
+    edges = []
+    vertices = {}
+    for edge in halfEdges(LA):
+        edges.append((edge.origin().coord(), edge.dest().coord(), edge.boundedFace()))
+        vertices[edge.origin().coord()] = edge.origin().degree
+    return sorted(edges), sorted(vertices.items())
+
+
+def innerDegrees(LA: LineArrangement) -> list[tuple]:
+    """Return the coordinates and degrees of the intersection points, the vertices inside the box of degree > 1"""
+    left, right, top, bottom = LA._box
+    return sorted((v.coord(), v.degree) for v in LA.iterVertices()
+                  if v.degree > 1 and left < v.coord()[0] < right and bottom < v.coord()[1] < top)
+
+
+class ArrangementAssertions:
+    """Assertions on the structure of an arrangement, mixed into the TestCase classes that check it"""
+
+    def assertValidDCEL(self, LA: LineArrangement):
+        for edge in halfEdges(LA):
+            self.assertEqual(edge, edge.twin().twin())
+            self.assertEqual(edge, edge.next().prev())
+            self.assertEqual(edge.dest(), edge.next().origin())
+            self.assertEqual(edge.dest(), edge.twin().origin())
+            self.assertEqual(edge.origin(), edge.origin().incEdge().origin())
+
+    def assertValidFaces(self, LA: LineArrangement):
+        faces = LA.faces()
+        self.assertEqual(len(faces), LA.faceCount())
+        self.assertEqual(LA.summary()[2], LA.faceCount())
+        # the boundaries of the faces are exactly the cycles of bounded half edges
+        bounded = set()
+        for edge in halfEdges(LA):
+            if edge.boundedFace():
+                bounded.add(edge)
+                self.assertIn(edge.face(), faces)
+            else:
+                self.assertIsNone(edge.face())
+        onBoundary = set()
+        for face in faces:
+            boundary = list(face.boundary())
+            self.assertEqual(len(boundary), face.size())
+            for edge in boundary:
+                self.assertEqual(face, edge.face())
+                self.assertNotIn(edge, onBoundary)
+                onBoundary.add(edge)
+        self.assertEqual(bounded, onBoundary)
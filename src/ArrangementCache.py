@@ -0,0 +1,158 @@
+from __future__ import annotations
+import hashlib
+import os
+from collections import OrderedDict
+
+try:
+    from .LineArrangement import Line, LineArrangement
+except ImportError:
+    from LineArrangement import Line, LineArrangement
+
+
+def lineSetKey(lines: list[Line]) -> str:
+    """Return a hash of a set of lines that only depends on the lines, not on their order or points
+
+    The key is the SHA-256 digest of the normalized coefficients (a, b, c) of the lines, sorted, so two lists
+    holding the same lines (with the same number of copies of each) get the same key.
+    """
+    digest = hashlib.sha256()
+    for a, b, c in sorted(line.coefficients() for line in lines):
+        digest.update(f"{a},{b},{c};".encode())
+    return digest.hexdigest()
+
+
+class ArrangementCache:
+    """Keep constructed arrangements so the same set of lines is only ever built once
+
+    Arrangements are looked up by lineSetKey, first in an in-memory LRU cache, then in an optional directory
+    of files written by LineArrangement.save, and only built on a miss in both. The files are named after the
+    key, the arithmetic and the storage, so caches with other settings can share a directory. The lines are sorted by their
+    coefficients before being built, so an arrangement does not depend on the order the lines were given in
+    either (maxIntersectionVertex breaks ties by the order the lines are added). The arrangements returned
+    are shared between callers and must not be changed; the ones read from the directory are read-only.
+
+    The memory cache is bounded by the total size of its arrangements, counted in half edges (an arrangement
+    of n lines with vertex degrees d has 2(n + 4 + sum(d)) of them). The least recently used arrangements are
+    evicted first, and one larger than the whole budget is returned without being kept. Summaries are kept
+    apart, in an LRU cache of their own bounded by their number, as they stay useful long after the
+    arrangement is evicted.
+
+    Attributes:
+        hits: lookups answered without building an arrangement, from memory or from the directory
+        diskHits: the part of hits answered from the directory
+        misses: lookups that built an arrangement
+        size: the half edges of the arrangements held in memory
+
+    Args:
+        maxHalfEdges: the memory budget, in half edges
+        directory: where to save every arrangement built and look for ones built before, or None
+        maxSummaries: the number of summaries to keep
+        arithmetic, storage: as for LineArrangement
+    """
+    def __init__(self, maxHalfEdges: int = 10_000_000, directory: str = None, maxSummaries: int = 100_000,
+                 arithmetic: str = "filtered", storage: str = "arrays"):
+        self.maxHalfEdges = maxHalfEdges
+        self.directory = directory
+        self.maxSummaries = maxSummaries
+        self.arithmetic = arithmetic
+        self.storage = storage
+
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+        self.size = 0
+
+        # key -> (arrangement, size), least recently used first
+        self._arrangements = OrderedDict()
+        # key -> summary, least recently used first
+        self._summaries = OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+
+    def arrangement(self, lines: list[Line]) -> LineArrangement:
+        """Return the arrangement of lines, built only if it is neither in memory nor in the directory
+
+        Raises:
+            ValueError: if no two lines intersect, as for constructArrangement
+        """
+        key = lineSetKey(lines)
+        entry = self._arrangements.get(key)
+        if entry is not None:
+            self._arrangements.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            LA = LineArrangement.load(path)
+            self.hits += 1
+            self.diskHits += 1
+        else:
+            LA = LineArrangement(sorted(lines, key=Line.coefficients), arithmetic=self.arithmetic,
+                                 storage=self.storage)
+            LA.constructArrangement()
+            self.misses += 1
+            if path is not None:
+                # write to a temporary name first, so a crash never leaves a partial file under the key, and
+                # remove it if the write fails
+                partial = path + ".partial"
+                try:
+                    LA.save(partial)
+                    os.replace(partial, path)
+                finally:
+                    if os.path.exists(partial):
+                        os.remove(partial)
+        self._keep(key, LA)
+        return LA
+
+
+    def summary(self, lines: list[Line]) -> tuple[int]:
+        """Return LineArrangement.summary() for the arrangement of lines, building it only on a miss
+
+        Lines of which no two intersect are summarized without an arrangement.
+        """
+        key = lineSetKey(lines)
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+            self.hits += 1
+            return summary
+
+        try:
+            summary = self.arrangement(lines).summary()
+        except ValueError:
+            # no two lines intersect: n distinct parallel lines cut the plane into n + 1 strips
+            self.misses += 1
+            summary = (0, 0, len({line.coefficients() for line in lines}) + 1)
+        self._summaries[key] = summary
+        if len(self._summaries) > self.maxSummaries:
+            self._summaries.popitem(last=False)
+        return summary
+
+
+    def clear(self):
+        """Empty the memory caches, leaving the directory and the counters as they are"""
+        self._arrangements.clear()
+        self._summaries.clear()
+        self.size = 0
+
+
+    def _path(self, key: str) -> str:
+        """Return the file of the arrangement with the given key and this cache's settings, or None"""
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{key}-{self.arithmetic}-{self.storage}.larr")
+
+
+    def _keep(self, key: str, LA: LineArrangement):
+        """Add an arrangement to the memory cache, evicting the least recently used ones to make room"""
+        size = 2 * (len(LA.lines) + 4 + sum(degree * count for degree, count in LA.degreeHistogram().items()))
+        if size > self.maxHalfEdges:
+            return
+        self._arrangements[key] = (LA, size)
+        self.size += size
+        while self.size > self.maxHalfEdges:
+            _, (_, evictedSize) = self._arrangements.popitem(last=False)
+            self.size -= evictedSize
@@ -1,5 +1,31 @@
 from __future__ import annotations
+import cProfile
+import json
+import math
+import mmap
+import operator
+import pstats
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from fractions import Fraction
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# unit roundoff of float64 and an absolute slack covering underflow in the filtered predicates
+_EPS = 2.0 ** -53
+_TINY = 2.0 ** -1000
+
+# sides of the bounding box, in the order the outside edges visit them
+_TOP, _RIGHT, _BOTTOM, _LEFT = range(4)
 
 
 class LineArrangement:
@@ -14,25 +40,259 @@ class LineArrangement:
     Attributes:
         lines: a list of lines in the plane.
         outsideEdge: an edge adjacent to the outside unbounded face
+        faces: the faces inside the bounding box (see faces and faceCount)
         maxDegree: the maximum degree of a vertex
+        dcel: the DCELArrays store holding the vertices and half edges when storage="arrays", otherwise None
+        arithmetic: the arithmetic used for the geometric predicates and new vertices
+        stats: the ConstructionStats being recorded (see enableStats), or None
 
+    Args:
+        lines: a list of lines in the plane.
+        arithmetic: "filtered" evaluates orientation tests in floating point with an error bound and falls back
+            to exact Fractions only when the float result cannot be trusted, "exact" always uses Fractions and
+            "float" trusts floating point everywhere (fastest, but degenerate inputs may be mishandled).
+            "filtered" and "exact" build identical arrangements.
+        storage: "objects" to build the DCEL out of individual Vertex and HalfEdge objects, or "arrays" to
+            keep it in the flat integer arrays of a DCELArrays store (see DCELArrays for the memory savings)
     """
-    def __init__(self, lines: list[Line]):
+    def __init__(self, lines: list[Line], arithmetic: str = "filtered", storage: str = "objects"):
         self.lines = lines
         self.outsideEdge = None
-        self._maxIntersectionVertex = None
 
+        # the vertices of each degree >= 1, in the order they reached it, and the highest degree with a vertex
+        # (see verticesWithDegreeAtLeast and topK); a bucket is a dict of vertices, or with storage="arrays" a
+        # VertexBucket linking vertex indices
+        self._degreeBuckets = {}
+        self._maxDegree = 0
+        # for a loaded arrangement, the saved vertex order and bucket sizes the index is filled from on first use
+        self._savedDegrees = None
+
+        # the faces inside the bounding box, in the order they were created (a dict of faces, or with
+        # storage="arrays" a FaceTable), and for a loaded arrangement the saved face indices the table is
+        # filled from on first use
+        self._faces = {}
+        self._savedFaces = None
+
+        # each distinct line in the arrangement by its coefficients, the copy of it the half edges refer to, and
+        # the number of copies of the lines given more than once (see _distinctLines)
+        self._lineKeys = {}
+        self._copies = {}
+
+        # the bounding box and, for each side, its line and its outside edges sorted along it (see leftMostedge)
+        self._box = None
+        self._boxSides = None
+        self._sideIndex = None
+        self._sideKeys = None
+        self._sideEdges = None
+
+        # predicates and constructions used by lineEdgeInt
+        if arithmetic == "filtered":
+            self._side = _sideFiltered
+            self._crossing = _crossingExact
+        elif arithmetic == "exact":
+            self._side = _sideExact
+            self._crossing = _crossingExact
+        elif arithmetic == "float":
+            self._side = _sideFloat
+            self._crossing = _crossingFloat
+        else:
+            raise ValueError(f"unknown arithmetic '{arithmetic}', expected 'filtered', 'exact' or 'float'")
+        self.arithmetic = arithmetic
+        self.stats = None
+
+        # factories used for every vertex and half edge the construction creates
+        if storage == "objects":
+            self.dcel = None
+            self._newVertex = Vertex
+            self._newHalfEdge = HalfEdge
+            self._newFace = Face
+            self._newBucket = dict
+            self._newFaceTable = dict
+        elif storage == "arrays":
+            self.dcel = DCELArrays()
+            self._newVertex = self.dcel.newVertex
+            self._newHalfEdge = self.dcel.newHalfEdge
+            self._newFace = self.dcel.newFace
+            self._newBucket = self.dcel.newBucket
+            self._newFaceTable = self.dcel.faceTable
+        else:
+            raise ValueError(f"unknown storage '{storage}', expected 'objects' or 'arrays'")
+
+
+    def constructArrangement(self, workers: int = 1, box: tuple = None):
+        """Construct a line arrangement with the given set of lines
 
-    def constructArrangement(self):
-        """Construct a line arrangement with the given set of lines"""
-        # construct bounding boc
-        left, right, top, bottom = self.extremePoints()
-        self.boundingBox(left, right, top, bottom)
+        Args:
+            workers: with more than one, the arrangement is built in vertical slabs by that many processes and
+                stitched back together (see _constructSlabs), which needs storage="arrays"
+            box: (left, right, top, bottom) of a bounding box to build in instead of the one around the
+                intersection points (see extremePoints), which must all lie inside it; it is grown if a line
+                passes through one of its corners
+
+        Every collection of the cyclic garbage collector traverses the whole DCEL built so far, which with
+        storage="objects" makes construction noticeably superquadratic. Callers building large arrangements
+        may pause it around this call (gc.disable() and gc.enable(), as the benchmarks do); the library leaves
+        it alone.
+        """
+        if workers > 1:
+            if self.dcel is None:
+                raise ValueError("building in parallel needs storage='arrays'")
+            self._constructSlabs(workers, box)
+            return
+        lines = self._boxLines(box)
         # iteratively add each line to the arrangement
-        for line in self.lines:
+        self._addLines(lines)
+
+
+    def _boxLines(self, box: tuple = None) -> list[Line]:
+        """Construct the bounding box, by default around the intersection points, moved out until no line
+        passes through its corners, and return the distinct lines to add in it (see _distinctLines)"""
+        lines = self._distinctLines(self.lines)
+        self.boundingBox(*_cornerFreeBox(lines, *(box or self.extremePoints())))
+        return lines
+
+
+    def _distinctLines(self, lines: list[Line]) -> list[Line]:
+        """Return the first copy of each line, in the order of their last copies, recording the number of copies
+
+        A line given k times is added to the DCEL once, and counts k times in the degree of every vertex on it.
+        It is added where its last copy comes, which is when the vertices on it reach their degree adding the
+        lines one at a time with insertLine, and where maxConcurrency counts them.
+        """
+        self._lineKeys = {}
+        self._copies = {}
+        last = {}
+        for i, line in enumerate(lines):
+            key = line.coefficients()
+            first = self._lineKeys.get(key)
+            if first is None:
+                self._lineKeys[key] = line
+            else:
+                self._copies[first] = self._copies.get(first, 1) + 1
+            last[key] = i
+        return [self._lineKeys[key] for key in sorted(last, key=last.get)]
+
+
+    def _addLines(self, lines: list[Line]):
+        """Add each line to the arrangement in order"""
+        for line in lines:
             self.addLine(line)
 
 
+    def _constructSlabs(self, workers: int, box: tuple = None):
+        """Construct the arrangement in parallel, one vertical slab of the bounding box per process
+
+        The walls between the slabs are placed so that the slabs hold about as many vertices each and no
+        vertex lies on a wall (see _slabWalls). Each process builds the arrangement of the lines crossing its
+        slab in a DCELArrays store, with the slab as bounding box. The stores are appended to self.dcel, then
+        at every wall the two edges of each line crossing it are joined into one, as are the sides of the box.
+        Finally the records no longer in use are dropped, the faces are numbered again from the cycles of half
+        edges (a face cut by a wall is one face again) and the degree index is rebuilt in the order the
+        serial construction would have filled it, so the result is identical to constructArrangement() up to
+        the order of the faces.
+        With arithmetic="float" the vertex coordinates may differ from the serial build by rounding.
+        """
+        distinct = self._distinctLines(self.lines)
+        copies = [self._copies.get(line, 1) for line in distinct]
+        left, right, top, bottom = _cornerFreeBox(distinct, *(box or self.extremePoints()))
+        xs = [left] + _slabWalls(distinct, left, right, top, bottom, workers) + [right]
+        boxes = [(xs[i], xs[i+1], top, bottom) for i in range(len(xs) - 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            slabs = list(pool.map(_buildSlab, repeat(distinct), boxes, repeat(self.arithmetic), repeat(copies)))
+
+        # the outside edges along each side of each slab, as views into self.dcel
+        sides = _boxSides(left, right, top, bottom)
+        slabEdges = []
+        for store, lineIds, sideEdges in slabs:
+            lines = [distinct[k] if k >= 0 else sides[-1 - k] for k in lineIds]
+            edgeOffset = self.dcel.extend(store, lines)[1]
+            slabEdges.append([[_halfEdgeView(self.dcel, e + edgeOffset) for e in edges] for edges in sideEdges])
+
+        # every wall disappears, with the vertices on it and the half edges along it
+        dropEdges = []
+        dropVertices = []
+        for leftEdges, rightEdges in zip(slabEdges, slabEdges[1:]):
+            for outer in leftEdges[_RIGHT] + rightEdges[_LEFT]:
+                dropEdges += [outer._i, outer.twin()._i]
+                dropVertices.append(outer.origin()._i)
+            dropVertices += [leftEdges[_RIGHT][-1].dest()._i, rightEdges[_LEFT][-1].dest()._i]
+
+        # at each wall, the lines crossing it from top to bottom on its left, and bottom to top on its right
+        for leftEdges, rightEdges in zip(slabEdges, slabEdges[1:]):
+            for outer, otherOuter in zip(leftEdges[_RIGHT][1:], reversed(rightEdges[_LEFT][1:])):
+                dropEdges += [e._i for e in _joinEdges(outer.twin().next().twin(), otherOuter.twin().next())]
+            # the bottom runs from right to left, so join the slabs from left to right, and the top the other way
+            dropEdges += [e._i for e in _joinEdges(rightEdges[_BOTTOM][-1], leftEdges[_BOTTOM][0])]
+        for leftEdges, rightEdges in reversed(list(zip(slabEdges, slabEdges[1:]))):
+            dropEdges += [e._i for e in _joinEdges(leftEdges[_TOP][-1], rightEdges[_TOP][0])]
+
+        edgeMap = self.dcel.compact(dropEdges, dropVertices)
+        self.outsideEdge = _halfEdgeView(self.dcel, edgeMap[slabEdges[0][_TOP][0]._i])
+        self._box = (left, right, top, bottom)
+        self._boxSides = sides
+        self._indexBoundary()
+        self.dcel.labelFaces()
+        self._faces = self.dcel.faceTable()
+        self._rebuildDegreeIndex()
+
+
+    def _rebuildDegreeIndex(self):
+        """Fill the degree index from the degrees stored in self.dcel
+
+        A vertex reaches its final degree when the last of its lines is added, and the vertices reached by
+        one line are met from left to right (bottom to top if it is vertical), which gives the order
+        constructArrangement() fills the buckets in. A line given more than once is added at its last copy.
+        """
+        store = self.dcel
+        last = {line.coefficients(): i for i, line in enumerate(self.lines)}
+        position = {id(line): last[key] for key, line in self._lineKeys.items()}
+        linePositions = [position.get(id(line), -1) for line in store.lines]
+        for v in range(store.vertexCount()):
+            if math.isnan(store.fx[v]):
+                VertexView(store, v).fcoord()
+
+        # the position of the last line through each vertex, then sort by it and by the rounded coordinates
+        if np is not None:
+            completed = np.full(store.vertexCount(), -1, dtype=np.int64)
+            lines = np.array(linePositions, dtype=np.int64)[np.frombuffer(store.line, dtype=np.int32)]
+            np.maximum.at(completed, np.frombuffer(store.origin, dtype=np.int32), lines)
+            fx, fy = np.frombuffer(store.fx), np.frombuffer(store.fy)
+            order = np.lexsort((fy, fx, completed))
+            vertices = order[np.frombuffer(store.degree, dtype=np.int32)[order] > 0].tolist()
+            completed = completed.tolist()
+        else:
+            completed = [-1] * store.vertexCount()
+            for e in range(store.halfEdgeCount()):
+                v = store.origin[e]
+                i = linePositions[store.line[e]]
+                if i > completed[v]:
+                    completed[v] = i
+            vertices = [v for v in range(store.vertexCount()) if store.degree[v] > 0]
+            vertices.sort(key=lambda v: (completed[v], store.fx[v], store.fy[v]))
+
+        # rounding is monotone, so only vertices with the same rounded coordinates can be out of order
+        key = lambda v: (completed[v], store.fx[v], store.fy[v])
+        i = 0
+        while i < len(vertices):
+            j = i + 1
+            while j < len(vertices) and key(vertices[j]) == key(vertices[i]):
+                j += 1
+            if j - i > 1:
+                vertices[i:j] = sorted(vertices[i:j], key=lambda v: (store.x[v], store.y[v]))
+            i = j
+
+        self._degreeBuckets = {}
+        self._maxDegree = 0
+        store.bucketNext, store.bucketPrev = array('i'), array('i')
+        for v in vertices:
+            degree = store.degree[v]
+            bucket = self._degreeBuckets.get(degree)
+            if bucket is None:
+                bucket = self._degreeBuckets[degree] = store.newBucket()
+            bucket.append(v)
+            self._maxDegree = max(self._maxDegree, degree)
+
+
     def boundingBox(self, left: Fraction, right: Fraction, top: Fraction, bottom: Fraction):
         """Compute a bounding box with corners (left, top), (right, top), (right, bottom), (left, bottom)
 
@@ -45,47 +305,66 @@ class LineArrangement:
             bottom: bottommost value of the box
         """
         # create the four vertices, with degree 0, since they arent formed by lines
-        v1 = Vertex((left, top), None, 0)
-        v2 = Vertex((right, top), None, 0)
-        v3 = Vertex((right, bottom), None, 0)
-        v4 = Vertex((left, bottom), None, 0)
+        v1 = self._newVertex((left, top), None, 0)
+        v2 = self._newVertex((right, top), None, 0)
+        v3 = self._newVertex((right, bottom), None, 0)
+        v4 = self._newVertex((left, bottom), None, 0)
+
+        # the sides of the box, which the half edges along them refer to
+        leftSide = Line((left, top), (left, bottom))
+        bottomSide = Line((left, bottom), (right, bottom))
+        rightSide = Line((right, bottom), (right, top))
+        topSide = Line((right, top), (left, top))
 
         # left edges
-        e1 = HalfEdge(v1, v4, None, True, None, None)
-        e2 = HalfEdge(v4, v1, e1, False, None, None)
+        e1 = self._newHalfEdge(v1, v4, None, True, None, None, leftSide)
+        e2 = self._newHalfEdge(v4, v1, e1, False, None, None, leftSide)
         v1.setIncEdge(e1)
         v4.setIncEdge(e2)
         e1.setTwin(e2)
 
         # bottom edges
-        e3 = HalfEdge(v4, v3, None, True, None, e1)
+        e3 = self._newHalfEdge(v4, v3, None, True, None, e1, bottomSide)
         e1.setNext(e3)
-        e4 = HalfEdge(v3, v4, e3, False, e2, None)
+        e4 = self._newHalfEdge(v3, v4, e3, False, e2, None, bottomSide)
         e3.setTwin(e4)
         e2.setPrev(e4)
 
         # right edges
-        e5 = HalfEdge(v3, v2, None, True, None, e3)
+        e5 = self._newHalfEdge(v3, v2, None, True, None, e3, rightSide)
         e3.setNext(e5)
-        e6 = HalfEdge(v2, v3, e5, False, e4, None)
+        e6 = self._newHalfEdge(v2, v3, e5, False, e4, None, rightSide)
         v3.setIncEdge(e5)
         v2.setIncEdge(e6)
         e5.setTwin(e6)
         e4.setPrev(e6)
 
         # top edges
-        e7 = HalfEdge(v2, v1, None, True, e1, e5)
+        e7 = self._newHalfEdge(v2, v1, None, True, e1, e5, topSide)
         e5.setNext(e7)
         e1.setPrev(e7)
-        e8 = HalfEdge(v1, v2, e7, False, e6, e2)
+        e8 = self._newHalfEdge(v1, v2, e7, False, e6, e2, topSide)
         e7.setTwin(e8)
         e2.setNext(e8)
         e6.setPrev(e8)
         self.outsideEdge = e8
+        self._faces = self._newFaceTable()
+        self._addFace(e1)
+
+        # index the outside edges of each side by the position of their origin along it
+        self._box = (left, right, top, bottom)
+        self._boxSides = [topSide, rightSide, bottomSide, leftSide]
+        self._sideIndex = {topSide: _TOP, rightSide: _RIGHT, bottomSide: _BOTTOM, leftSide: _LEFT}
+        self._sideKeys = [[], [], [], []]
+        self._sideEdges = [[], [], [], []]
+        for edge in (e8, e6, e4, e2):
+            self._indexBoundaryEdge(edge)
 
 
     def addLine(self, line: Line):
-        """Add line to the existing arrangement"""
+        """Add line to the existing arrangement, which must not hold a copy of it already (see insertLine)"""
+        self._lineKeys.setdefault(line.coefficients(), line)
+        copies = self._copies.get(line, 1)
         e1 = self.leftMostedge(line).twin()  # twin so that it is interior edge
 
         # find intersection between line and edge, then determine if we need to create a new vertex
@@ -94,26 +373,26 @@ class LineArrangement:
             e1 = e1.next()  # want to be on 'left' side of vertex
 
         if p1 == e1.origin().coord():
-            e1.origin().degree += 1  # degree as in number of lines passing through it not number of edges
             v1 = e1.origin()
+            self._setDegree(v1, v1.degree + copies)  # degree as in number of lines passing through it not number of edges
 
         else:
             # create a new vertex and split the edge
-            v1 = Vertex(p1, e1, 1)  # degree = 1 since only one line intersects it
-            edgeSplit1 = HalfEdge(e1.origin(), v1, None, e1.boundedFace(), e1, e1.prev())
-            edgeSplit2 = HalfEdge(v1, e1.origin(), edgeSplit1, e1.twin().boundedFace(), e1.twin().next(), e1.twin())
+            v1 = self._newVertex(p1, e1)
+            self._setDegree(v1, copies)  # only the line (and its copies) intersects it
+            edgeSplit1 = self._newHalfEdge(e1.origin(), v1, None, e1.boundedFace(), e1, e1.prev(), e1.line(), e1.face())
+            edgeSplit2 = self._newHalfEdge(v1, e1.origin(), edgeSplit1, e1.twin().boundedFace(), e1.twin().next(), e1.twin(), e1.line(), e1.twin().face())
             edgeSplit1.setTwin(edgeSplit2)
             edgeSplit1.prev().setNext(edgeSplit1)
             edgeSplit2.next().setPrev(edgeSplit2)
+            if e1.origin().incEdge() == e1:
+                e1.origin().setIncEdge(edgeSplit1)
 
             e1.setPrev(edgeSplit1)
             e1.setOrigin(v1)
             e1.twin().setDest(v1)
             e1.twin().setNext(edgeSplit2)
-
-        # update max degree
-        if v1.degree > self.maxIntersection():
-            self.setMaxVertex(v1)
+            self._indexBoundaryEdge(edgeSplit2)
 
         # while e1 is on a bounded face
         while (e1.boundedFace()):
@@ -121,68 +400,90 @@ class LineArrangement:
             v1 = e1.origin()
 
 
+    def _exitEdge(self, e1: HalfEdge, line: Line) -> tuple:
+        """Return the edge of the face of e1 the line leaves through, given that it enters at the origin of e1
+
+        The edges after e1 are traversed, classifying each vertex by the side of the line it lies on, until the
+        line leaves through a vertex (side 0) or through an edge whose endpoints are on opposite sides.
+
+        return:
+            the edge, and the sides of its origin and its destination; the line leaves through the destination
+            if its side is 0
+        """
+        e2 = e1.next()
+        originSide = self._side(line, e2.origin())
+        destSide = self._side(line, e2.dest())
+        while destSide != 0 and (destSide > 0) == (originSide > 0):
+            e2 = e2.next()
+            if e2 == e1:
+                raise ArithmeticError(f"line {line.toString()} does not leave the face, try arithmetic='filtered'")
+            originSide = destSide
+            destSide = self._side(line, e2.dest())
+        return e2, originSide, destSide
+
+
     def faceSplit(self, e1: HalfEdge, v1: Vertex, line: Line) -> HalfEdge:
         """Split the bounded face adjacent to e1 with respect to the given line
 
         Given an edge e1, its origin v1, and a line that passes through v1, traverse the bounded
         face to find the next edge that intersects the line. Split this face into a face left of
         the line and a face right of the line. Then, find and return the next edge to traverse.
+        The face of e1 keeps the part right of the line and the part left of it, which the walk has
+        just traversed, becomes a new face.
+
+        This is one step of the walk through the zone of the line: each boundary vertex costs a single
+        side test and only the edge the line leaves through has its intersection point computed.
 
         return:
             the next edge along the line l to begin a face split
         """
-        # traverse through edges of inc face until one of them intersects the line
-        e2 = e1
-        e2 = e2.next()  # otherwise the origin of e2 will intersect
-        p2 = self.lineEdgeInt(line, e2)
-        while p2 is None:
-            e2 = e2.next()
-            p2 = self.lineEdgeInt(line, e2)
+        copies = self._copies.get(line, 1)
+        e2, originSide, destSide = self._exitEdge(e1, line)
 
-        # If p2 is a vertex already:
-        if p2 == e2.dest().coord():
+        # If the line leaves through a vertex already:
+        if destSide == 0:
             # set v2 and two new edges connected to it
             v2 = e2.dest()
-            v2.degree += 1
-            newEdge1 = HalfEdge(v2, v1, None, True, e1, e2)
-            newEdge2 = HalfEdge(v1, v2, newEdge1, True, e2.next(), e1.prev())
+            self._setDegree(v2, v2.degree + copies)
+            face = e1.face()
+            newEdge1 = self._newHalfEdge(v2, v1, None, True, e1, e2, line)
+            newEdge2 = self._newHalfEdge(v1, v2, newEdge1, True, e2.next(), e1.prev(), line, face)
             newEdge1.setTwin(newEdge2)
             # update references
             e2.next().setPrev(newEdge2)
             e2.setNext(newEdge1)
             e1.prev().setNext(newEdge2)
             e1.setPrev(newEdge1)
+            face.setEdge(newEdge2)
+            self._addFace(newEdge1)
 
-            # find the slope of edge adjacent to the right of line to find the
+            # find the line of the edge adjacent to the right of line
             nextEdge = newEdge2.next()
-            slope = Line(nextEdge.dest().coord(), nextEdge.origin().coord()).slope()  # slope of edge on right side of line
+            rightLine = nextEdge.line()  # line of edge on right side of line
             nextEdge = nextEdge.twin().next()
-            tempSlope = Line(nextEdge.dest().coord(), nextEdge.origin().coord()).slope()
-            # find the edge on the left side of line whose slope is equal to above slope
-            while (slope != tempSlope):
+            # find the edge on the left side of line that lies on the same line
+            while not nextEdge.line().isParallel(rightLine):
                 nextEdge = nextEdge.twin().next()
-                tempSlope = Line(nextEdge.dest().coord(), nextEdge.origin().coord()).slope()
-
-            # update max degree
-            if v2.degree > self.maxIntersection():
-                self.setMaxVertex(v2)
 
             return nextEdge
 
-        # otherwise we need to make a vertex where p2 is
+        # otherwise we need to make a vertex where the line crosses e2
         else:
             # Construct v2 and new edges
-            v2 = Vertex(p2, None)
+            p2 = self._crossing(line, e2, originSide, destSide)
+            v2 = self._newVertex(p2, None)
             if e2.twin().boundedFace():
-                v2.degree = 2  # two lines contribute to this face
+                self._setDegree(v2, copies + self._copies.get(e2.line(), 1))  # two lines contribute to this face
             else:
-                v2.degree = 1  # the given line contributes and the other line is artificial (bounding box)
-            newEdge1 = HalfEdge(v2, v1, None, True, None, None)
-            newEdge2 = HalfEdge(v1, v2, newEdge1, True, None, None)
+                self._setDegree(v2, copies)  # the given line contributes and the other line is artificial (bounding box)
+            face = e1.face()
+            newEdge1 = self._newHalfEdge(v2, v1, None, True, None, None, line)
+            newEdge2 = self._newHalfEdge(v1, v2, newEdge1, True, None, None, line, face)
             newEdge1.setTwin(newEdge2)
 
-            newEdge3 = HalfEdge(v2, e2.dest(), None, True, None, None)
-            newEdge4 = HalfEdge(e2.dest(), v2, newEdge3, e2.twin().boundedFace(), None, None)
+            newEdge3 = self._newHalfEdge(v2, e2.dest(), None, True, None, None, e2.line(), face)
+            newEdge4 = self._newHalfEdge(e2.dest(), v2, newEdge3, e2.twin().boundedFace(), None, None, e2.line(),
+                                         e2.twin().face())
             newEdge3.setTwin(newEdge4)
 
             # Set the previous and next values for the new edges
@@ -209,110 +510,1424 @@ class LineArrangement:
             e2.twin().setPrev(newEdge4)
 
             # fix dest origins of e2 and e2.twin
+            if e2.dest().incEdge() == e2.twin():
+                e2.dest().setIncEdge(newEdge4)
             e2.setDest(v2)
             e2.twin().setOrigin(v2)
             v2.setIncEdge(newEdge3)
-
-            # set max degree
-            if v2.degree > self.maxIntersection():
-                self.setMaxVertex(v2)
+            face.setEdge(newEdge2)
+            self._addFace(newEdge1)
+            if not newEdge4.boundedFace():
+                # the line left through the bounding box, whose outside edge was split in two
+                self._indexBoundaryEdge(newEdge4)
+                self._indexBoundaryEdge(e2.twin())
 
             return e2.twin()
 
 
+    def insertLine(self, line: Line):
+        """Add a line to the arrangement after it has been constructed
+
+        The bounding box is grown first if the line meets another line on or outside it, or misses it
+        altogether, then the line is added with addLine. Lines inserted before any two of them intersect are
+        only recorded, and the arrangement is built once there is a bounding box to build it in. A copy of a
+        line already in the arrangement only adds one to the degree of every vertex on it.
+        """
+        self._checkWritable()
+        if self.lines is None:
+            self.lines = []
+        if self.outsideEdge is None:
+            self.lines.append(line)
+            try:
+                extremes = self.extremePoints()
+            except ValueError:
+                return  # no two lines intersect yet
+            for l in self._boxLines(extremes):
+                self._fitBox(l)
+                self.addLine(l)
+            return
+
+        first = self._lineKeys.get(line.coefficients())
+        if first is not None:
+            self.lines.append(line)
+            self._copies[first] = self._copies.get(first, 1) + 1
+            edges = self._lineEdges(first)
+            for v in [edges[0].origin()] + [edge.dest() for edge in edges]:
+                self._setDegree(v, v.degree + 1)
+            return
+
+        self._fitBox(line)
+        self.lines.append(line)
+        self.addLine(line)
+
+
+    def removeLine(self, line: Line):
+        """Remove a line from the arrangement, merging the faces on either side of it
+
+        The edges of the line are found by walking along it from where it enters the bounding box, and each
+        one is unlinked from its two faces, which merge into the face on its right. A vertex left on a single
+        line (or on a side of the box) is removed by joining its two edges. The bounding box is not shrunk.
+        Removing one of several copies of a line only takes one off the degree of every vertex on it. A line
+        inserted before the arrangement was built is only dropped from the lines.
+        """
+        self._checkWritable()
+        i = next((i for i, l in enumerate(self.lines or []) if l is line), None)
+        if i is None:
+            raise ValueError(f"line {line.toString()} is not in the arrangement")
+        if self.outsideEdge is None:
+            del self.lines[i]
+            return
+        # the copy of the line the half edges refer to
+        key = line.coefficients()
+        line = self._lineKeys[key]
+        edges = self._lineEdges(line)
+        vertices = [edges[0].origin()] + [edge.dest() for edge in edges]
+
+        copies = self._copies.get(line, 1)
+        if copies > 1:
+            for v in vertices:
+                self._setDegree(v, v.degree - 1)
+            if copies == 2:
+                del self._copies[line]
+            else:
+                self._copies[line] = copies - 1
+            del self.lines[i]
+            return
+
+        # for each vertex on the line, an edge that will remain once the line is gone
+        remaining = [edges[0].twin().next()] + [edge.next() for edge in edges]
+
+        faces = self._faceTable()
+        for edge in edges:
+            twin = edge.twin()
+            face, other = edge.face(), twin.face()
+            if other != face:
+                for e in other.boundary():
+                    e.setFace(face)
+                del faces[other]
+            face.setEdge(edge.prev())
+            edge.prev().setNext(twin.next())
+            twin.next().setPrev(edge.prev())
+            twin.prev().setNext(edge.next())
+            edge.next().setPrev(twin.prev())
+
+        for v, edge in zip(vertices, remaining):
+            v.setIncEdge(edge)
+            self._setDegree(v, v.degree - 1)
+            other = edge.twin().next()
+            if other.twin().next() == edge and other.line() is edge.line():
+                self._removeVertex(v, edge, other)
+
+        del self.lines[i]
+        del self._lineKeys[key]
+
+
+    def _lineEdges(self, line: Line) -> list[HalfEdge]:
+        """Return the half edges along a line of the arrangement, in order from where it enters the box"""
+        # the first edge of the line, leaving the vertex where it enters the box
+        edge = self.leftMostedge(line).next()
+        while edge.line() is not line:
+            edge = edge.twin().next()
+
+        edges = [edge]
+        while True:
+            back = edge.twin()
+            edge = edge.next()
+            while edge != back and edge.line() is not line:
+                edge = edge.twin().next()
+            if edge == back:
+                return edges  # the line leaves the box
+            edges.append(edge)
+
+
+    def _checkWritable(self):
+        if self.dcel is not None and self.dcel.buffer is not None:
+            raise ValueError("a loaded arrangement is read-only, build a new one from its lines to change it")
+
+
+    def _removeVertex(self, v: Vertex, e1: HalfEdge, e2: HalfEdge):
+        """Remove a vertex whose only edges e1 and e2 leave it along the same line, joining them into one"""
+        ba, ab = e2.twin(), e1.twin()  # the half edges into v are kept and extended to a and b
+        _joinEdges(ba, e1)
+
+        side = self._sideIndex.get(e1.line())
+        if side is not None:
+            # v is on the boundary, where the outside edge leaving it is gone
+            keys = self._sideKeys[side]
+            i = bisect_left(keys, _boundaryKey(side, v.coord()))
+            del keys[i]
+            del self._sideEdges[side][i]
+            if self.outsideEdge in (e1, e2):
+                self.outsideEdge = ba if ab.boundedFace() else ab
+        self._setDegree(v, 0)
+
+
+    def _fitBox(self, line: Line):
+        """Grow the bounding box so that line meets every other line inside it and crosses it away from its corners"""
+        left, right, top, bottom = self._box
+        outside = []
+        for other in self.lines:
+            p = line.intercept(other)
+            if p is not None and not (left < p[0] < right and bottom < p[1] < top):
+                outside.append(p)
+        if not outside and self.leftMostedge(line) is None:
+            # parallel to every line it misses, so any point on the line will do
+            a, b, c = line.coefficients()
+            if b == 0:
+                outside.append((Fraction(c, a), (top + bottom) / 2))
+            else:
+                x = (left + right) / 2
+                outside.append((x, (c - a*x) / b))
+        if outside:
+            xs = [p[0] for p in outside]
+            ys = [p[1] for p in outside]
+            left, right = min(left, min(xs) - 1), max(right, max(xs) + 1)
+            top, bottom = max(top, max(ys) + 1), min(bottom, min(ys) - 1)
+        elif all(line.side(p) != 0 for p in ((left, top), (right, top), (right, bottom), (left, bottom))):
+            return
+        self._growBox(left, right, top, bottom, line)
+
+
+    def _growBox(self, left, right, top, bottom, newLine: Line = None):
+        """Move the sides of the bounding box out to the given values, which contain the current box
+
+        The box is widened further if a line, or newLine which is about to be added, would pass through one of
+        its corners. Each line leaves the current box through a vertex on its boundary. No two lines meet outside the box,
+        so these vertices keep their cyclic order when they slide out along their lines to the new sides, and
+        only the boundary cycle has to be rebuilt. The faces inside keep all their other edges.
+        """
+        oldLeft, oldRight, oldTop, oldBottom = self._box
+
+        # the outside edges, and for every vertex a line leaves through, the edge of that line leaving it
+        outerEdges = []
+        exits = []
+        corners = []
+        edge = self.outsideEdge
+        while True:
+            outerEdges.append(edge)
+            v = edge.origin()
+            if v.degree > 0:
+                exits.append((v, edge.twin().next()))
+            else:
+                corners.append(v)
+            edge = edge.next()
+            if edge == self.outsideEdge:
+                break
+
+        while True:
+            sides = _boxSides(left, right, top, bottom)
+            cornerCoords = [(left, top), (right, top), (right, bottom), (left, bottom)]
+            moved = []
+            for v, out in exits:
+                x, y = v.coord()
+                line = out.line()
+                crossings = []
+                for side in sides:
+                    p = line.intercept(side)
+                    if p is not None and left <= p[0] <= right and bottom <= p[1] <= top:
+                        crossings.append(p)
+                # the crossing beyond v, found from a side of the old box that v is on and the line is not parallel to
+                if y == oldTop and not line.isHorizontal():
+                    p = max(crossings, key=lambda q: q[1])
+                elif y == oldBottom and not line.isHorizontal():
+                    p = min(crossings, key=lambda q: q[1])
+                elif x == oldRight:
+                    p = max(crossings, key=lambda q: q[0])
+                else:
+                    p = min(crossings, key=lambda q: q[0])
+                moved.append(p)
+            onCorner = newLine is not None and any(newLine.side(p) == 0 for p in cornerCoords)
+            if onCorner and newLine.isHorizontal():
+                # a horizontal line through a corner lies along the top or bottom, which moving the corners
+                # sideways would never change, so move that side out instead; no other line is horizontal
+                # there, so the line is then off every corner
+                y = newLine.yInt()
+                top, bottom = (top + 1 if y == top else top), (bottom - 1 if y == bottom else bottom)
+                continue
+            if not onCorner and not any(p in cornerCoords for p in moved):
+                break
+            # a line through a corner of the new box would share its vertex, so move the corners sideways; each
+            # line that is not horizontal meets the top and bottom once, so this ends after a few steps
+            left, right = left - 1, right + 1
+
+        # order the vertices along the new boundary, each corner starting the side its outside edge runs along
+        boundary = []
+        for (v, out), p in zip(exits, moved):
+            v.setCoord(p)
+            if p[1] == top:
+                side = _TOP
+            elif p[0] == right:
+                side = _RIGHT
+            elif p[1] == bottom:
+                side = _BOTTOM
+            else:
+                side = _LEFT
+            boundary.append(((side, _boundaryKey(side, p)), v, out))
+        for side, p in enumerate(cornerCoords):
+            v = corners.pop() if corners else self._newVertex(p, None)
+            v.setCoord(p)
+            boundary.append(((side, _boundaryKey(side, p)), v, None))
+        boundary.sort(key=lambda b: b[0])
+
+        # one outside edge and its twin between consecutive vertices, reusing the old ones first
+        n = len(boundary)
+        newEdges = []
+        for i in range(n):
+            (side, key), v, out = boundary[i]
+            w = boundary[(i + 1) % n][1]
+            if outerEdges:
+                outer = outerEdges.pop()
+                inner = outer.twin()
+                outer.setOrigin(v)
+                outer.setDest(w)
+                inner.setOrigin(w)
+                inner.setDest(v)
+                outer.setLine(sides[side])
+                inner.setLine(sides[side])
+            else:
+                outer = self._newHalfEdge(v, w, None, False, None, None, sides[side])
+                inner = self._newHalfEdge(w, v, outer, True, None, None, sides[side])
+                outer.setTwin(inner)
+            v.setIncEdge(outer)
+            newEdges.append(outer)
+
+        for i in range(n):
+            (side, key), v, out = boundary[i]
+            outer, inner = newEdges[i], newEdges[i].twin()
+            prevOuter = newEdges[i - 1]
+            prevOuter.setNext(outer)
+            outer.setPrev(prevOuter)
+            # inner edges run the other way: arriving at v along the box, the face turns into the line leaving v
+            if out is None:
+                inner.setNext(prevOuter.twin())
+                prevOuter.twin().setPrev(inner)
+            else:
+                inner.setNext(out)
+                out.setPrev(inner)
+                out.twin().setNext(prevOuter.twin())
+                prevOuter.twin().setPrev(out.twin())
+
+        # each inner edge is in the face of the first line edge after it, or in the only face if there is none
+        inner = {outer.twin() for outer in newEdges}
+        for edge in inner:
+            e = edge.next()
+            while e in inner and e != edge:
+                e = e.next()
+            face = e.face() if e not in inner else next(iter(self._faceTable()))
+            edge.setFace(face)
+            face.setEdge(edge)
+
+        self._box = (left, right, top, bottom)
+        self._boxSides = sides
+        self._sideIndex = {sides[_TOP]: _TOP, sides[_RIGHT]: _RIGHT, sides[_BOTTOM]: _BOTTOM, sides[_LEFT]: _LEFT}
+        self._sideKeys = [[], [], [], []]
+        self._sideEdges = [[], [], [], []]
+        for ((side, key), v, out), outer in zip(boundary, newEdges):
+            self._sideKeys[side].append(key)
+            self._sideEdges[side].append(outer)
+        self.outsideEdge = newEdges[0]  # leaving the top left corner, which sorts first
+
+
     def lineEdgeInt(self, line: Line, edge: HalfEdge) -> tuple:
-        """Return the intersection point between the given line and edge, if it exists"""
-        l2 = Line(edge.origin().coord(), edge.dest().coord())
-        p = line.intercept(l2)
-        if p == None:
-            return None
+        """Return the intersection point between the given line and edge, if it exists
 
-        if (p[0] >= min(edge.origin().x(), edge.dest().x())) and (p[0] <= max(edge.origin().x(), edge.dest().x())) and (p[1] >= min(edge.origin().y(), edge.dest().y())) and (p[1] <= max(edge.origin().y(), edge.dest().y())):
-            return p
+        The endpoints are classified against the line first, so the intersection point is only computed
+        for an edge that the line actually crosses.
+        """
+        originSide = self._side(line, edge.origin())
+        destSide = self._side(line, edge.dest())
+        if originSide == 0:
+            # an edge lying on the line is parallel to it, so it has no single intersection
+            return None if destSide == 0 else edge.origin().coord()
+        if destSide == 0:
+            return edge.dest().coord()
+        if (originSide > 0) == (destSide > 0):
+            return None
 
-        return None
+        return self._crossing(line, edge, originSide, destSide)
 
 
     def leftMostedge(self, line: Line) -> HalfEdge:
-        """Return the leftmost outside edge of the bounding box that intersects the line"""
+        """Return the leftmost outside edge of the bounding box that intersects the line
 
-        # initial values
-        leftMostIntersection = None
-        leftMostEdge = None
-        edge = self.outsideEdge
-        startCoord = edge.origin().coord()
+        The point where the line enters the box is computed from the sides of the box, then the outside edge
+        containing it is found by binary search in the sorted edges of that side, in O(log n). If the point is
+        a vertex, the edge ending at it is returned. Return None if the line misses the box.
+        """
+        left, right, top, bottom = self._box
+        sides = self._boxSides
+
+        # a line that is not vertical enters through the left side if it crosses it within the box
+        p = None if line.isVertical() else line.intercept(sides[_LEFT])
+        if p is not None and bottom <= p[1] <= top:
+            side = _LEFT
+        else:
+            # otherwise through the top or bottom, whichever crossing is further left (the bottom on ties)
+            p = None
+            for s in (_TOP, _BOTTOM):
+                q = line.intercept(sides[s])
+                if q is not None and left <= q[0] <= right and (p is None or q[0] <= p[0]):
+                    p, side = q, s
+            if p is None:
+                return None
+
+        keys = self._sideKeys[side]
+        key = _boundaryKey(side, p)
+        i = bisect_right(keys, key) - 1
+        edge = self._sideEdges[side][i]
+        # if the intersection is on the origin of a edge, return the previous edge instead
+        if keys[i] == key:
+            edge = edge.prev()
+        return edge
+
+
+    def crossingLines(self, lines: list[Line]) -> dict[Face, array]:
+        """Return, for every face inside the box crossed by any of the lines, the lines crossing it
+
+        Each line is walked through its zone as addLine does, but the DCEL is left unchanged (see _zoneFaces),
+        so all the sets together take time proportional to the zones of the lines rather than to the number of
+        lines times the number of edges. A line only touching a face at a vertex, or running along one of its
+        edges, does not cross it. Only the parts of the faces inside the bounding box are considered.
+
+        return:
+            a dict from each face crossed to an array('i') of the indices in lines of the lines crossing it,
+            in increasing order
+        """
+        crossed = {}
+        for i, line in enumerate(lines):
+            for face in self._zoneFaces(line):
+                indices = crossed.get(face)
+                if indices is None:
+                    indices = crossed[face] = array('i')
+                indices.append(i)
+        return crossed
+
+
+    def _zoneFaces(self, line: Line):
+        """Yield the faces inside the box that the line crosses, in order along it, without changing the DCEL
+
+        Inside a face the boundary is followed from where the line entered it, with one side test per vertex,
+        up to the edge or vertex it leaves through, as in faceSplit. From an edge the walk goes on into the face
+        on its other side. At a vertex the edges leaving it are classified by side: the line goes on into the
+        face between an edge on its right and the next one counterclockwise on its left, or along an edge on
+        the line whose neighbour clockwise is on its right.
+        """
+        edge = self.leftMostedge(line)
+        if edge is None:
+            return
+        edge = edge.twin()  # the inside edge along the side of the box the line enters through
+        originSide = self._side(line, edge.origin())
+        destSide = self._side(line, edge.dest())
+        if originSide == 0 and destSide == 0:
+            return  # the line is a side of the box
+        if originSide == 0 or destSide == 0:
+            vertex = edge.origin() if originSide == 0 else edge.dest()
+        elif (originSide > 0) != (destSide > 0):
+            vertex = None
+        else:
+            return
+        # the walk goes from left to right, or upwards along a vertical line, whose positive side is on its right
+        sign = -1 if line.isVertical() else 1
 
-        # look through every edge
         while True:
-            # find intersection an update variables
-            intersection = self.lineEdgeInt(line, edge)
-            if intersection is not None:
-                if leftMostIntersection is None:
-                    leftMostIntersection = intersection
-                    leftMostEdge = edge
-                elif intersection[0] <= leftMostIntersection[0]:
-                    leftMostIntersection = intersection
-                    leftMostEdge = edge
-
-            # move onto the next edge and break if back to the start
+            if vertex is not None:
+                # find the face the line goes on into from the vertex, or the edge it goes on along
+                edges = list(self.iterIncidentEdges(vertex))  # clockwise
+                sides = [sign * self._side(line, e.dest()) for e in edges]
+                for j, edge in enumerate(edges):
+                    if sides[j] < 0 and sides[j-1] > 0:
+                        vertex = None
+                        break
+                    if sides[j] == 0 and sides[(j+1) % len(edges)] < 0:
+                        if not (edge.boundedFace() and edge.twin().boundedFace()):
+                            return  # along a side of the box
+                        vertex = edge.dest()
+                        break
+                else:
+                    if all(e.boundedFace() for e in edges):
+                        raise ArithmeticError(f"line {line.toString()} does not leave a vertex, "
+                                              "try arithmetic='filtered'")
+                    return  # the line only touches a corner of the box
+                if vertex is not None:
+                    continue
+
+            # edge is on the boundary of the face the line is in, and leaves the point the line entered through
+            if not edge.boundedFace():
+                return
+            yield edge.face()
+            e2, _, destSide = self._exitEdge(edge, line)
+            if destSide == 0:
+                if e2.next() == edge:
+                    raise ArithmeticError(f"line {line.toString()} does not leave the face, try arithmetic='filtered'")
+                vertex = e2.dest()
+            else:
+                edge = e2.twin()
+
+
+    def _indexBoundary(self):
+        """Index every outside edge along the sides in self._boxSides, starting over"""
+        sides = self._boxSides
+        self._sideIndex = {sides[_TOP]: _TOP, sides[_RIGHT]: _RIGHT, sides[_BOTTOM]: _BOTTOM, sides[_LEFT]: _LEFT}
+        self._sideKeys = [[], [], [], []]
+        self._sideEdges = [[], [], [], []]
+        edge = self.outsideEdge
+        while True:
+            self._indexBoundaryEdge(edge)
             edge = edge.next()
-            if edge.origin().coord() == startCoord:
+            if edge == self.outsideEdge:
                 break
 
-        # if the intersection is on the origin of a edge, return the previous edge instead
-        if leftMostEdge.origin().coord() == leftMostIntersection:
-            leftMostEdge = leftMostEdge.prev()
 
-        return leftMostEdge
+    def _indexBoundaryEdge(self, edge: HalfEdge):
+        """Add an outside edge to the index of its side, replacing the edge with the same origin if any"""
+        side = self._sideIndex[edge.line()]
+        key = _boundaryKey(side, edge.origin().coord())
+        keys, edges = self._sideKeys[side], self._sideEdges[side]
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            edges[i] = edge
+        else:
+            keys.insert(i, key)
+            edges.insert(i, edge)
 
 
     def extremePoints(self) -> tuple[Fraction]:
         """Find the leftmost, rightmost, topmost, and bottommost intersection point in self.lines
 
+        Rather than intersecting every pair of lines, only lines adjacent in slope order are intersected (see
+        _extremeX), which takes O(n log n). The top and bottom extremes are the left and right extremes of the
+        lines reflected in y = x. With arithmetic="float" and NumPy available the search runs on float arrays.
+
         return:
-            a tuple (left, right, top, bottom) of fractions representing the most extreme values
-            of the intersection points
+            a tuple (left, right, top, bottom) of fractions (floats with arithmetic="float") representing the
+            most extreme values of the intersection points
         """
-        # find first non-null intersection to set initial values
-        k = 1
-        intersection = self.lines[0].intercept(self.lines[k])
-        while intersection is None:
-            k += 1
-            intersection = self.lines[0].intercept(self.lines[k])
-
-        left, top = intersection
-        right, bottom = left, top
-
-        # try every pair to find extremes
-        for i in range(len(self.lines)-1):
-            for j in range(i+1, len(self.lines)):
-                intersection = self.lines[i].intercept(self.lines[j])
-                if intersection is not None:
-                    x = intersection[0]
-                    y = intersection[1]
-                    if (x < left):
-                        left = x
-                    elif (x > right):
-                        right = x
-
-                    if (y < bottom):
-                        bottom = y
-                    elif (y > top):
-                        top = y
+        # each line as (slope, yInt), or (None, xInt) if vertical
+        lines = [(None, line.xInt()) if line.isVertical() else (line.slope(), line.yInt()) for line in self.lines]
+        reflected = [_reflect(slope, intercept) for slope, intercept in lines]
+
+        if self.arithmetic == "float":
+            lines = [(None if slope is None else float(slope), float(intercept)) for slope, intercept in lines]
+            reflected = [(None if slope is None else float(slope), float(intercept)) for slope, intercept in reflected]
+            extremeX = _extremeX if np is None else _extremeXArrays
+        else:
+            extremeX = _extremeX
+
+        xExtremes = extremeX(lines)
+        if xExtremes is None:
+            raise ValueError("no two lines intersect")
+        left, right = xExtremes
+        bottom, top = extremeX(reflected)
 
+        if self.arithmetic == "float":
+            return (left-1, right+1, top+1, bottom-1)
         return (Fraction(left-1), Fraction(right+1), Fraction(top+1), Fraction(bottom-1))
 
-    def setMaxVertex(self, v: Vertex):
-        self._maxIntersectionVertex = v
+    def _setDegree(self, v: Vertex, degree: int):
+        """Set the degree of v and move it to the matching bucket of the degree index"""
+        buckets = self._buckets()
+        if v.degree > 0:
+            del buckets[v.degree][v]
+        v.degree = degree
+        if degree > 0:
+            bucket = buckets.get(degree)
+            if bucket is None:
+                bucket = buckets[degree] = self._newBucket()
+            bucket[v] = None
+        # the highest degree only drops when its last vertex leaves, which removing a line does one step at a time
+        if degree > self._maxDegree:
+            self._maxDegree = degree
+        while self._maxDegree > 0 and not buckets.get(self._maxDegree):
+            self._maxDegree -= 1
 
     def maxIntersectionVertex(self) -> Vertex:
-        return self._maxIntersectionVertex
+        """Return the first vertex to reach the maximum degree, or None if no line has been added"""
+        if self._maxDegree == 0:
+            return None
+        if self._savedDegrees is not None:
+            return VertexView(self.dcel, self._savedDegrees[0][0])
+        return next(iter(self._degreeBuckets[self._maxDegree]))
 
     def maxIntersection(self):
-        if self._maxIntersectionVertex is None:
-            return 0
+        return self._maxDegree
+
+    def verticesWithDegreeAtLeast(self, k: int) -> list[Vertex]:
+        """Return the vertices that at least k lines pass through, highest degree first
+
+        Only the buckets from the maximum degree down to k are visited, so the cost is proportional to the
+        number of vertices returned (plus at most maxIntersection() empty buckets).
+        """
+        vertices = []
+        for degree in range(self._maxDegree, max(k, 1) - 1, -1):
+            vertices.extend(self._buckets().get(degree, ()))
+        return vertices
+
+    def topK(self, k: int) -> list[Vertex]:
+        """Return the k vertices with the highest degree, ties in the order they reached their degree"""
+        vertices = []
+        degree = self._maxDegree
+        while degree > 0 and len(vertices) < k:
+            for v in self._buckets().get(degree, ()):
+                if len(vertices) == k:
+                    break
+                vertices.append(v)
+            degree -= 1
+        return vertices
+
+    def degreeHistogram(self) -> dict[int, int]:
+        """Return the number of vertices of each degree >= 1"""
+        if self._savedDegrees is not None:
+            return {degree: count for degree, count in sorted(self._savedDegrees[1])}
+        return {degree: len(bucket) for degree, bucket in sorted(self._buckets().items()) if bucket}
+
+    def summary(self) -> tuple[int]:
+        """Return (maxDegree, vertexCount, faceCount) for the intersection points and the faces of the lines
+
+        Adding a line splits one face for each of the distinct points it crosses earlier lines at, plus one, so
+        a vertex of degree d accounts for d - 1 faces and the count is 1 + n + sum(d - 1), by Euler's formula.
+        The unbounded faces are counted, while the points where the lines leave the bounding box are not.
+        Copies of a line count in the degrees, but cut no faces and make no vertex on the box an intersection
+        point, so with copies the faces are counted in the face table and the box is walked instead.
+        """
+        histogram = self.degreeHistogram()
+        vertices = sum(count for degree, count in histogram.items() if degree > 1)
+        distinct = len({line.coefficients() for line in self.lines or []})
+        if distinct == len(self.lines or []):
+            faces = 1 + distinct + sum((degree - 1) * count for degree, count in histogram.items())
+        elif self.outsideEdge is None:
+            faces = 1 + distinct
+        else:
+            vertices -= sum(1 for edge in self.iterPerimeter() if edge.origin().degree > 1)
+            faces = self.faceCount()
+        return (self._maxDegree, vertices, faces)
+
+    def faceCount(self) -> int:
+        """Return the number of faces inside the bounding box, one for each face of the arrangement"""
+        if self._savedFaces is not None:
+            return len(self._savedFaces)
+        return len(self._faces)
+
+    def faces(self) -> list[Face]:
+        """Return the faces inside the bounding box, in the order they were created"""
+        return list(self._faceTable())
+
+    def iterFaces(self):
+        """Yield the faces inside the bounding box, in the order they were created, without building a list
+
+        For a loaded arrangement the faces are yielded straight from the saved indices, leaving the face table
+        unfilled.
+        """
+        if self._savedFaces is not None:
+            for f in self._savedFaces:
+                yield FaceView(self.dcel, f)
+        else:
+            yield from self._faces
+
+    def iterFaceBoundary(self, edge: HalfEdge):
+        """Yield the half edges of the cycle through edge, starting with it, counterclockwise around a face
+        inside the box and clockwise around the outside of the box"""
+        start = edge
+        while True:
+            yield edge
+            edge = edge.next()
+            if edge == start:
+                return
+
+    def iterPerimeter(self):
+        """Yield the outside half edges of the bounding box, from outsideEdge, along the top from left to
+        right, then down the right side, along the bottom and up the left side"""
+        if self.outsideEdge is not None:
+            yield from self.iterFaceBoundary(self.outsideEdge)
+
+    def iterIncidentEdges(self, vertex: Vertex):
+        """Yield the half edges leaving the vertex, clockwise from vertex.incEdge()"""
+        start = edge = vertex.incEdge()
+        while True:
+            yield edge
+            edge = edge.twin().next()
+            if edge == start:
+                return
+
+    def iterHalfEdges(self):
+        """Yield every half edge of the arrangement once: the boundaries of the faces, then the perimeter
+
+        Each half edge bounds exactly one face inside the box or is on the perimeter, so no record of the
+        edges visited is needed and the extra memory is constant. For a removed line, the half edges left in
+        a DCELArrays store but unlinked from the DCEL are not visited.
+        """
+        for face in self.iterFaces():
+            yield from self.iterFaceBoundary(face.edge())
+        yield from self.iterPerimeter()
+
+    def iterVertices(self):
+        """Yield every vertex of the arrangement once, including the corners of the bounding box
+
+        A vertex is yielded when its incEdge() comes up in iterHalfEdges, so like it, this takes constant
+        extra memory.
+        """
+        for edge in self.iterHalfEdges():
+            v = edge.origin()
+            if v.incEdge() == edge:
+                yield v
+
+    def _faceTable(self) -> dict:
+        """Return the face table, first filling it from the saved face indices if the arrangement was loaded"""
+        if self._savedFaces is not None:
+            self._faces = self.dcel.faceTable()
+            self._savedFaces = None
+        return self._faces
+
+    def _addFace(self, edge: HalfEdge) -> Face:
+        """Make a new face of the cycle of half edges through edge and add it to the face table"""
+        face = self._newFace(edge)
+        for e in face.boundary():
+            e.setFace(face)
+        self._faces[face] = None
+        return face
+
+    def _buckets(self) -> dict:
+        """Return the degree index, first filling it from the saved vertex order if the arrangement was loaded"""
+        if self._savedDegrees is not None:
+            order, counts = self._savedDegrees
+            self._savedDegrees = None
+            start = 0
+            for degree, count in counts:
+                bucket = self._degreeBuckets[degree] = self.dcel.newBucket()
+                for v in order[start:start+count]:
+                    bucket.append(v)
+                start += count
+        return self._degreeBuckets
+
+
+    def enableStats(self, callback=None) -> ConstructionStats:
+        """Start counting and timing the phases of the construction, and return the stats they are recorded in
+
+        The phases (extremePoints, boundingBox, addLine, leftMostedge, lineEdgeInt, faceSplit, insertLine and
+        removeLine) are wrapped on this arrangement only, along with its side test, crossing and factory
+        strategies, so an arrangement without stats enabled runs exactly the code it did before. With
+        workers > 1, the slabs are built in other processes and only the work done here is recorded.
+
+        Args:
+            callback: called as callback(phase, seconds, stats) after every call to a phase
+        """
+        if self.stats is not None:
+            self.disableStats()
+        stats = ConstructionStats()
+        self.stats = stats
+        self._unwrapped = (self._side, self._crossing, self._newVertex, self._newHalfEdge, self._newFace)
+
+        def timed(phase, f):
+            calls, seconds = stats.calls, stats.seconds
+
+            def wrapper(*args):
+                start = time.perf_counter()
+                result = f(*args)
+                elapsed = time.perf_counter() - start
+                calls[phase] = calls.get(phase, 0) + 1
+                seconds[phase] = seconds.get(phase, 0.0) + elapsed
+                if callback is not None:
+                    callback(phase, elapsed, stats)
+                return result
+            return wrapper
+
+        for phase in ConstructionStats.PHASES:
+            setattr(self, phase, timed(phase, getattr(self, phase)))
+
+        addLine = self.addLine
+
+        def countedAddLine(line):
+            before = stats.sideTests
+            addLine(line)
+            stats.edgesPerLine.append(stats.sideTests - before)
+        self.addLine = countedAddLine
+
+        side, crossing, newVertex, newHalfEdge, newFace = self._unwrapped
+        if side is _sideFiltered:
+            exactSide = timed("exactSide", _sideExact)
+
+            def countedSide(line, v):
+                # _sideFiltered, with its exact fallbacks counted and timed
+                stats.sideTests += 1
+                value, error = line.approxSide(v.fcoord())
+                if abs(value) > error:
+                    return value
+                stats.exactSideTests += 1
+                return exactSide(line, v)
+        else:
+            def countedSide(line, v):
+                stats.sideTests += 1
+                return side(line, v)
+        self._side = countedSide
+        self._crossing = timed("crossing", crossing)
+
+        def countedVertex(coord, *args):
+            stats.verticesCreated += 1
+            for c in coord:
+                if isinstance(c, Fraction):
+                    stats.maxBitLength = max(stats.maxBitLength, c.numerator.bit_length(), c.denominator.bit_length())
+                elif isinstance(c, int):
+                    stats.maxBitLength = max(stats.maxBitLength, c.bit_length())
+            return newVertex(coord, *args)
+
+        def countedHalfEdge(*args):
+            stats.halfEdgesCreated += 1
+            return newHalfEdge(*args)
+
+        def countedFace(edge):
+            stats.facesCreated += 1
+            return newFace(edge)
+        self._newVertex, self._newHalfEdge, self._newFace = countedVertex, countedHalfEdge, countedFace
+        return stats
+
+    def disableStats(self):
+        """Stop recording stats and restore the unwrapped phases; the stats recorded so far are kept by the caller"""
+        if self.stats is None:
+            return
+        for phase in ConstructionStats.PHASES:
+            del self.__dict__[phase]
+        self._side, self._crossing, self._newVertex, self._newHalfEdge, self._newFace = self._unwrapped
+        del self._unwrapped
+        self.stats = None
+
+    def profileConstruction(self, path: str = None, workers: int = 1) -> pstats.Stats:
+        """Construct the arrangement under cProfile and return the profile, also written to path if given
+
+        The file is in the format of cProfile's dump_stats, for pstats, snakeviz and the like.
+        """
+        profiler = cProfile.Profile()
+        profiler.runcall(self.constructArrangement, workers)
+        if path is not None:
+            profiler.dump_stats(path)
+        return pstats.Stats(profiler)
+
+
+    def save(self, path: str):
+        """Write the arrangement to a file that load() maps back into memory
+
+        The file holds a JSON header with the lines, the bounding box and where each array starts, followed
+        by the arrays, each aligned to 8 bytes: the half edge links and vertex fields of a DCELArrays store,
+        the exact coordinates as numerator and denominator arrays (float arrays with arithmetic="float"),
+        the vertices of the degree index in order and the faces of the face table. With storage="objects" the
+        DCEL is first flattened into a DCELArrays store.
+        """
+        if self.outsideEdge is None:
+            raise ValueError("the arrangement has not been built")
+        if self.dcel is None:
+            store, vertexIndex, edgeIndex, faceIndex = _flattened(self.outsideEdge, self.faces())
+        else:
+            store = self.dcel
+            vertexIndex = edgeIndex = faceIndex = lambda record: record._i
+            for v in range(store.vertexCount()):
+                if math.isnan(store.fx[v]):
+                    VertexView(store, v).fcoord()
+
+        # the vertices of the degree index, highest degree first and each bucket in order
+        counts = []
+        order = array('i')
+        for degree in range(self._maxDegree, 0, -1):
+            bucket = self._buckets().get(degree)
+            if bucket:
+                counts.append((degree, len(bucket)))
+                order.extend(vertexIndex(v) for v in bucket)
+
+        sections = [("origin", store.origin), ("dest", store.dest), ("twin", store.twin), ("next", store.next),
+                    ("prev", store.prev), ("line", store.line), ("bounded", store.bounded),
+                    ("incEdge", store.incEdge), ("degree", store.degree), ("fx", store.fx), ("fy", store.fy),
+                    ("degreeOrder", order), ("face", store.face), ("faceEdge", store.faceEdge),
+                    ("faceTable", array('i', map(faceIndex, self._faceTable())))]
+        sections = [(name, _format(values), values.tobytes()) for name, values in sections]
+        width = 0
+        if self.arithmetic == "float":
+            sections += [("x", "d", array('d', map(float, store.x)).tobytes()),
+                         ("y", "d", array('d', map(float, store.y)).tobytes())]
+        else:
+            xs = [Fraction(x) for x in store.x]
+            ys = [Fraction(y) for y in store.y]
+            columns = [[x.numerator for x in xs], [x.denominator for x in xs],
+                       [y.numerator for y in ys], [y.denominator for y in ys]]
+            width = max([8] + [_byteWidth(value) for column in columns for value in column])
+            for name, column in zip(("xNumerator", "xDenominator", "yNumerator", "yDenominator"), columns):
+                sections.append((name, "q" if width == 8 else "B", _packIntegers(column, width)))
+
+        offsets = {}
+        offset = 0
+        for name, format, data in sections:
+            offsets[name] = (offset, len(data), format)
+            offset = _aligned(offset + len(data))
+        # a copy of a line is saved as the copy the half edges refer to, which is in store.lines already
+        arrangementLines = [store.lineIndex(self._lineKeys.get(line.coefficients(), line)) for line in self.lines]
+        boxSides = [store.lineIndex(line) for line in self._boxSides]
+        header = {
+            "version": _FILE_VERSION,
+            "byteorder": sys.byteorder,
+            "arithmetic": self.arithmetic,
+            "lines": [[_encodeNumber(value) for value in (line.x1(), line.y1(), line.x2(), line.y2())]
+                      for line in store.lines],
+            "arrangementLines": arrangementLines,
+            "boxSides": boxSides,
+            "box": [_encodeNumber(value) for value in self._box],
+            "outsideEdge": edgeIndex(self.outsideEdge),
+            "maxDegree": self._maxDegree,
+            "degreeCounts": counts,
+            "coordinateWidth": width,
+            "sections": offsets,
+        }
+        header = json.dumps(header).encode()
+        with open(path, "wb") as f:
+            f.write(_FILE_MAGIC + len(header).to_bytes(8, "little") + header)
+            f.write(bytes(_aligned(f.tell()) - f.tell()))
+            for name, format, data in sections:
+                f.write(data)
+                f.write(bytes(_aligned(len(data)) - len(data)))
+
+
+    @classmethod
+    def load(cls, path: str) -> LineArrangement:
+        """Open an arrangement written by save(), without reading it into memory
+
+        The file is memory-mapped and the DCELArrays store of the returned arrangement (storage="arrays")
+        reads its records straight from the mapping, so opening takes about the same time whatever the size
+        and pages are only read as the arrangement is traversed. The coordinates are made into Fractions
+        when accessed, and the degree index and the face table are filled on first use, except for
+        maxIntersectionVertex() and faceCount().
+        The arrangement is read-only: insertLine and removeLine raise ValueError.
+
+        Raises:
+            ValueError: if the file was not written by save(), or on a machine with another byte order
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(_FILE_MAGIC)] != _FILE_MAGIC:
+            raise ValueError(f"{path} is not a saved line arrangement")
+        start = len(_FILE_MAGIC) + 8
+        headerLength = int.from_bytes(buffer[len(_FILE_MAGIC):start], "little")
+        header = json.loads(buffer[start:start+headerLength])
+        if header["version"] != _FILE_VERSION or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was saved in an incompatible format")
+        data = memoryview(buffer)[_aligned(start + headerLength):]
+
+        def section(name):
+            offset, length, format = header["sections"][name]
+            return data[offset:offset+length].cast(format)
+
+        lines = [Line((_decodeNumber(x1), _decodeNumber(y1)), (_decodeNumber(x2), _decodeNumber(y2)))
+                 for x1, y1, x2, y2 in header["lines"]]
+        LA = cls([lines[i] for i in header["arrangementLines"]], arithmetic=header["arithmetic"], storage="arrays")
+        LA._distinctLines(LA.lines)
+        store = LA.dcel
+        store.buffer = buffer
+        store.origin, store.dest, store.twin = section("origin"), section("dest"), section("twin")
+        store.next, store.prev, store.line = section("next"), section("prev"), section("line")
+        store.bounded, store.incEdge, store.degree = section("bounded"), section("incEdge"), section("degree")
+        store.fx, store.fy = section("fx"), section("fy")
+        store.face, store.faceEdge = section("face"), section("faceEdge")
+        store.lines = lines
+        store._lineIndex = {line: i for i, line in enumerate(lines)}
+        if LA.arithmetic == "float":
+            store.x, store.y = section("x"), section("y")
+        else:
+            width = header["coordinateWidth"]
+            store.x = _IntegerRatios(section("xNumerator"), section("xDenominator"), width)
+            store.y = _IntegerRatios(section("yNumerator"), section("yDenominator"), width)
+
+        LA.outsideEdge = HalfEdgeView(store, header["outsideEdge"])
+        LA._box = tuple(_decodeNumber(value) for value in header["box"])
+        LA._boxSides = [lines[i] for i in header["boxSides"]]
+        LA._indexBoundary()
+        LA._maxDegree = header["maxDegree"]
+        LA._savedDegrees = (section("degreeOrder"), header["degreeCounts"])
+        LA._savedFaces = section("faceTable")
+        return LA
+
+
+
+def maxConcurrency(lines: list[Line]) -> tuple[int, tuple]:
+    """Return the maximum number of lines through a single point, and that point, without building the DCEL
+
+    Every line is intersected with the lines after it and the exact intersection points are grouped by
+    hashing them in lowest terms, so only O(n) points are held at a time. Copies of a line are counted once
+    per copy, and parallel lines are skipped. Among the points of maximum degree the one returned is the one
+    LineArrangement(lines).maxIntersectionVertex() would report: the first completed when adding the lines in
+    order, a line given more than once at its last copy, then the leftmost, then the lowest. With NumPy available (and coefficients small enough for 64-bit
+    integers) each line is handled with array operations.
+
+    return:
+        a tuple (degree, (x, y)) with the coordinates as Fractions
+
+    Raises:
+        ValueError: if no two lines intersect
+    """
+    # the distinct lines, each with its number of copies and the index of its last copy
+    index = {}
+    coefficients, copies, last = [], [], []
+    for i, line in enumerate(lines):
+        key = line.coefficients()
+        j = index.get(key)
+        if j is None:
+            index[key] = len(coefficients)
+            coefficients.append(key)
+            copies.append(1)
+            last.append(i)
         else:
-            return self._maxIntersectionVertex.degree
+            copies[j] += 1
+            last[j] = i
+
+    bound = max((max(abs(a), abs(b), abs(c)) for a, b, c in coefficients), default=0)
+    if np is not None and 2 * bound * bound < 2**62:
+        best = _maxConcurrencyArrays(coefficients, copies, last)
+    else:
+        best = _maxConcurrencyPython(coefficients, copies, last)
+    if best is None:
+        raise ValueError("no two lines intersect")
+    degree, completed, x, y = best
+    return (degree, (x, y))
+
+
+def _maxConcurrencyPython(coefficients: list[tuple], copies: list[int], last: list[int]) -> tuple:
+    """Return (degree, completed, x, y) for the best point of maxConcurrency, or None if there is no point
+
+    A point is found in full from the first line through it, as every other line through it comes later.
+    """
+    best = None
+    n = len(coefficients)
+    for i in range(n - 1):
+        a1, b1, c1 = coefficients[i]
+        points = {}
+        for j in range(i + 1, n):
+            a2, b2, c2 = coefficients[j]
+            d = a1*b2 - a2*b1
+            if d == 0:
+                continue
+            x = c1*b2 - c2*b1
+            y = a1*c2 - a2*c1
+            if d < 0:
+                d, x, y = -d, -x, -y
+            g = math.gcd(x, y, d)
+            key = (x // g, y // g, d // g)
+            entry = points.get(key)
+            if entry is None:
+                points[key] = [copies[i] + copies[j], max(last[i], last[j])]
+            else:
+                entry[0] += copies[j]
+                entry[1] = max(entry[1], last[j])
+
+        for (x, y, d), (degree, completed) in points.items():
+            best = _betterPoint(best, degree, completed, x, y, d)
+    return best
+
+
+def _maxConcurrencyArrays(coefficients: list[tuple], copies: list[int], last: list[int]) -> tuple:
+    """NumPy version of _maxConcurrencyPython, for coefficients small enough to keep every product in int64
+
+    The points on line i are told apart by a single coordinate, x (y if the line is vertical), so they are
+    grouped by sorting that coordinate as a float and comparing its exact numerator and denominator. Only if
+    two different points round to the same float are they sorted exactly.
+    """
+    coefficients = np.array(coefficients, dtype=np.int64).reshape(-1, 3)
+    copies = np.array(copies, dtype=np.int64)
+    last = np.array(last, dtype=np.int64)
+    best = None
+    n = len(coefficients)
+    for i in range(n - 1):
+        a1, b1, c1 = coefficients[i]
+        a2, b2, c2 = coefficients[i+1:, 0], coefficients[i+1:, 1], coefficients[i+1:, 2]
+        d = a1*b2 - a2*b1
+        crossing = np.flatnonzero(d)
+        if len(crossing) == 0:
+            continue
+        d = d[crossing]
+        if b1 != 0:
+            t = (c1*b2 - c2*b1)[crossing]
+        else:
+            t = (a1*c2 - a2*c1)[crossing]
+        sign = np.sign(d)
+        t, d = t * sign, d * sign
+        g = np.gcd(t, d)
+        t, d = t // g, d // g
+
+        # sort the points so that copies of one point are consecutive, then add up the lines through each
+        approx = t / d
+        order = np.argsort(approx)
+        t, d, approx = t[order], d[order], approx[order]
+        new = (t[1:] != t[:-1]) | (d[1:] != d[:-1])
+        if (new & (approx[1:] == approx[:-1])).any():
+            # two points closer than the float resolution may interleave, so sort those exactly
+            exact = np.lexsort((d, t))
+            order, t, d = order[exact], t[exact], d[exact]
+            new = (t[1:] != t[:-1]) | (d[1:] != d[:-1])
+        crossing = crossing[order]
+        starts = np.flatnonzero(np.concatenate(([True], new)))
+        degree = copies[i] + np.add.reduceat(copies[i+1:][crossing], starts)
+        completed = np.maximum(last[i], np.maximum.reduceat(last[i+1:][crossing], starts))
+
+        # only the points of highest degree completed first can be the best, compare those exactly
+        top = degree.max()
+        if best is not None and top < best[0]:
+            continue
+        first = completed[degree == top].min()
+        for k in starts[(degree == top) & (completed == first)]:
+            j = i + 1 + crossing[k]
+            a2, b2, c2 = (int(v) for v in coefficients[j])
+            a1, b1, c1 = (int(v) for v in coefficients[i])
+            dk = a1*b2 - a2*b1
+            best = _betterPoint(best, int(top), int(first), c1*b2 - c2*b1, a1*c2 - a2*c1, dk)
+    return best
+
+
+def _betterPoint(best: tuple, degree: int, completed: int, x: int, y: int, d: int) -> tuple:
+    """Return whichever of best and the point (x/d, y/d) is preferred by maxConcurrency"""
+    if best is not None:
+        if degree != best[0]:
+            if degree < best[0]:
+                return best
+        elif completed != best[1]:
+            if completed > best[1]:
+                return best
+        elif (Fraction(x, d), Fraction(y, d)) >= (best[2], best[3]):
+            return best
+    return (degree, completed, Fraction(x, d), Fraction(y, d))
+
+
+
+def buildMany(lineSubsets: list[list[Line]], workers: int = 1, arithmetic: str = "filtered",
+              storage: str = "objects") -> list[tuple[int]]:
+    """Construct the arrangement of each subset of lines and return a summary of each
+
+    Meant for the many small arrangements of the Q-lines recursion. The lines of all the subsets are gathered
+    in one table, so a line shared by several subsets (and its coefficients) is sent to each worker process
+    only once, when the pool starts, and each subset travels as a list of indices into the table. The
+    arrangements are built and summarized where they are built, and only the summaries come back.
+
+    Args:
+        lineSubsets: the lines of each arrangement
+        workers: the number of processes to build the arrangements in, or 1 to build them in this one
+        arithmetic, storage: as for LineArrangement
+
+    return:
+        for each subset, in order, a tuple (maxDegree, vertexCount, faceCount) counting the intersection
+        points and the faces of the arrangement (see LineArrangement.summary)
+    """
+    position = {}
+    table = []
+    subsets = []
+    for lines in lineSubsets:
+        indices = array('i')
+        for line in lines:
+            i = position.get(id(line))
+            if i is None:
+                i = position[id(line)] = len(table)
+                table.append(line)
+            indices.append(i)
+        subsets.append(indices)
+
+    if workers <= 1:
+        return [_summarize([table[i] for i in indices], arithmetic, storage) for indices in subsets]
+    chunksize = max(1, len(subsets) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_shareLines, initargs=(table,)) as pool:
+        return list(pool.map(_summarizeShared, subsets, repeat(arithmetic), repeat(storage), chunksize=chunksize))
+
+
+# the line table of buildMany, in each of its worker processes
+_sharedLines = None
+
+
+def _shareLines(lines: list[Line]):
+    global _sharedLines
+    _sharedLines = lines
+
+
+def _summarizeShared(indices: array, arithmetic: str, storage: str) -> tuple[int]:
+    return _summarize([_sharedLines[i] for i in indices], arithmetic, storage)
+
+
+def _summarize(lines: list[Line], arithmetic: str, storage: str) -> tuple[int]:
+    """Return LineArrangement.summary() for the arrangement of lines, built from scratch"""
+    LA = LineArrangement(lines, arithmetic=arithmetic, storage=storage)
+    try:
+        LA.constructArrangement()
+    except ValueError:
+        # no two lines intersect: n distinct parallel lines cut the plane into n + 1 strips
+        return (0, 0, len({line.coefficients() for line in lines}) + 1)
+    return LA.summary()
+
+
+def _buildSlab(lines: list[Line], box: tuple, arithmetic: str, copies: list[int]) -> tuple:
+    """Build the arrangement of the distinct lines crossing one slab, given with their numbers of copies, in a
+    worker process of _constructSlabs
+
+    return:
+        the DCELArrays store, the position in lines of each line of its line table (-1 - side for the sides
+        of the slab), and the indices of the outside edges along each side of the slab, in order
+    """
+    LA = LineArrangement(lines, arithmetic=arithmetic, storage="arrays")
+    LA._copies = {line: k for line, k in zip(lines, copies) if k > 1}
+    LA.boundingBox(*box)
+    LA._addLines([line for line in lines if LA.leftMostedge(line) is not None])
+    position = {id(line): i for i, line in enumerate(lines)}
+    lineIds = [position[id(line)] if id(line) in position else -1 - LA._sideIndex[line] for line in LA.dcel.lines]
+    sideEdges = [[edge._i for edge in edges] for edges in LA._sideEdges]
+    return LA.dcel, lineIds, sideEdges
+
+
+def _cornerFreeBox(lines: list[Line], left, right, top, bottom) -> tuple:
+    """Return the box moved out by whole units to the left and right until no line passes through a corner
+
+    A line through a corner would share the corner's vertex, which addLine cannot handle. Horizontal lines are
+    never in the way, as each meets a line that is not horizontal inside the box, so only the points where the
+    other lines cross the top and bottom are, and finding them takes O(n). They are found exactly, unless the
+    box is given in floats, as with float arithmetic.
+    """
+    divide = operator.truediv if isinstance(top, float) else Fraction
+    blocked = set()
+    for line in lines:
+        a, b, c = line.coefficients()
+        if a != 0:
+            blocked.add(divide(c - b*top, a))
+            blocked.add(divide(c - b*bottom, a))
+    while left in blocked:
+        left -= 1
+    while right in blocked:
+        right += 1
+    return (left, right, top, bottom)
+
+
+def _slabWalls(lines: list[Line], left, right, top, bottom, count: int) -> list[Fraction]:
+    """Return the x-coordinates of at most count-1 walls splitting the box into slabs of about equal work
+
+    The walls are placed at quantiles of the x-coordinates of a sample of intersection points, then moved
+    slightly until no two lines meet on them and no line meets them at the top or bottom of the box.
+    """
+    rng = random.Random(0)
+    sample = []
+    for _ in range(64 * count):
+        p = lines[rng.randrange(len(lines))].intercept(lines[rng.randrange(len(lines))])
+        if p is not None and left < p[0] < right:
+            sample.append(p[0])
+    sample.sort()
+
+    walls = []
+    step = (right - left) / (1 << 20)
+    for k in range(1, count):
+        if not sample:
+            break
+        x = Fraction(sample[k * len(sample) // count])
+        shift = step
+        while not _isWall(lines, x, top, bottom):
+            x += shift
+            shift /= 3
+        if left < x < right and (not walls or x > walls[-1]):
+            walls.append(x)
+    return walls
+
+
+def _isWall(lines: list[Line], x, top, bottom) -> bool:
+    """Return whether the vertical line at x misses every vertex of the arrangement and both corners"""
+    ys = []
+    for line in lines:
+        a, b, c = line.coefficients()
+        if b == 0:
+            if Fraction(c, a) == x:
+                return False
+        else:
+            y = (c - a*x) / b
+            if y == top or y == bottom:
+                return False
+            ys.append(y)
+    ys.sort()
+    return all(ys[i] != ys[i+1] for i in range(len(ys) - 1))
+
+
+def _joinEdges(eIn: HalfEdge, fOut: HalfEdge):
+    """Join the half edge eIn into a vertex and the collinear half edge fOut out of it (or out of a copy of it)
+
+    eIn and the twin of fOut are kept and extended over the vertex, fOut and the twin of eIn are dropped. A face
+    whose boundary started at a dropped half edge starts at the kept one taking its place instead.
+
+    return:
+        the two half edges dropped
+    """
+    eOut, fIn = eIn.twin(), fOut.twin()
+    eIn.setDest(fOut.dest())
+    eIn.setNext(fOut.next())
+    fOut.next().setPrev(eIn)
+    fIn.setDest(eOut.dest())
+    fIn.setNext(eOut.next())
+    eOut.next().setPrev(fIn)
+    eIn.setTwin(fIn)
+    fIn.setTwin(eIn)
+    for dropped, kept in ((fOut, eIn), (eOut, fIn)):
+        face = dropped.face()
+        if face is not None and face.edge() == dropped:
+            face.setEdge(kept)
+    return (eOut, fOut)
+
+
+def _boxSides(left, right, top, bottom) -> list[Line]:
+    """Return the top, right, bottom and left sides of a box as lines"""
+    return [Line((right, top), (left, top)), Line((right, bottom), (right, top)),
+            Line((left, bottom), (right, bottom)), Line((left, top), (left, bottom))]
+
+
+def _boundaryKey(side: int, p: tuple):
+    """Return the position of p along a side of the box, increasing in the direction of its outside edges"""
+    if side == _TOP:
+        return p[0]
+    if side == _RIGHT:
+        return -p[1]
+    if side == _BOTTOM:
+        return -p[0]
+    return p[1]
+
+
+def _reflect(slope, intercept) -> tuple:
+    """Reflect the line (slope, yInt), or (None, xInt) if vertical, in the line y = x"""
+    if slope is None:
+        return (Fraction(0), intercept)
+    if slope == 0:
+        return (None, intercept)
+    return (1/slope, -intercept/slope)
+
+
+def _extremeX(lines: list[tuple]) -> tuple:
+    """Return the smallest and largest x-coordinate over the intersection points of the given lines
+
+    Far to the left the lines are ordered by slope, and the leftmost intersection point must be formed by two
+    lines that are adjacent in that order (likewise on the right). Parallel lines never meet, so it suffices
+    to intersect the lines on either side of each change of slope in the sorted order. A vertical line
+    meets every non-vertical line, so its x-intercept is a candidate as well.
+
+    Args:
+        lines: a (slope, yInt) pair for each line, or (None, xInt) if the line is vertical
+
+    return:
+        a tuple (left, right), or None if no two lines intersect
+    """
+    verticals = [intercept for slope, intercept in lines if slope is None]
+    others = sorted(line for line in lines if line[0] is not None)
+    if not others:
+        return None
+
+    # split the sorted lines into groups of equal slope, given by their first and last index
+    starts = [0] + [i for i in range(1, len(others)) if others[i][0] != others[i-1][0]]
+    ends = [i-1 for i in starts[1:]] + [len(others)-1]
+
+    candidates = list(verticals)
+    for g in range(len(starts)-1):
+        # at -infinity the lowest line of a group meets the highest of the next, at +infinity the opposite
+        for i, j in ((starts[g], ends[g+1]), (ends[g], starts[g+1])):
+            (m1, q1), (m2, q2) = others[i], others[j]
+            candidates.append((q2 - q1) / (m1 - m2))
+
+    if not candidates:
+        return None
+    return (min(candidates), max(candidates))
+
+
+def _extremeXArrays(lines: list[tuple]) -> tuple[float]:
+    """NumPy version of _extremeX for lines given with float slopes and intercepts"""
+    slopes = np.array([np.nan if slope is None else slope for slope, intercept in lines], dtype=float)
+    intercepts = np.array([intercept for slope, intercept in lines], dtype=float)
+    vertical = np.isnan(slopes)
+    slopes, verticals, intercepts = slopes[~vertical], intercepts[vertical], intercepts[~vertical]
+    if len(slopes) == 0:
+        return None
+
+    order = np.lexsort((intercepts, slopes))
+    slopes, intercepts = slopes[order], intercepts[order]
+    starts = np.concatenate(([0], np.flatnonzero(slopes[1:] != slopes[:-1]) + 1))
+    ends = np.concatenate((starts[1:] - 1, [len(slopes) - 1]))
+
+    i = np.concatenate((starts[:-1], ends[:-1]))
+    j = np.concatenate((ends[1:], starts[1:]))
+    candidates = np.concatenate((verticals, (intercepts[j] - intercepts[i]) / (slopes[i] - slopes[j])))
+    if len(candidates) == 0:
+        return None
+    return (float(candidates.min()), float(candidates.max()))
+
+
+def _sideExact(line: Line, v: Vertex):
+    return line.side(v.coord())
+
+
+def _sideFiltered(line: Line, v: Vertex):
+    """Return line.side(v) in floating point if its sign is certain, otherwise evaluate it exactly"""
+    value, error = line.approxSide(v.fcoord())
+    if abs(value) > error:
+        return value
+    return line.side(v.coord())
+
+
+def _sideFloat(line: Line, v: Vertex):
+    return line.approxSide(v.fcoord())[0]
+
+
+def _crossingExact(line: Line, edge: HalfEdge, originSide, destSide) -> tuple:
+    edgeLine = edge.line()
+    if edgeLine is None:
+        edgeLine = Line(edge.origin().coord(), edge.dest().coord())
+    return line.intercept(edgeLine)
+
+
+def _crossingFloat(line: Line, edge: HalfEdge, originSide: float, destSide: float) -> tuple[float]:
+    """Interpolate the crossing point along the edge from the (float) sides of its endpoints"""
+    x1, y1 = edge.origin().fcoord()
+    x2, y2 = edge.dest().fcoord()
+    t = originSide / (originSide - destSide)
+    return (x1 + t*(x2 - x1), y1 + t*(y2 - y1))
+
+
+def _toFloat(value) -> float:
+    """Convert a number to float, saturating to infinity instead of raising OverflowError"""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+
+class ConstructionStats:
+    """Counters and timers of one arrangement's construction, recorded while LineArrangement.enableStats is on
+
+    The times of the phases are inclusive, as cProfile's cumulative times are: the time of addLine includes
+    that of the faceSplit and leftMostedge calls it makes.
+
+    Attributes:
+        calls, seconds: the number of calls to each phase and the total time spent in them
+        sideTests: the side-of-line tests of vertices against new lines, one for each boundary vertex visited
+        exactSideTests: the side tests evaluated with Fractions (only counted with arithmetic="filtered")
+        edgesPerLine: the side tests made while adding each line, i.e. the edges walked through its zone
+        verticesCreated, halfEdgesCreated, facesCreated: the DCEL records created
+        maxBitLength: the largest bit length of a numerator or denominator of a new vertex's coordinates
+    """
+    PHASES = ("extremePoints", "boundingBox", "addLine", "leftMostedge", "lineEdgeInt", "faceSplit", "insertLine",
+              "removeLine")
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+        self.sideTests = 0
+        self.exactSideTests = 0
+        self.edgesPerLine = []
+        self.verticesCreated = 0
+        self.halfEdgesCreated = 0
+        self.facesCreated = 0
+        self.maxBitLength = 0
+
+    def intersectionTests(self) -> int:
+        """Return the number of tests of a new line against a vertex or edge: the side tests and lineEdgeInt calls"""
+        return self.sideTests + self.calls.get("lineEdgeInt", 0)
+
+    def report(self) -> str:
+        """Return the stats as a few lines of text"""
+        lines = [f"{phase:>14}: {self.calls[phase]:>9} calls {self.seconds[phase]:10.4f} s"
+                 for phase in sorted(self.seconds, key=self.seconds.get, reverse=True)]
+        edges = self.edgesPerLine
+        lines.append(f"side tests: {self.sideTests} ({self.exactSideTests} exact), intersection tests: "
+                     f"{self.intersectionTests()}, edges per line: "
+                     + (f"mean {sum(edges) / len(edges):.1f}, max {max(edges)}" if edges else "none"))
+        lines.append(f"created: {self.verticesCreated} vertices, {self.halfEdgesCreated} half edges, "
+                     f"{self.facesCreated} faces; largest coordinate: {self.maxBitLength} bits")
+        return "\n".join(lines)
 
 
 
@@ -324,9 +1939,11 @@ class Vertex:
         incidentEdge: reference to an arbitrary half edge with v as its origin
         degree: the degree of the vertex
     """
+    __slots__ = ('_coord', '_fcoord', '_incEdge', 'degree')
 
     def __init__(self, coord: tuple, incEdge: HalfEdge, degree=0):
         self._coord = coord
+        self._fcoord = None
         self._incEdge = incEdge
         self.degree = degree
 
@@ -345,6 +1962,16 @@ class Vertex:
     def coord(self) -> tuple:
         return self._coord
 
+    def setCoord(self, coord: tuple):
+        self._coord = coord
+        self._fcoord = None
+
+    def fcoord(self) -> tuple[float]:
+        """Return the coordinates rounded to floats, computed on first use"""
+        if self._fcoord is None:
+            self._fcoord = (_toFloat(self._coord[0]), _toFloat(self._coord[1]))
+        return self._fcoord
+
 
 
 class HalfEdge:
@@ -360,14 +1987,20 @@ class HalfEdge:
         boundedFace: boolean whether adjacent face is bounded or not
         next: the next edge along the face
         prev: the prev edge along the face
+        line: the input line (or side of the bounding box) the edge lies on, shared with its twin
+        face: the face the edge bounds, or None outside the bounding box
     """
-    def __init__(self, origin, dest, twin, boundedFace: bool, next, prev):
+    __slots__ = ('_origin', '_dest', '_twin', '_boundedFace', '_next', '_prev', '_line', '_face')
+
+    def __init__(self, origin, dest, twin, boundedFace: bool, next, prev, line: Line = None, face: Face = None):
         self._origin = origin
         self._dest = dest
         self._twin = twin
         self._boundedFace = boundedFace
         self._next = next
         self._prev = prev
+        self._line = line
+        self._face = face
 
 
     def origin(self) -> Vertex:
@@ -423,95 +2056,868 @@ class HalfEdge:
         """Setter method for 'prev'."""
         self._prev = new_prev
 
+
+    def line(self) -> Line:
+        """Getter method for 'line'."""
+        return self._line
+
+
+    def setLine(self, new_line: Line):
+        """Setter method for 'line'."""
+        self._line = new_line
+
+
+    def face(self) -> Face:
+        """Getter method for 'face'."""
+        return self._face
+
+
+    def setFace(self, new_face: Face):
+        """Setter method for 'face'."""
+        self._face = new_face
+
     def toString(self)->str:
         return f"{self.origin().coord()}->{self.dest().coord()}"
 
 
 
+class Face:
+    """A face of the arrangement inside the bounding box
+
+    Attributes:
+        edge: a half edge on the boundary of the face, which the half edges after it go around counterclockwise
+    """
+    __slots__ = ('_edge',)
+
+    def __init__(self, edge: HalfEdge):
+        self._edge = edge
+
+    def edge(self) -> HalfEdge:
+        return self._edge
+
+    def setEdge(self, e: HalfEdge):
+        self._edge = e
+
+    def boundary(self):
+        """Yield the half edges around the face, counterclockwise from edge()"""
+        start = edge = self.edge()
+        while True:
+            yield edge
+            edge = edge.next()
+            if edge == start:
+                return
+
+    def size(self) -> int:
+        """Return the number of half edges (and of vertices) on the boundary of the face"""
+        return sum(1 for _ in self.boundary())
+
+
+class DCELArrays:
+    """Store the vertices and half edges of a DCEL in flat, parallel arrays.
+
+    Each half edge is an index into seven 32-bit integer arrays (origin, dest, twin, next, prev, line, face)
+    and one byte array (bounded), each vertex is an index into the coordinate arrays and two 32-bit arrays
+    (incEdge, degree), and each face an index into one 32-bit array (faceEdge). A missing reference is stored
+    as -1. The records are handed out as VertexView, HalfEdgeView and FaceView objects, which implement the
+    Vertex, HalfEdge and Face interface on top of an index, so the construction code does not need to know
+    which storage it is working with.
+
+    The degree index of an arrangement kept in the store links the vertex indices of each degree into a list
+    through two more 32-bit arrays (see VertexBucket), and its face table is the faces that still have a
+    faceEdge (see FaceTable), so neither keeps an object per record either.
+
+    The exact coordinates are kept as 64-bit numerators and denominators while they fit (see _RatioArray),
+    and made into Fractions when read, which takes construction about 10% longer than with Fraction objects.
+
+    Memory of a whole arrangement per half edge, everything it allocates included (CPython 3.11, measured
+    by benchmarks/bench_memory.py on 120 and 250 random lines, about 29k and 124k half edges):
+        storage="objects": ~226 bytes
+        storage="arrays": ~50 bytes, a 4.5x cut. The records take 29 bytes per half edge and the vertices
+            (coordinates, their floats, incEdge, degree and bucket links, 64 bytes each) 16 more, the rest
+            being the slack of the growing arrays
+
+    Attributes:
+        origin, dest, twin, next, prev: half edge links, as indices
+        bounded: 1 if the face adjacent to the half edge is bounded, 0 otherwise
+        line: index into lines of the line each half edge lies on
+        face: the face each half edge bounds, -1 outside the bounding box
+        lines: the distinct lines referred to by the half edges
+        x, y: the exact coordinates of each vertex, as _RatioArray sequences
+        fx, fy: the coordinates rounded to floats, NaN until first used
+        incEdge: index of a half edge with the vertex as its origin
+        degree: the number of lines passing through each vertex
+        faceEdge: index of a half edge on the boundary of each face, -1 once the face is removed
+        bucketNext, bucketPrev: the next and previous vertex in the bucket of the degree index holding each
+            vertex, -1 at either end, grown as vertices are put in a bucket
+        buffer: the file mapped into memory if the store was loaded, in which case the fields are read-only
+            memoryviews of it (see LineArrangement.load), otherwise None
+    """
+    def __init__(self):
+        self.origin = array('i')
+        self.dest = array('i')
+        self.twin = array('i')
+        self.next = array('i')
+        self.prev = array('i')
+        self.bounded = array('b')
+        self.line = array('i')
+        self.face = array('i')
+        self.lines = []
+        self._lineIndex = {}
+
+        self.x = _RatioArray()
+        self.y = _RatioArray()
+        self.fx = array('d')
+        self.fy = array('d')
+        self.incEdge = array('i')
+        self.degree = array('i')
+
+        self.faceEdge = array('i')
+        self.bucketNext = array('i')
+        self.bucketPrev = array('i')
+        # the memory map the fields are views of, for a store opened by LineArrangement.load
+        self.buffer = None
+
+
+    def newVertex(self, coord: tuple, incEdge: HalfEdgeView, degree=0) -> VertexView:
+        """Append a vertex record and return a view of it"""
+        self.x.append(coord[0])
+        self.y.append(coord[1])
+        self.fx.append(math.nan)
+        self.fy.append(math.nan)
+        self.incEdge.append(_index(incEdge))
+        self.degree.append(degree)
+        return VertexView(self, len(self.degree) - 1)
+
+
+    def newHalfEdge(self, origin: VertexView, dest: VertexView, twin: HalfEdgeView, boundedFace: bool,
+                    next: HalfEdgeView, prev: HalfEdgeView, line: Line = None, face: FaceView = None) -> HalfEdgeView:
+        """Append a half edge record and return a view of it"""
+        self.origin.append(_index(origin))
+        self.dest.append(_index(dest))
+        self.twin.append(_index(twin))
+        self.bounded.append(1 if boundedFace else 0)
+        self.next.append(_index(next))
+        self.prev.append(_index(prev))
+        self.line.append(self.lineIndex(line))
+        self.face.append(_index(face))
+        return HalfEdgeView(self, len(self.origin) - 1)
+
+
+    def newFace(self, edge: HalfEdgeView) -> FaceView:
+        """Append a face record and return a view of it"""
+        self.faceEdge.append(_index(edge))
+        return FaceView(self, len(self.faceEdge) - 1)
+
+
+    def faceTable(self) -> FaceTable:
+        """Return the face table of the faces of this store"""
+        return FaceTable(self)
+
+
+    def newBucket(self) -> VertexBucket:
+        """Return a new empty bucket of the degree index, linking vertices of this store"""
+        return VertexBucket(self)
+
+
+    def lineIndex(self, line: Line) -> int:
+        """Return the index of line in lines, adding it if needed, or -1 for None"""
+        if line is None:
+            return -1
+        i = self._lineIndex.get(line)
+        if i is None:
+            i = len(self.lines)
+            self.lines.append(line)
+            self._lineIndex[line] = i
+        return i
+
+
+    def extend(self, other: DCELArrays, lines: list[Line]) -> tuple[int]:
+        """Append every record of another store, referring to lines[k] wherever it refers to its k-th line
+
+        return:
+            the offsets (vertices, half edges) of the records of other in this store
+        """
+        vertexOffset, edgeOffset, faceOffset = self.vertexCount(), self.halfEdgeCount(), self.faceCount()
+        lineIndices = [self.lineIndex(line) for line in lines]
+        self.origin.extend(_shifted(other.origin, vertexOffset))
+        self.dest.extend(_shifted(other.dest, vertexOffset))
+        self.twin.extend(_shifted(other.twin, edgeOffset))
+        self.next.extend(_shifted(other.next, edgeOffset))
+        self.prev.extend(_shifted(other.prev, edgeOffset))
+        self.bounded.extend(other.bounded)
+        self.line.extend(array('i', [-1 if k < 0 else lineIndices[k] for k in other.line]))
+        self.face.extend(_shifted(other.face, faceOffset))
+
+        self.x.extend(other.x)
+        self.y.extend(other.y)
+        self.fx.extend(other.fx)
+        self.fy.extend(other.fy)
+        self.incEdge.extend(_shifted(other.incEdge, edgeOffset))
+        self.degree.extend(other.degree)
+        self.faceEdge.extend(_shifted(other.faceEdge, edgeOffset))
+        return (vertexOffset, edgeOffset)
+
+
+    def compact(self, dropEdges: list[int], dropVertices: list[int]) -> array:
+        """Remove the given half edge and vertex records and renumber the others, keeping their order
+
+        No record left may refer to a removed one, except a face, whose half edge becomes -1 if removed.
+
+        return:
+            the new index of each old half edge, -1 for the removed ones
+        """
+        keepEdges = _keepMask(self.halfEdgeCount(), dropEdges)
+        keepVertices = _keepMask(self.vertexCount(), dropVertices)
+        edgeMap = _renumbering(keepEdges)
+        vertexMap = _renumbering(keepVertices)
+
+        self.origin = _selected(self.origin, keepEdges, vertexMap)
+        self.dest = _selected(self.dest, keepEdges, vertexMap)
+        self.twin = _selected(self.twin, keepEdges, edgeMap)
+        self.next = _selected(self.next, keepEdges, edgeMap)
+        self.prev = _selected(self.prev, keepEdges, edgeMap)
+        self.bounded = _selected(self.bounded, keepEdges)
+        self.line = _selected(self.line, keepEdges)
+        self.face = _selected(self.face, keepEdges)
+
+        self.x = self.x.selected(keepVertices)
+        self.y = self.y.selected(keepVertices)
+        self.fx = _selected(self.fx, keepVertices)
+        self.fy = _selected(self.fy, keepVertices)
+        self.incEdge = _selected(self.incEdge, keepVertices, edgeMap)
+        self.degree = _selected(self.degree, keepVertices)
+        self.faceEdge = _selected(self.faceEdge, bytearray([1]) * self.faceCount(), edgeMap)
+        return edgeMap
+
+
+    def labelFaces(self) -> int:
+        """Number the faces again, one for each cycle of half edges along next inside the bounding box
+
+        Every half edge is labelled with the lowest index on its cycle, by pointer jumping: after k rounds each
+        label is the lowest index among the 2^k half edges starting at it. A face is kept for each label of a
+        bounded half edge, in increasing order, and starts at that half edge.
+
+        return:
+            the number of faces
+        """
+        count = self.halfEdgeCount()
+        if np is not None:
+            label = np.arange(count, dtype=np.int32)
+            step = np.frombuffer(self.next, dtype=np.int32).copy()
+            span = 1
+            while span < count:
+                label = np.minimum(label, label[step])
+                step = step[step]
+                span *= 2
+            bounded = np.frombuffer(self.bounded, dtype=np.int8) == 1
+            roots = np.unique(label[bounded])
+            face = np.where(bounded, np.searchsorted(roots, label), -1).astype(np.int32)
+            self.face = array('i', face.tobytes())
+            self.faceEdge = array('i', roots.astype(np.int32).tobytes())
+            return len(roots)
+
+        self.face = array('i', [-1]) * count
+        self.faceEdge = array('i')
+        for start in range(count):
+            if self.bounded[start] and self.face[start] < 0:
+                e = start
+                while self.face[e] < 0:
+                    self.face[e] = len(self.faceEdge)
+                    e = self.next[e]
+                self.faceEdge.append(start)
+        return len(self.faceEdge)
+
+
+    def vertexCount(self) -> int:
+        return len(self.degree)
+
+
+    def faceCount(self) -> int:
+        return len(self.faceEdge)
+
+
+    def halfEdgeCount(self) -> int:
+        return len(self.origin)
+
+
+
+class VertexBucket:
+    """The vertices of one degree in the degree index of an arrangement stored in a DCELArrays store
+
+    Stands in for the dict of vertices the degree index keeps per degree with storage="objects": adding a
+    vertex (bucket[v] = None) puts it last, del bucket[v] takes it out, and iterating yields views of the
+    vertices in the order they were added. The vertices are a doubly linked list of indices through the
+    bucketNext and bucketPrev arrays of the store, so a bucket costs 8 bytes per vertex in it.
+    """
+    __slots__ = ('_store', '_first', '_last', '_size')
+
+    def __init__(self, store: DCELArrays):
+        self._store = store
+        self._first = -1
+        self._last = -1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        store = self._store
+        v = self._first
+        while v >= 0:
+            # read the link first, as the caller may move v to another bucket
+            following = store.bucketNext[v]
+            yield VertexView(store, v)
+            v = following
+
+    def __setitem__(self, vertex: VertexView, value):
+        self.append(vertex._i)
+
+    def __delitem__(self, vertex: VertexView):
+        store, v = self._store, vertex._i
+        before, after = store.bucketPrev[v], store.bucketNext[v]
+        if before >= 0:
+            store.bucketNext[before] = after
+        else:
+            self._first = after
+        if after >= 0:
+            store.bucketPrev[after] = before
+        else:
+            self._last = before
+        self._size -= 1
+
+    def append(self, v: int):
+        """Put the vertex of index v last in the bucket"""
+        store = self._store
+        if v >= len(store.bucketNext):
+            grow = array('i', [-1]) * (store.vertexCount() - len(store.bucketNext))
+            store.bucketNext.extend(grow)
+            store.bucketPrev.extend(grow)
+        store.bucketPrev[v] = self._last
+        store.bucketNext[v] = -1
+        if self._last >= 0:
+            store.bucketNext[self._last] = v
+        else:
+            self._first = v
+        self._last = v
+        self._size += 1
+
+
+
+class FaceTable:
+    """The face table of an arrangement stored in a DCELArrays store: every face of the store not removed
+
+    Stands in for the dict of faces an arrangement keeps with storage="objects". The faces are numbered in the
+    order they are created, so the table needs no entry per face: iterating yields views of the faces in
+    that order, skipping those removed. A face is in the table from when DCELArrays.newFace makes it, so
+    adding it (table[face] = None) only counts it, and del table[face] marks it removed by setting its
+    faceEdge to -1.
+    """
+    __slots__ = ('_store', '_size')
+
+    def __init__(self, store: DCELArrays):
+        self._store = store
+        self._size = sum(1 for e in store.faceEdge if e >= 0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        store = self._store
+        for f in range(store.faceCount()):
+            if store.faceEdge[f] >= 0:
+                yield FaceView(store, f)
+
+    def __setitem__(self, face: FaceView, value):
+        self._size += 1
+
+    def __delitem__(self, face: FaceView):
+        self._store.faceEdge[face._i] = -1
+        self._size -= 1
+
+
+
+def _shifted(indices: array, offset: int) -> array:
+    """Return the indices plus offset, keeping -1 for a missing reference"""
+    if np is not None:
+        values = np.frombuffer(indices, dtype=np.int32) if len(indices) else np.zeros(0, dtype=np.int32)
+        return array('i', np.where(values < 0, values, values + offset).astype(np.int32).tobytes())
+    return array('i', [-1 if i < 0 else i + offset for i in indices])
+
+
+def _keepMask(count: int, drop: list[int]) -> bytearray:
+    """Return a byte per record, 0 for the indices in drop and 1 for the others"""
+    keep = bytearray([1]) * count
+    for i in drop:
+        keep[i] = 0
+    return keep
+
+
+def _renumbering(keep: bytearray) -> array:
+    """Return the new index of each record once the records not kept are removed, -1 for those"""
+    if np is not None:
+        kept = np.frombuffer(keep, dtype=np.uint8).astype(bool)
+        return array('i', np.where(kept, np.cumsum(kept) - 1, -1).astype(np.int32).tobytes())
+    newIndex = array('i', [-1]) * len(keep)
+    count = 0
+    for i, k in enumerate(keep):
+        if k:
+            newIndex[i] = count
+            count += 1
+    return newIndex
+
+
+def _selected(values: array, keep: bytearray, newIndex: array = None) -> array:
+    """Return the values of the records kept, each mapped through newIndex if given (keeping -1 as is)"""
+    if np is not None:
+        kept = np.frombuffer(keep, dtype=np.uint8).astype(bool)
+        selected = np.frombuffer(values, dtype=values.typecode)[kept] if len(values) else np.zeros(0, values.typecode)
+        if newIndex is not None:
+            selected = np.where(selected < 0, -1, np.frombuffer(newIndex, dtype=np.int32)[selected])
+        return array(values.typecode, selected.astype(values.typecode).tobytes())
+    if newIndex is None:
+        return array(values.typecode, [v for v, k in zip(values, keep) if k])
+    return array(values.typecode, [-1 if v < 0 else newIndex[v] for v, k in zip(values, keep) if k])
+
+
+# the first bytes of a file written by LineArrangement.save, and the version of its layout
+_FILE_MAGIC = b"LARR\x00\x00\x00\x00"
+_FILE_VERSION = 1
+
+
+def _flattened(outsideEdge: HalfEdge, faces: list[Face]) -> tuple:
+    """Copy the DCEL reachable from outsideEdge, with the given faces, into a DCELArrays store
+
+    return:
+        the store, and functions giving the index in it of a Vertex, of a HalfEdge and of a Face
+    """
+    edges = []
+    edgeIds = {}
+    stack = [outsideEdge]
+    while stack:
+        edge = stack.pop()
+        if id(edge) not in edgeIds:
+            edgeIds[id(edge)] = len(edges)
+            edges.append(edge)
+            stack.append(edge.twin())
+            stack.append(edge.next())
+    vertices = []
+    vertexIds = {}
+    for edge in edges:
+        v = edge.origin()
+        if id(v) not in vertexIds:
+            vertexIds[id(v)] = len(vertices)
+            vertices.append(v)
+
+    faceIds = {id(face): i for i, face in enumerate(faces)}
+
+    store = DCELArrays()
+    for face in faces:
+        store.faceEdge.append(edgeIds[id(face.edge())])
+    for v in vertices:
+        store.x.append(v.coord()[0])
+        store.y.append(v.coord()[1])
+        fx, fy = v.fcoord()
+        store.fx.append(fx)
+        store.fy.append(fy)
+        store.incEdge.append(-1 if v.incEdge() is None else edgeIds[id(v.incEdge())])
+        store.degree.append(v.degree)
+    for edge in edges:
+        store.origin.append(vertexIds[id(edge.origin())])
+        store.dest.append(vertexIds[id(edge.dest())])
+        store.twin.append(edgeIds[id(edge.twin())])
+        store.next.append(edgeIds[id(edge.next())])
+        store.prev.append(edgeIds[id(edge.prev())])
+        store.bounded.append(1 if edge.boundedFace() else 0)
+        store.line.append(store.lineIndex(edge.line()))
+        store.face.append(-1 if edge.face() is None else faceIds[id(edge.face())])
+    return store, lambda v: vertexIds[id(v)], lambda edge: edgeIds[id(edge)], lambda face: faceIds[id(face)]
+
+
+def _format(values) -> str:
+    """Return the struct format of the items of an array, or of a memoryview of a loaded store"""
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def _byteWidth(value: int) -> int:
+    """Return the number of bytes, a multiple of 8, holding value as a signed integer"""
+    return (value.bit_length() + 1 + 63) // 64 * 8
+
+
+def _packIntegers(values: list[int], width: int) -> bytes:
+    if width == 8:
+        return array('q', values).tobytes()
+    return b"".join(value.to_bytes(width, sys.byteorder, signed=True) for value in values)
+
+
+def _encodeNumber(value) -> int | float | str:
+    """Return a coordinate as JSON represents it exactly: ints and floats as is, Fractions as strings"""
+    return str(value) if isinstance(value, Fraction) else value
+
+
+def _decodeNumber(value):
+    return Fraction(value) if isinstance(value, str) else value
+
+
+class _IntegerRatios:
+    """A read-only sequence of Fractions stored as numerator and denominator arrays of a loaded file
+
+    With a width of 8 bytes the arrays are 64-bit integer memoryviews, otherwise byte memoryviews holding
+    width bytes per integer.
+    """
+    __slots__ = ('_numerators', '_denominators', '_width')
+
+    def __init__(self, numerators: memoryview, denominators: memoryview, width: int):
+        self._numerators = numerators
+        self._denominators = denominators
+        self._width = width
+
+    def __len__(self) -> int:
+        return len(self._numerators) if self._width == 8 else len(self._numerators) // self._width
+
+    def __getitem__(self, i: int) -> Fraction:
+        if self._width == 8:
+            return Fraction(self._numerators[i], self._denominators[i])
+        start = i * self._width
+        numerator = int.from_bytes(self._numerators[start:start+self._width], sys.byteorder, signed=True)
+        denominator = int.from_bytes(self._denominators[start:start+self._width], sys.byteorder, signed=True)
+        return Fraction(numerator, denominator)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class _RatioArray:
+    """A growable sequence of the x or y coordinates of the vertices of a DCELArrays store
+
+    Fractions are kept as numerators and denominators in two 64-bit integer arrays and read back as Fractions,
+    16 bytes a coordinate instead of a Fraction object and its two ints; an int is kept with a denominator of
+    0 and read back as the int. A value that does not fit, a numerator or denominator of 64 bits or more, or a
+    float, turns the sequence into a list of the values as given, which it stays.
+    """
+    __slots__ = ('_numerators', '_denominators', '_values')
+
+    def __init__(self, values=()):
+        self._numerators = array('q')
+        self._denominators = array('q')
+        self._values = None
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self._numerators) if self._values is None else len(self._values)
+
+    def __getitem__(self, i: int):
+        if self._values is None:
+            denominator = self._denominators[i]
+            return self._numerators[i] if denominator == 0 else Fraction(self._numerators[i], denominator)
+        return self._values[i]
+
+    def __setitem__(self, i: int, value):
+        if self._values is None:
+            ratio = _ratio(value)
+            if ratio is not None:
+                try:
+                    self._numerators[i], self._denominators[i] = ratio
+                    return
+                except OverflowError:
+                    pass
+            self._fallBack()
+        self._values[i] = value
+
+    def __iter__(self):
+        if self._values is None:
+            return (n if d == 0 else Fraction(n, d) for n, d in zip(self._numerators, self._denominators))
+        return iter(self._values)
+
+    def append(self, value):
+        if self._values is None:
+            ratio = _ratio(value)
+            if ratio is not None:
+                try:
+                    self._numerators.append(ratio[0])
+                    try:
+                        self._denominators.append(ratio[1])
+                        return
+                    except OverflowError:
+                        self._numerators.pop()
+                        raise
+                except OverflowError:
+                    pass
+            self._fallBack()
+        self._values.append(value)
+
+    def extend(self, values):
+        if self._values is None and isinstance(values, _RatioArray) and values._values is None:
+            self._numerators.extend(values._numerators)
+            self._denominators.extend(values._denominators)
+            return
+        for value in values:
+            self.append(value)
+
+    def selected(self, keep: bytearray) -> _RatioArray:
+        """Return the values of the records kept, as a new sequence"""
+        selected = _RatioArray()
+        if self._values is None:
+            selected._numerators = _selected(self._numerators, keep)
+            selected._denominators = _selected(self._denominators, keep)
+        else:
+            selected._values = [value for value, k in zip(self._values, keep) if k]
+        return selected
+
+    def _fallBack(self):
+        self._values = list(self)
+        self._numerators = array('q')
+        self._denominators = array('q')
+
+
+def _ratio(value) -> tuple[int]:
+    """Return (numerator, denominator) to store a coordinate in a _RatioArray, or None if it is not rational"""
+    if isinstance(value, Fraction):
+        return (value.numerator, value.denominator)
+    if isinstance(value, int):
+        return (value, 0)
+    return None
+
+
+def _index(view) -> int:
+    """Return the index behind a view, or -1 for None"""
+    return -1 if view is None else view._i
+
+
+
+class VertexView(Vertex):
+    """A Vertex backed by a record of a DCELArrays store"""
+    __slots__ = ('_store', '_i')
+
+    def __init__(self, store: DCELArrays, i: int):
+        self._store = store
+        self._i = i
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, VertexView) and other._i == self._i and other._store is self._store
+
+    def __hash__(self) -> int:
+        return hash(self._i)
+
+    @property
+    def degree(self) -> int:
+        return self._store.degree[self._i]
+
+    @degree.setter
+    def degree(self, d: int):
+        self._store.degree[self._i] = d
+
+    def x(self):
+        return self._store.x[self._i]
+
+    def y(self):
+        return self._store.y[self._i]
+
+    def incEdge(self) -> HalfEdgeView:
+        return _halfEdgeView(self._store, self._store.incEdge[self._i])
+
+    def setIncEdge(self, e: HalfEdgeView):
+        self._store.incEdge[self._i] = _index(e)
+
+    def coord(self) -> tuple:
+        return (self._store.x[self._i], self._store.y[self._i])
+
+    def setCoord(self, coord: tuple):
+        store, i = self._store, self._i
+        store.x[i], store.y[i] = coord
+        store.fx[i] = store.fy[i] = math.nan
+
+    def fcoord(self) -> tuple[float]:
+        store, i = self._store, self._i
+        if math.isnan(store.fx[i]):
+            store.fx[i] = _toFloat(store.x[i])
+            store.fy[i] = _toFloat(store.y[i])
+        return (store.fx[i], store.fy[i])
+
+
+
+class HalfEdgeView(HalfEdge):
+    """A HalfEdge backed by a record of a DCELArrays store"""
+    __slots__ = ('_store', '_i')
+
+    def __init__(self, store: DCELArrays, i: int):
+        self._store = store
+        self._i = i
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HalfEdgeView) and other._i == self._i and other._store is self._store
+
+    def __hash__(self) -> int:
+        return hash(self._i)
+
+    def origin(self) -> VertexView:
+        return _vertexView(self._store, self._store.origin[self._i])
+
+    def setOrigin(self, new_origin: VertexView):
+        self._store.origin[self._i] = _index(new_origin)
+
+    def dest(self) -> VertexView:
+        return _vertexView(self._store, self._store.dest[self._i])
+
+    def setDest(self, new_dest: VertexView):
+        self._store.dest[self._i] = _index(new_dest)
+
+    def twin(self) -> HalfEdgeView:
+        return _halfEdgeView(self._store, self._store.twin[self._i])
+
+    def setTwin(self, new_twin: HalfEdgeView):
+        self._store.twin[self._i] = _index(new_twin)
+
+    def boundedFace(self) -> bool:
+        return self._store.bounded[self._i] == 1
+
+    def next(self) -> HalfEdgeView:
+        return _halfEdgeView(self._store, self._store.next[self._i])
+
+    def setNext(self, new_next: HalfEdgeView):
+        self._store.next[self._i] = _index(new_next)
+
+    def prev(self) -> HalfEdgeView:
+        return _halfEdgeView(self._store, self._store.prev[self._i])
+
+    def setPrev(self, new_prev: HalfEdgeView):
+        self._store.prev[self._i] = _index(new_prev)
+
+    def line(self) -> Line:
+        i = self._store.line[self._i]
+        return None if i < 0 else self._store.lines[i]
+
+    def setLine(self, new_line: Line):
+        self._store.line[self._i] = self._store.lineIndex(new_line)
+
+    def face(self) -> FaceView:
+        return _faceView(self._store, self._store.face[self._i])
+
+    def setFace(self, new_face: FaceView):
+        self._store.face[self._i] = _index(new_face)
+
+
+
+class FaceView(Face):
+    """A Face backed by a record of a DCELArrays store"""
+    __slots__ = ('_store', '_i')
+
+    def __init__(self, store: DCELArrays, i: int):
+        self._store = store
+        self._i = i
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FaceView) and other._i == self._i and other._store is self._store
+
+    def __hash__(self) -> int:
+        return hash(self._i)
+
+    def edge(self) -> HalfEdgeView:
+        return _halfEdgeView(self._store, self._store.faceEdge[self._i])
+
+    def setEdge(self, e: HalfEdgeView):
+        self._store.faceEdge[self._i] = _index(e)
+
+
+
+def _vertexView(store: DCELArrays, i: int) -> VertexView:
+    return None if i < 0 else VertexView(store, i)
+
+
+def _halfEdgeView(store: DCELArrays, i: int) -> HalfEdgeView:
+    return None if i < 0 else HalfEdgeView(store, i)
+
+
+def _faceView(store: DCELArrays, i: int) -> FaceView:
+    return None if i < 0 else FaceView(store, i)
+
+
+
 class Line():
     """Represent a line
 
+    The line is stored as integers (a, b, c) with ax + by = c, computed once from the two points. The triple is
+    normalized so that gcd(a, b, c) = 1 and b > 0, or b = 0 and a > 0, which makes it unique for each line.
+
     Attributes:
         p1: an arbitrary point (x1, y1) on the line
         p2: a second distinct arbitrary point (x2, y2) on the line
+        a, b, c: the normalized integer coefficients of ax + by = c
         slope: the slope of the line
         xInt: the x-intercept
         yInt: the y-intercept
     """
+    __slots__ = ('_p1', '_p2', '_a', '_b', '_c', '_approx')
+
     def __init__(self, p1: tuple, p2:tuple):
         self._p1 = p1
         self._p2 = p2
-        self._yInt = None
-        self._xInt = None
-        # if the line is vertical
-        if p2[0] == p1[0]:
-            self._xInt = p2[0]
-        else:
-            self._slope = Fraction(p2[1]-p1[1],p2[0]-p1[0])
-            self._yInt = Fraction(self._p1[1] - self._slope*p1[0])
-            # if not horizontal
-            if self._slope != Fraction(0, 1):
-                self._xInt = Fraction(-self._yInt, self._slope)
-
-        # if the line is not vertical
-        if p2[0] != p1[0]:
-            self._slope = Fraction(p2[1]-p1[1],p2[0]-p1[0])
-            self._yInt = Fraction(self._p1[1] - self._slope*p1[0])
-            # if the line is not horizontal
-            if self._slope != 0:
-                self._xInt = Fraction(self._yInt, (-self._slope))
-
-        # if the line is vertical
-        else:
-            self._xInt = p1[0]
-            self._slope = None
+        # (y2 - y1)x - (x2 - x1)y = (y2 - y1)x1 - (x2 - x1)y1
+        a = p2[1] - p1[1]
+        b = p1[0] - p2[0]
+        c = a*p1[0] + b*p1[1]
+        if a == 0 and b == 0:
+            raise ValueError(f"a line needs two distinct points, got {p1} twice")
+
+        # clear denominators if the points have fractional coordinates
+        if not (type(a) is int and type(b) is int and type(c) is int):
+            a, b, c = Fraction(a), Fraction(b), Fraction(c)
+            d = math.lcm(a.denominator, b.denominator, c.denominator)
+            a, b, c = int(a*d), int(b*d), int(c*d)
+
+        g = math.gcd(a, b, c)
+        if b < 0 or (b == 0 and a < 0):
+            g = -g
+        self._a = a // g
+        self._b = b // g
+        self._c = c // g
+
+        # float copies of (a, b, c) for approxSide
+        self._approx = (_toFloat(self._a), _toFloat(self._b), _toFloat(self._c))
 
 
     def intercept(self, l: Line) -> tuple[Fraction]:
         """Return the intersetion between self and l. If parrallel or equal return None"""
-        # Here we deal with many cases to avoid division by 0
-        # we set the x and y and return at the end
-        if l.isHorizontal():
-            y = l.yInt()
-            if self.isHorizontal():
-                return None
-            else:
-                if self.isVertical():
-                    x = self.xInt()
-                else:
-                    x = Fraction(y - self.yInt(), self.slope())
-        else:
-            if self.isHorizontal():
-                y = self.yInt()
-                if l.isVertical():
-                    x = l.xInt()
-                else:
-                    x = Fraction(y - l.yInt(), l.slope())
-            else:
-                if l.isVertical():
-                    x = l.xInt()
-                    if self.isVertical():
-                        return None
-                    else:
-                        y = Fraction(self.slope()*x + self.yInt())
-                else:
-                    if self.isVertical():
-                        x = self.xInt()
-                        y = Fraction(l.slope()*x + l.yInt())
-                    else:
-                        # neither lines are horizontal or vertical
-                        if l.slope() == self.slope():
-                            return None
-                        else:
-                            x = Fraction(l.yInt() - self.yInt(), self.slope() - l.slope())
-                            y = Fraction(self.slope()*x + self.yInt())
-        return (x, y)
+        # Cramer's rule on a1x + b1y = c1, a2x + b2y = c2
+        det = self._a*l._b - l._a*self._b
+        if det == 0:
+            return None
+        return (Fraction(self._c*l._b - l._c*self._b, det), Fraction(self._a*l._c - l._a*self._c, det))
+
+    def side(self, p: tuple) -> Fraction:
+        """Return a value whose sign tells which side of the line p lies on
+
+        The value is positive above the line (right of it if vertical), negative below (left of it) and 0 on it.
+        """
+        return self._a*p[0] + self._b*p[1] - self._c
+
+    def approxSide(self, p: tuple[float]) -> tuple[float]:
+        """Evaluate side() in floating point for the float coordinates p
+
+        return:
+            (value, error) where |value - side(p)| <= error, so the sign of value is certain if |value| > error
+        """
+        a, b, c = self._approx
+        ax = a*p[0]
+        by = b*p[1]
+        return ax + by - c, 8*_EPS*(abs(ax) + abs(by) + abs(c)) + _TINY
+
+    def coefficients(self) -> tuple[int]:
+        """Return the normalized integer coefficients (a, b, c) of ax + by = c"""
+        return (self._a, self._b, self._c)
+
+    def isParallel(self, l: Line) -> bool:
+        """Return whether l is parallel to (or the same as) self"""
+        return self._a*l._b == l._a*self._b
 
     def isVertical(self) -> bool:
-        return self.yInt() is None
+        return self._b == 0
 
     def isHorizontal(self) -> bool:
-        return self.xInt() is None
+        return self._a == 0
 
     def x1(self) -> Fraction:
         return self._p1[0]
@@ -526,13 +2932,13 @@ class Line():
         return self._p2[1]
 
     def slope(self) -> Fraction:
-        return self._slope
+        return None if self._b == 0 else Fraction(-self._a, self._b)
 
     def yInt(self) -> Fraction:
-        return self._yInt
+        return None if self._b == 0 else Fraction(self._c, self._b)
 
     def xInt(self) -> Fraction:
-        return self._xInt
+        return None if self._a == 0 else Fraction(self._c, self._a)
 
     def toString(self) -> str:
         if self.isVertical():
@@ -0,0 +1,256 @@
+from __future__ import annotations
+from array import array
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .LineArrangement import _EPS, _TINY, Line, _toFloat
+    from .LineSweep import sweepVertices
+except ImportError:
+    from LineArrangement import _EPS, _TINY, Line, _toFloat
+    from LineSweep import sweepVertices
+
+
+class LineRanking:
+    """Answer ranking queries on a set of lines: the k-th line from the top at some x, the number of lines above
+    a point, and the k-levels
+
+    Between two consecutive x of vertices of the arrangement the lines are in a fixed order from the bottom up,
+    and past a vertex only the lines through it change rank. Rather than one order per slab, which would take
+    O(n^3) space, the ranks are kept as persistent arrays in fat node form: for each rank, the line holding it
+    far to the left and the x at which every other line takes it over, in a flat array per field (as the rows
+    of a compressed sparse matrix). That is O(n + sum of the degrees of the vertices) space, built by one pass
+    of sweepVertices, and the line holding a rank at some x is found by binary search over its changes. The x
+    of the changes are kept as floats, and compared exactly (as the crossing of the two lines) only when the
+    float comparison is too close to call.
+
+    Vertical lines have no rank and are left out: kthLineAt never returns them and countAbove does not count
+    them. Copies of a line hold consecutive ranks, and are all reported as the first of them. At the x of a
+    vertex, the lines through it are ranked as just right of it.
+
+    Attributes:
+        lines: the lines ranked, which the indices returned refer to
+        count: the number of lines ranked, those that are not vertical
+
+    Args:
+        lines: a list of lines in the plane
+    """
+    def __init__(self, lines: list[Line]):
+        self.lines = lines
+        ranked = [i for i, line in enumerate(lines) if not line.isVertical()]
+        self.count = len(ranked)
+
+        # far to the left the lines are by decreasing slope -a/b from the bottom up, then by increasing
+        # intercept; past a vertex its lines are by increasing slope, and copies always by index
+        coefficients = {i: lines[i].coefficients() for i in ranked}
+        order = sorted(ranked, key=lambda i: (Fraction(coefficients[i][0], coefficients[i][1]),
+                                              Fraction(coefficients[i][2], coefficients[i][1]), i))
+        slope = {i: Fraction(-coefficients[i][0], coefficients[i][1]) for i in ranked}
+        position = {i: p for p, i in enumerate(order)}
+        firstCopy = {}
+        copyOf = {i: firstCopy.setdefault(coefficients[i], i) for i in ranked}
+        self._firstLine = array('i', [copyOf[i] for i in order])
+
+        changeX = [array('d') for _ in order]
+        changeLine = [array('i') for _ in order]
+        for point, through in sweepVertices(lines):
+            run = [i for i in through if i in position]
+            if len(run) < 2:
+                continue  # a line meeting only vertical lines keeps its rank
+            bottom = min(position[i] for i in run)
+            x = _toFloat(point[0])
+            for p, i in enumerate(sorted(run, key=lambda i: (slope[i], i)), bottom):
+                if order[p] != i:
+                    if copyOf[order[p]] != copyOf[i]:
+                        changeX[p].append(x)
+                        changeLine[p].append(copyOf[i])
+                    order[p] = i
+                    position[i] = p
+
+        # the changes of rank p (from the bottom, starting at 0) are at offsets[p]:offsets[p + 1]
+        self._offsets = array('q', [0])
+        self._changeX = array('d')
+        self._changeLine = array('i')
+        for xs, changed in zip(changeX, changeLine):
+            self._changeX.extend(xs)
+            self._changeLine.extend(changed)
+            self._offsets.append(len(self._changeLine))
+        self._arrays = None  # NumPy views of the arrays above, made on first use by the batch queries
+
+
+    def kthLineAt(self, x, k: int) -> int:
+        """Return the index of the k-th line from the top at x, k = 1 being the top line
+
+        x is compared exactly, with a float taken at its exact value.
+        """
+        return self._lineAt(self._rank(k), Fraction(x) if isinstance(x, float) else x)
+
+
+    def countAbove(self, point: tuple) -> int:
+        """Return the number of lines strictly above the point, in O(log^2 n)
+
+        The point is compared exactly, with float coordinates taken at their exact value.
+        """
+        x, y = (Fraction(c) if isinstance(c, float) else c for c in point)
+        # the ranks from the bottom are sorted by y at x, so find the lowest one above the point
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.lines[self._lineAt(mid, x)].side((x, y)) < 0:
+                hi = mid
+            else:
+                lo = mid + 1
+        return self.count - lo
+
+
+    def kLevel(self, k: int) -> tuple[list[tuple], list[int]]:
+        """Return the k-level, the polyline followed by the k-th line from the top, k = 1 being the upper envelope
+
+        return:
+            the vertices of the polyline from left to right, as Fraction points, and the indices of the lines
+            of its pieces, one more than the vertices: the first piece comes from the left and the last goes on
+            to the right
+        """
+        p = self._rank(k)
+        start, end = self._offsets[p], self._offsets[p + 1]
+        lines = [self._firstLine[p]] + list(self._changeLine[start:end])
+        points = []
+        for i in range(start, end):
+            x = self._exactX(p, i)
+            a, b, c = self.lines[self._changeLine[i]].coefficients()
+            points.append((x, (c - a*x) / b))
+        return points, lines
+
+
+    def kthLineAtMany(self, xs, ks) -> list[int]:
+        """Return kthLineAt(x, k) for each x of a sequence or array and k, a single rank or one per x
+
+        With NumPy available, all the queries search their rank's changes together in floating point, and only
+        those some comparison is too close to call for are answered exactly instead.
+        """
+        if np is None:
+            ks = [ks] * len(xs) if isinstance(ks, int) else ks
+            return [self.kthLineAt(x, k) for x, k in zip(xs, ks)]
+        qx = np.asarray(xs, dtype=float).reshape(-1)
+        ks = np.broadcast_to(np.asarray(ks, dtype=np.int64), qx.shape)
+        if len(qx) and (ks.min() < 1 or ks.max() > self.count):
+            raise ValueError(f"k must be between 1 and {self.count}")
+        lines, uncertain = self._linesAtMany(self.count - ks, qx)
+        results = lines.tolist()
+        for i in np.flatnonzero(uncertain):
+            results[i] = self.kthLineAt(float(qx[i]), int(ks[i]))
+        return results
+
+
+    def countAboveMany(self, points) -> list[int]:
+        """Return countAbove(p) for each point p of an (m, 2) array or sequence of points
+
+        With NumPy available, all the points run the binary search over the ranks together in floating point,
+        with each side test checked against an error bound as in Line.approxSide, and only those some
+        comparison is too close to call for are counted exactly instead.
+        """
+        if np is None:
+            return [self.countAbove(p) for p in points]
+        coords = np.asarray(points, dtype=float).reshape(-1, 2)
+        qx, qy = coords[:, 0], coords[:, 1]
+        _, _, _, _, a, b, c = self._numpyArrays()
+
+        lo = np.zeros(len(coords), dtype=np.int64)
+        hi = np.full(len(coords), self.count, dtype=np.int64)
+        uncertain = np.zeros(len(coords), dtype=bool)
+        searching = np.flatnonzero(lo < hi)
+        while len(searching):
+            mid = (lo[searching] + hi[searching]) // 2
+            lines, unsure = self._linesAtMany(mid, qx[searching])
+            ax, by, cn = a[lines] * qx[searching], b[lines] * qy[searching], c[lines]
+            value = ax + by - cn
+            error = 8 * _EPS * (np.abs(ax) + np.abs(by) + np.abs(cn)) + _TINY
+            unsure |= np.abs(value) <= error
+            uncertain[searching[unsure]] = True
+            above = value < 0
+            hi[searching] = np.where(above, mid, hi[searching])
+            lo[searching] = np.where(above, lo[searching], mid + 1)
+            searching = searching[~unsure]
+            searching = searching[lo[searching] < hi[searching]]
+
+        results = (self.count - lo).tolist()
+        for i in np.flatnonzero(uncertain):
+            results[i] = self.countAbove((float(qx[i]), float(qy[i])))
+        return results
+
+
+    def _rank(self, k: int) -> int:
+        """Return the rank from the bottom of the k-th line from the top"""
+        if not 1 <= k <= self.count:
+            raise ValueError(f"k must be between 1 and {self.count}, got {k}")
+        return self.count - k
+
+
+    def _lineAt(self, p: int, x) -> int:
+        """Return the line holding rank p from the bottom at x, by binary search over the changes of the rank"""
+        lo, hi = self._offsets[p], self._offsets[p + 1]
+        start = lo
+        fx = _toFloat(x)
+        changeX = self._changeX
+        while lo < hi:
+            mid = (lo + hi) // 2
+            d = fx - changeX[mid]
+            if abs(d) > 2 * _EPS * (abs(fx) + abs(changeX[mid])) + _TINY:
+                after = d > 0
+            else:
+                after = x >= self._exactX(p, mid)
+            if after:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._changeLine[lo - 1] if lo > start else self._firstLine[p]
+
+
+    def _exactX(self, p: int, i: int) -> Fraction:
+        """Return the exact x of the i-th change, of rank p: where the line taking the rank over crosses the one
+        holding it before"""
+        before = self._changeLine[i - 1] if i > self._offsets[p] else self._firstLine[p]
+        a1, b1, c1 = self.lines[before].coefficients()
+        a2, b2, c2 = self.lines[self._changeLine[i]].coefficients()
+        return Fraction(c1*b2 - c2*b1, a1*b2 - a2*b1)
+
+
+    def _linesAtMany(self, ranks, qx) -> tuple:
+        """Return the line holding each rank from the bottom at each x, as _lineAt does for all of them at once,
+        and which of them a comparison was too close to call for"""
+        offsets, changeX, changeLine, firstLine, _, _, _ = self._numpyArrays()
+        lo = offsets[ranks]
+        start = lo.copy()
+        hi = offsets[ranks + 1]
+        uncertain = np.zeros(len(qx), dtype=bool)
+        searching = np.flatnonzero(lo < hi)
+        while len(searching):
+            mid = (lo[searching] + hi[searching]) // 2
+            bx = changeX[mid]
+            d = qx[searching] - bx
+            sure = np.abs(d) > 2 * _EPS * (np.abs(qx[searching]) + np.abs(bx)) + _TINY
+            uncertain[searching[~sure]] = True
+            after = d > 0
+            lo[searching] = np.where(after, mid + 1, lo[searching])
+            hi[searching] = np.where(after, hi[searching], mid)
+            searching = searching[sure]
+            searching = searching[lo[searching] < hi[searching]]
+        lines = np.where(lo > start, changeLine[np.maximum(lo - 1, 0)], firstLine[ranks])
+        return lines, uncertain
+
+
+    def _numpyArrays(self) -> tuple:
+        """Return the arrays as NumPy arrays, with the coefficients of every line as floats"""
+        if self._arrays is None:
+            coefficients = np.array([[_toFloat(v) for v in line.coefficients()] for line in self.lines],
+                                    dtype=float).reshape(-1, 3)
+            # with no changes at all, a dummy entry keeps the indexing of _linesAtMany in bounds
+            changeLine = np.frombuffer(self._changeLine, dtype=np.int32) if self._changeLine else np.zeros(1, np.int32)
+            self._arrays = (np.frombuffer(self._offsets, dtype=np.int64), np.frombuffer(self._changeX, dtype=float),
+                            changeLine, np.frombuffer(self._firstLine, dtype=np.int32),
+                            coefficients[:, 0], coefficients[:, 1], coefficients[:, 2])
+        return self._arrays
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from fractions import Fraction
+from math import gcd
+
+try:
+    from .LineArrangement import Line
+except ImportError:
+    from LineArrangement import Line
+
+
+def sweepVertices(lines: list[Line]):
+    """Yield every intersection point of the lines once, in a topological order, without building the arrangement
+
+    This is the topological sweep of Edelsbrunner and Guibas. A cut crosses every line once, as the edges of the
+    arrangement it crosses from the bottom up, and moves past one vertex at a time: a vertex is ready once the
+    edges of all its lines end at it, which makes them a run of the cut, and moving past it reverses the run.
+    The right end of each edge of the cut is found from two horizon trees, the lines extended to the right from
+    the cut until they meet the tree of the lines above them (the upper tree) or below them (the lower one):
+    the edge ends at the nearer of its two ends. Past a vertex only the lines through it get new ends, each by a
+    walk along the boundary of the bay it opens into, and the walks take O(n^2) time in all. A stack holds the
+    positions of the cut where two edges next to each other might end at a ready vertex. The whole sweep takes
+    O(n^2) time and O(n) memory, and handles any number of lines through a point.
+
+    Vertical lines are swept as if the plane were rotated clockwise by a tiny angle, which makes them the
+    steepest lines and orders the points along every line by x, then y. Copies of a line are swept once.
+
+    Each point is yielded as ((x, y), indices), with the coordinates as Fractions and the indices in lines of
+    the lines through it, every copy included, in increasing order. The points come in the order they lie along
+    each line, from left to right, or from the bottom up on a vertical line, and in the order they lie along
+    each level of the arrangement (the edges with the same number of lines below them), but not sorted by x.
+    """
+    # the distinct lines by their coefficients, with the indices of their copies
+    copies = {}
+    for i, line in enumerate(lines):
+        copies.setdefault(line.coefficients(), []).append(i)
+    coefficients = list(copies)
+    indices = [copies[key] for key in coefficients]
+    n = len(coefficients)
+
+    # the lines far to the left, from the bottom up: the vertical lines by decreasing x, then the others by
+    # decreasing slope -a/b, then by increasing intercept c/b
+    def farLeft(j):
+        a, b, c = coefficients[j]
+        return (0, -Fraction(c, a)) if b == 0 else (1, Fraction(a, b), Fraction(c, b))
+    order = sorted(range(n), key=farLeft)
+    position = [0] * n
+    for p, j in enumerate(order):
+        position[j] = p
+
+    # for each line: the left end of its edge in the cut (None far to the left), and where its segment ends in
+    # each horizon tree and the line it ends on (None for a segment going on to the right)
+    start = [None] * n
+    upperEnd, upperLine = [None] * n, [None] * n
+    lowerEnd, lowerLine = [None] * n, [None] * n
+    for p in reversed(range(n)):
+        _walkBay(coefficients, order[p], order[p + 1] if p + 1 < n else None, start, upperEnd, upperLine)
+    for p in range(n):
+        _walkBay(coefficients, order[p], order[p - 1] if p > 0 else None, start, lowerEnd, lowerLine)
+    end = [_nearer(upperEnd[j], lowerEnd[j]) for j in range(n)]
+
+    stack = list(reversed(range(n - 1)))
+    queued = [True] * n
+    while stack:
+        k = stack.pop()
+        queued[k] = False
+        v = end[order[k]]
+        if v is None or end[order[k + 1]] != v:
+            continue
+        # the run of edges ending at v, ready if no line through v is left out of it
+        first, last = k, k + 1
+        while first > 0 and end[order[first - 1]] == v:
+            first -= 1
+        while last + 1 < n and end[order[last + 1]] == v:
+            last += 1
+        if lowerEnd[order[first]] == v or upperEnd[order[last]] == v:
+            continue
+
+        through = sorted(i for j in order[first:last + 1] for i in indices[j])
+        yield (Fraction(v[0], v[2]), Fraction(v[1], v[2])), through
+
+        # past v the run is reversed; the old top line keeps its upper segment and the old bottom line its lower
+        # one, and the others walk their bays, from the top down in the upper tree and from the bottom up in the
+        # lower one, each starting on the segment just found
+        order[first:last + 1] = order[last:first - 1 if first > 0 else None:-1]
+        for p in range(first, last + 1):
+            position[order[p]] = p
+            start[order[p]] = v
+        for p in range(last, first, -1):
+            _walkBay(coefficients, order[p], order[p + 1] if p + 1 < n else None, start, upperEnd, upperLine)
+        for p in range(first, last):
+            _walkBay(coefficients, order[p], order[p - 1] if p > 0 else None, start, lowerEnd, lowerLine)
+        for p in range(first, last + 1):
+            j = order[p]
+            end[j] = _nearer(upperEnd[j], lowerEnd[j])
+
+        for p in (first - 1, last):
+            if 0 <= p < n - 1 and not queued[p]:
+                queued[p] = True
+                stack.append(p)
+
+
+def _walkBay(coefficients: list[tuple[int]], j: int, neighbour: int, start: list, ends: list, delimiters: list):
+    """Set where the segment of line j ends in a horizon tree, by walking the boundary of its bay
+
+    The boundary starts along the segment of neighbour, the line next to j in the cut on the side of the tree,
+    and goes on along the line each segment ends on, until it meets line j past the left end of its edge.
+    """
+    m = neighbour
+    while m is not None:
+        p = _meet(coefficients[j], coefficients[m])
+        if p is not None and (start[j] is None or _after(p, start[j])) and (ends[m] is None or not _after(p, ends[m])):
+            ends[j], delimiters[j] = p, m
+            return
+        m = delimiters[m]
+    ends[j], delimiters[j] = None, None
+
+
+def _meet(line1: tuple[int], line2: tuple[int]) -> tuple[int]:
+    """Return the point where two lines ax + by = c meet as (X, Y, D), for (X/D, Y/D) in lowest terms, or None
+    if they are parallel"""
+    a1, b1, c1 = line1
+    a2, b2, c2 = line2
+    d = a1*b2 - a2*b1
+    if d == 0:
+        return None
+    x, y = c1*b2 - c2*b1, a1*c2 - a2*c1
+    if d < 0:
+        x, y, d = -x, -y, -d
+    g = gcd(x, y, d)
+    return (x // g, y // g, d // g)
+
+
+def _after(p: tuple[int], q: tuple[int]) -> bool:
+    """Return whether p comes after q along a line: further right, or higher on a vertical line"""
+    x1, x2 = p[0]*q[2], q[0]*p[2]
+    return x1 > x2 or (x1 == x2 and p[1]*q[2] > q[1]*p[2])
+
+
+def _nearer(p: tuple[int], q: tuple[int]) -> tuple[int]:
+    """Return the first of two points along a line, with None for a point at infinity"""
+    if p is None or (q is not None and _after(p, q)):
+        return q
+    return p
@@ -0,0 +1,361 @@
+from __future__ import annotations
+import random
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .LineArrangement import _EPS, _TINY, Face, HalfEdge, Line, LineArrangement, Vertex, _toFloat
+except ImportError:
+    from LineArrangement import _EPS, _TINY, Face, HalfEdge, Line, LineArrangement, Vertex, _toFloat
+
+
+# kinds of node of the search structure
+_LEAF, _POINT, _SEGMENT = range(3)
+
+
+class PointLocator:
+    """Find the face, edge or vertex of a finished arrangement that a point lies in
+
+    The index is the trapezoidal map of the edges of the arrangement, with its search structure, built by
+    randomized incremental construction as in Computational Geometry: Algorithms and Applications [de Berg,
+    Cheong, van Kreveld, and Overmars], chapter 6. For E edges it takes O(E) space and O(E log E) time to
+    build, and a query visits O(log E) nodes, all in expectation over the insertion order. Points are
+    compared as (x, y) pairs, which is the symbolic shear that book uses for points with the same x and
+    for vertical edges: a vertical edge counts as rising to the right, so the face left of it is above it.
+
+    Every edge is a segment from its lexicographically smaller endpoint p to q, stored with the half edge
+    from p to q, whose face lies above the segment. The face containing a point is then the face above the
+    bottom segment of its trapezoid. The index is a snapshot: after insertLine or removeLine, build a new one.
+
+    Args:
+        arrangement: a constructed LineArrangement
+        seed: seed of the random insertion order
+    """
+    def __init__(self, arrangement: LineArrangement, seed: int = 0):
+        # the bounding box, from the vertices on its boundary
+        corners = [edge.origin().coord() for edge in arrangement.iterPerimeter()]
+        self._box = (min(x for x, y in corners), max(x for x, y in corners),
+                     max(y for x, y in corners), min(y for x, y in corners))
+        left, right, top, bottom = self._box
+
+        # every edge once, as the half edge running from its smaller endpoint to its larger one
+        segments = []
+        for face in arrangement.iterFaces():
+            for edge in face.boundary():
+                if edge.origin().coord() < edge.dest().coord():
+                    segments.append(_Segment(edge))
+                elif edge.twin().face() is None:
+                    segments.append(_Segment(edge.twin()))
+        random.Random(seed).shuffle(segments)
+
+        # the search structure, as parallel lists, starting from the single trapezoid of a rectangle around the box
+        self._kind = []
+        self._item = []
+        self._left = []
+        self._right = []
+        rectangleTop = _Segment(None, (left - 1, top + 1), (right + 1, top + 1))
+        rectangleBottom = _Segment(None, (left - 1, bottom - 1), (right + 1, bottom - 1))
+        self._trapezoid(rectangleTop, rectangleBottom, (left - 1, bottom - 1), (right + 1, top + 1))
+        for segment in segments:
+            self._insert(segment)
+        self._arrays = None
+
+
+    def locate(self, point: tuple) -> Face | HalfEdge | Vertex | None:
+        """Return what contains the point: a Vertex, the HalfEdge of an edge from its smaller endpoint to its
+        larger one, a Face, or None outside the bounding box
+
+        The point is located exactly, with float coordinates taken at their exact value.
+        """
+        point = tuple(Fraction(c) if isinstance(c, float) else c for c in point)
+        left, right, top, bottom = self._box
+        if not (left <= point[0] <= right and bottom <= point[1] <= top):
+            return None
+        kind, item, leftChild, rightChild = self._kind, self._item, self._left, self._right
+        i = 0
+        while kind[i] != _LEAF:
+            if kind[i] == _POINT:
+                coord, vertex = item[i]
+                if point == coord:
+                    return vertex
+                i = rightChild[i] if point > coord else leftChild[i]
+            else:
+                segment = item[i]
+                side = segment.side(point)
+                if side == 0:
+                    return segment.locate(point)
+                i = rightChild[i] if side > 0 else leftChild[i]
+        return item[i].face()
+
+
+    def locateMany(self, points) -> list[Face | HalfEdge | Vertex | None]:
+        """Return locate(p) for each point p of an (m, 2) array or sequence of points
+
+        With NumPy available, all the points walk down the search structure together in floating point, each
+        comparison made only when an error bound shows its sign is certain. The few points some comparison
+        is uncertain for (points on or extremely close to an edge or vertex) are located exactly instead.
+        """
+        if np is None:
+            return [self.locate(p) for p in points]
+        if self._arrays is None:
+            self._arrays = self._flatten()
+        kind, leftChild, rightChild, x, a, b, c, leafFaces = self._arrays
+
+        coords = np.asarray(points, dtype=float).reshape(-1, 2)
+        qx, qy = coords[:, 0], coords[:, 1]
+        left, right, top, bottom = (_toFloat(value) for value in self._box)
+        margin = 4 * _EPS * max(abs(left), abs(right), abs(top), abs(bottom)) + _TINY
+        outside = (qx < left - margin) | (qx > right + margin) | (qy < bottom - margin) | (qy > top + margin)
+        inside = (qx > left + margin) & (qx < right - margin) & (qy > bottom + margin) & (qy < top - margin)
+        uncertain = ~outside & ~inside
+
+        node = np.zeros(len(coords), dtype=np.int64)
+        walking = np.flatnonzero(inside)
+        while len(walking):
+            n = node[walking]
+            px, py = qx[walking], qy[walking]
+            k = kind[n]
+            goRight = np.zeros(len(walking), dtype=bool)
+            sure = np.ones(len(walking), dtype=bool)
+
+            # point nodes: compare x against the rounded vertex x, which only decides if they are far enough
+            # apart (the y only matter for equal x, which is left to locate)
+            isPoint = k == _POINT
+            dx = px - x[n]
+            goRight[isPoint] = (dx > 0)[isPoint]
+            sure[isPoint] = (np.abs(dx) > 2 * _EPS * np.abs(x[n]) + _TINY)[isPoint]
+
+            # segment nodes: the side of the point, as in Line.approxSide
+            isSegment = k == _SEGMENT
+            ax, by, cn = a[n] * px, b[n] * py, c[n]
+            value = ax + by - cn
+            error = 8 * _EPS * (np.abs(ax) + np.abs(by) + np.abs(cn)) + _TINY
+            goRight[isSegment] = (value > 0)[isSegment]
+            sure[isSegment] = (np.abs(value) > error)[isSegment]
+
+            uncertain[walking[~sure]] = True
+            node[walking] = np.where(goRight, rightChild[n], leftChild[n])
+            walking = walking[sure]
+            walking = walking[kind[node[walking]] != _LEAF]
+
+        faces = leafFaces[node]
+        faces[~inside] = None
+        results = faces.tolist()
+        for i in np.flatnonzero(uncertain):
+            results[i] = self.locate((float(qx[i]), float(qy[i])))
+        return results
+
+
+    def _trapezoid(self, top: _Segment, bottom: _Segment, leftp: tuple, rightp: tuple) -> _Trapezoid:
+        """Create a trapezoid and the leaf of the search structure pointing to it"""
+        trapezoid = _Trapezoid(top, bottom, leftp, rightp, len(self._kind))
+        self._kind.append(_LEAF)
+        self._item.append(trapezoid)
+        self._left.append(-1)
+        self._right.append(-1)
+        return trapezoid
+
+
+    def _node(self, kind: int, item, left: int, right: int) -> int:
+        self._kind.append(kind)
+        self._item.append(item)
+        self._left.append(left)
+        self._right.append(right)
+        return len(self._kind) - 1
+
+
+    def _setNode(self, i: int, kind: int, item, left: int, right: int):
+        self._kind[i], self._item[i], self._left[i], self._right[i] = kind, item, left, right
+
+
+    def _findLeft(self, segment: _Segment) -> _Trapezoid:
+        """Return the trapezoid the segment starts in, just right of its left endpoint p
+
+        p counts as right of a point node equal to it, and on a segment it shares p with, the segment is on
+        the side of it that q is.
+        """
+        kind, item, left, right = self._kind, self._item, self._left, self._right
+        p, q = segment.p, segment.q
+        i = 0
+        while kind[i] != _LEAF:
+            if kind[i] == _POINT:
+                i = right[i] if p >= item[i][0] else left[i]
+            else:
+                side = item[i].side(p)
+                if side == 0:
+                    side = item[i].side(q)
+                i = right[i] if side > 0 else left[i]
+        return item[i]
+
+
+    def _insert(self, s: _Segment):
+        """Add a segment to the trapezoidal map and the search structure
+
+        The trapezoids crossed by s are found from the one containing p by moving to the right neighbour below
+        or above the point on the right wall of each, depending on which side of s that point is. Each is
+        replaced by the part of it above s and the part below s, where consecutive parts merge unless the
+        wall between them is on their side of s, and by the parts left of p and right of q at the ends.
+
+        Neighbours: ul and ll are the trapezoids across the left wall above and below leftp (the same one if
+        the wall crosses leftp, None where the wall has no length), ur and lr the same on the right.
+        """
+        crossed = [self._findLeft(s)]
+        while s.q > crossed[-1].rightp:
+            d = crossed[-1]
+            crossed.append(d.lr if s.side(d.rightp) > 0 else d.ur)
+        first, last = crossed[0], crossed[-1]
+
+        # the parts of the first and last trapezoids left of p and right of q
+        A = B = None
+        if s.p != first.leftp:
+            A = self._trapezoid(first.top, first.bottom, first.leftp, s.p)
+            A.ul, A.ll = first.ul, first.ll
+            _replaceRight(first.ul, first, A)
+            _replaceRight(first.ll, first, A)
+        if s.q != last.rightp:
+            B = self._trapezoid(last.top, last.bottom, s.q, last.rightp)
+            B.ur, B.lr = last.ur, last.lr
+            _replaceLeft(last.ur, last, B)
+            _replaceLeft(last.lr, last, B)
+
+        upper = self._trapezoid(first.top, s, s.p, None)
+        lower = self._trapezoid(s, first.bottom, s.p, None)
+        if A is not None:
+            A.ur, A.lr = upper, lower
+            upper.ul = lower.ll = A
+        else:
+            upper.ul, lower.ll = first.ul, first.ll
+            _replaceRight(first.ul, first, upper)
+            _replaceRight(first.ll, first, lower)
+        parts = [(upper, lower)]
+        for prev, d in zip(crossed, crossed[1:]):
+            wall = prev.rightp
+            if s.side(wall) > 0:
+                # the wall now stops at s from above, closing the part above s
+                nextUpper = self._trapezoid(d.top, s, wall, None)
+                upper.rightp = wall
+                upper.ur, upper.lr = prev.ur, nextUpper
+                _replaceLeft(prev.ur, prev, upper)
+                nextUpper.ul, nextUpper.ll = d.ul, upper
+                _replaceRight(d.ul, d, nextUpper)
+                upper = nextUpper
+            else:
+                nextLower = self._trapezoid(s, d.bottom, wall, None)
+                lower.rightp = wall
+                lower.ur, lower.lr = nextLower, prev.lr
+                _replaceLeft(prev.lr, prev, lower)
+                nextLower.ul, nextLower.ll = lower, d.ll
+                _replaceRight(d.ll, d, nextLower)
+                lower = nextLower
+            parts.append((upper, lower))
+        upper.rightp = lower.rightp = s.q
+        if B is not None:
+            upper.ur = lower.lr = B
+            B.ul, B.ll = upper, lower
+        else:
+            upper.ur, lower.lr = last.ur, last.lr
+            _replaceLeft(last.ur, last, upper)
+            _replaceLeft(last.lr, last, lower)
+
+        # the leaf of each crossed trapezoid becomes a test against s, behind tests against p and q at the ends
+        for i, (d, (upper, lower)) in enumerate(zip(crossed, parts)):
+            node = (_SEGMENT, s, lower.node, upper.node)
+            if i == len(crossed) - 1 and B is not None:
+                node = (_POINT, (s.q, s.edge.dest()), self._node(*node), B.node)
+            if i == 0 and A is not None:
+                node = (_POINT, (s.p, s.edge.origin()), A.node, self._node(*node))
+            self._setNode(d.node, *node)
+
+
+    def _flatten(self) -> tuple:
+        """Return the search structure as NumPy arrays for locateMany
+
+        return:
+            the kind and the two children of each node, the rounded x of the point of each point node, the
+            coefficients (a, b, c) of each segment node, made to give the side above a positive sign, and the
+            face of each leaf, in an object array
+        """
+        count = len(self._kind)
+        x, a, b, c = (np.zeros(count) for _ in range(4))
+        leafFaces = np.empty(count, dtype=object)
+        for i, (kind, item) in enumerate(zip(self._kind, self._item)):
+            if kind == _POINT:
+                x[i] = _toFloat(item[0][0])
+            elif kind == _SEGMENT:
+                a[i], b[i], c[i] = (item.sign * _toFloat(v) for v in item.line.coefficients())
+            else:
+                leafFaces[i] = item.face()
+        return (np.array(self._kind, dtype=np.int8), np.array(self._left), np.array(self._right),
+                x, a, b, c, leafFaces)
+
+
+
+class _Segment:
+    """An edge of the arrangement as a segment from its smaller endpoint p to its larger endpoint q
+
+    Attributes:
+        edge: the half edge from p to q, with the face above the segment, or None for the rectangle's sides
+        line: the line the segment lies on
+        sign: 1, or -1 if the segment is vertical, so that sign * line.side is positive above the segment
+    """
+    __slots__ = ('edge', 'p', 'q', 'line', 'sign')
+
+    def __init__(self, edge: HalfEdge, p: tuple = None, q: tuple = None):
+        self.edge = edge
+        if edge is not None:
+            p, q = edge.origin().coord(), edge.dest().coord()
+        self.p, self.q = p, q
+        self.line = Line(p, q) if edge is None else edge.line()
+        self.sign = -1 if self.line.isVertical() else 1
+
+    def side(self, point: tuple):
+        """Return a value positive if point is above the segment, negative if below and 0 if on its line"""
+        return self.sign * self.line.side(point)
+
+    def locate(self, point: tuple) -> HalfEdge | Vertex:
+        """Return the endpoint equal to point, or the half edge if point is inside the segment"""
+        if point == self.p:
+            return self.edge.origin()
+        if point == self.q:
+            return self.edge.dest()
+        return self.edge
+
+
+
+class _Trapezoid:
+    """A trapezoid of the map, between two segments and the vertical walls through leftp and rightp"""
+    __slots__ = ('top', 'bottom', 'leftp', 'rightp', 'ul', 'll', 'ur', 'lr', 'node')
+
+    def __init__(self, top: _Segment, bottom: _Segment, leftp: tuple, rightp: tuple, node: int):
+        self.top = top
+        self.bottom = bottom
+        self.leftp = leftp
+        self.rightp = rightp
+        self.ul = self.ll = self.ur = self.lr = None
+        self.node = node
+
+    def face(self) -> Face:
+        """Return the face the trapezoid is part of, the one above its bottom segment"""
+        return None if self.bottom.edge is None else self.bottom.edge.face()
+
+
+def _replaceLeft(t: _Trapezoid, old: _Trapezoid, new: _Trapezoid):
+    """Make the left neighbour pointers of t that point to old point to new"""
+    if t is not None:
+        if t.ul is old:
+            t.ul = new
+        if t.ll is old:
+            t.ll = new
+
+
+def _replaceRight(t: _Trapezoid, old: _Trapezoid, new: _Trapezoid):
+    """Make the right neighbour pointers of t that point to old point to new"""
+    if t is not None:
+        if t.ur is old:
+            t.ur = new
+        if t.lr is old:
+            t.lr = new
@@ -0,0 +1,228 @@
+from __future__ import annotations
+import math
+import random
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    from .LineArrangement import Face, Line, LineArrangement, maxConcurrency
+except ImportError:
+    from LineArrangement import Face, Line, LineArrangement, maxConcurrency
+
+
+class QLinesSolver:
+    """Find a point where at least Q of a set of lines meet, by recursing into the regions of small arrangements
+
+    This is the recursion of doc/plan.txt. From the lines left, k are sampled and their arrangement is built. A
+    point on Q lines either lies on one of the k lines, which is checked directly by intersecting each of them
+    with every other line (a boundary solution), or lies inside a face R of the arrangement, where all the lines
+    through it cross R. Each other line is assigned to the faces it crosses, the set s(R), and the search
+    recurses into every s(R) holding at least Q lines, stopping at the first point found. As the k lines cross
+    no face, every level has at least k lines fewer. Sets of at most baseSize lines are solved classically
+    with maxConcurrency.
+
+    The sets s(R) are found in one pass by walking each line through its zone in the arrangement (see
+    LineArrangement.crossingLines), which is built in a box holding every intersection point of the set, so
+    that a point on Q lines is inside the box and so are the parts of R the lines through it cross.
+
+    Copies of a line count once per copy, as in maxConcurrency. The points returned are Fractions.
+
+    Attributes:
+        arrangements: the sample arrangements built
+        regionsSearched: the sets s(R) recursed into
+        pruned: the faces skipped for being crossed by fewer than Q lines
+        classical: the sets solved with maxConcurrency
+
+    Args:
+        lines: the lines to search
+        k: the number of lines sampled at each level, by default the square root of the number of lines left;
+            the sets shrink by a factor of about k/2 per level while their number grows by about k^2/2, so a
+            small fixed k (below 4 or so) makes the search take exponential time
+        baseSize: the largest set of lines solved classically
+        workers: the number of processes the sets of the first level are searched in
+        seed: seed of the samples
+        arithmetic, storage: as for LineArrangement, for the sample arrangements
+    """
+    def __init__(self, lines: list[Line], k: int = None, baseSize: int = 256, workers: int = 1, seed: int = 0,
+                 arithmetic: str = "filtered", storage: str = "objects"):
+        self.k = k
+        self.baseSize = baseSize
+        self.workers = workers
+        self.seed = seed
+        self.arithmetic = arithmetic
+        self.storage = storage
+
+        self.arrangements = 0
+        self.regionsSearched = 0
+        self.pruned = 0
+        self.classical = 0
+
+        # the distinct lines with their numbers of copies; sets of lines are lists of indices into these
+        index = {}
+        self._lines = []
+        self._copies = []
+        for line in lines:
+            key = line.coefficients()
+            i = index.get(key)
+            if i is None:
+                index[key] = len(self._lines)
+                self._lines.append(line)
+                self._copies.append(1)
+            else:
+                self._copies[i] += 1
+        self._rng = random.Random(seed)
+
+
+    def solve(self, Q: int) -> tuple | None:
+        """Return a point where at least Q of the lines meet, or None if there is none
+
+        Q must be at least 2.
+        """
+        if Q < 2:
+            raise ValueError(f"Q must be at least 2, got {Q}")
+        return self._solve(list(range(len(self._lines))), Q, self.workers)
+
+
+    def regions(self, lines: list[int], sample: list[int]) -> tuple[LineArrangement, dict[Face, array]]:
+        """Build the arrangement of the sample and assign the other lines to the faces they cross
+
+        Args:
+            lines: a set of lines, as indices into the distinct lines, with at least two intersecting
+            sample: the lines of the set to build the arrangement of, not all parallel
+
+        return:
+            the arrangement, and s(R) for each face R crossed by any line, as an array('i') of indices
+        """
+        box = LineArrangement([self._lines[i] for i in lines], arithmetic=self.arithmetic).extremePoints()
+        LA = LineArrangement([self._lines[i] for i in sample], arithmetic=self.arithmetic, storage=self.storage)
+        LA.constructArrangement(box=box)
+        self.arrangements += 1
+
+        inSample = set(sample)
+        rest = [i for i in lines if i not in inSample]
+        crossed = LA.crossingLines([self._lines[i] for i in rest])
+        return LA, {face: array('i', [rest[j] for j in positions]) for face, positions in crossed.items()}
+
+
+    def _solve(self, lines: list[int], Q: int, workers: int = 1) -> tuple | None:
+        """Return a point on at least Q of the given lines, or None, searching their regions with workers processes"""
+        copies = self._copies
+        if sum(copies[i] for i in lines) < Q:
+            return None
+        if len(lines) <= self.baseSize:
+            self.classical += 1
+            try:
+                degree, point = maxConcurrency([self._lines[i] for i in lines for _ in range(copies[i])])
+            except ValueError:
+                return None  # no two lines intersect
+            return point if degree >= Q else None
+
+        sample = self._sample(lines)
+        if sample is None:
+            return None  # all the lines are parallel
+
+        # boundary solutions, on one of the sampled lines
+        for i in sample:
+            point = self._pointOn(i, lines, Q)
+            if point is not None:
+                return point
+
+        _, crossed = self.regions(lines, sample)
+        subsets = []
+        for subset in crossed.values():
+            if sum(copies[i] for i in subset) >= Q:
+                subsets.append(subset)
+            else:
+                self.pruned += 1
+        # the most crowded regions first, as the likeliest to hold a point
+        subsets.sort(key=len, reverse=True)
+        self.regionsSearched += len(subsets)
+
+        if workers > 1 and len(subsets) > 1:
+            return self._solveParallel(subsets, Q, workers)
+        for subset in subsets:
+            point = self._solve(subset, Q)
+            if point is not None:
+                return point
+        return None
+
+
+    def _sample(self, lines: list[int]) -> list[int]:
+        """Return k random lines of the set, not all parallel, or None if every line of the set is parallel"""
+        k = self.k if self.k is not None else math.isqrt(len(lines))
+        sample = self._rng.sample(lines, min(len(lines), max(2, k)))
+        first = self._lines[sample[0]]
+        if all(self._lines[i].isParallel(first) for i in sample):
+            other = next((i for i in lines if not self._lines[i].isParallel(first)), None)
+            if other is None:
+                return None
+            sample[-1] = other
+        return sample
+
+
+    def _pointOn(self, i: int, lines: list[int], Q: int) -> tuple | None:
+        """Return a point of line i where it meets other lines of the set, Q lines counting copies, or None"""
+        line = self._lines[i]
+        copies = self._copies
+        counts = {}
+        for j in lines:
+            p = line.intercept(self._lines[j])
+            if p is not None:
+                count = counts[p] = counts.get(p, copies[i]) + copies[j]
+                if count >= Q:
+                    return p
+        return None
+
+
+    def _solveParallel(self, subsets: list[list[int]], Q: int, workers: int) -> tuple | None:
+        """Search the sets in a pool of worker processes, returning the first point found
+
+        The distinct lines are sent to each worker once, when the pool starts, and each set as an array of
+        indices into them. Once a point is found it is returned at once: the sets not started yet are cancelled,
+        and the ones being searched are left to finish in the background rather than waited for.
+        """
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_shareSolver, initargs=(self._lines, self._copies))
+        found = False
+        try:
+            pending = {pool.submit(_solveShared, subset, Q, self.k, self.baseSize, self.seed + n,
+                                   self.arithmetic, self.storage) for n, subset in enumerate(subsets)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    point, counters = future.result()
+                    self._count(counters)
+                    if point is not None:
+                        found = True
+                        return point
+            return None
+        finally:
+            # leaving a with block would wait for every set still being searched
+            pool.shutdown(wait=not found, cancel_futures=True)
+
+
+    def _count(self, counters: tuple[int]):
+        """Add the counters of a solver that searched a set for this one"""
+        arrangements, regions, pruned, classical = counters
+        self.arrangements += arrangements
+        self.regionsSearched += regions
+        self.pruned += pruned
+        self.classical += classical
+
+
+# the distinct lines and their copies, in each worker process of QLinesSolver._solveParallel
+_sharedLines = None
+
+
+def _shareSolver(lines: list[Line], copies: list[int]):
+    global _sharedLines
+    _sharedLines = (lines, copies)
+
+
+def _solveShared(indices: array, Q: int, k: int, baseSize: int, seed: int, arithmetic: str,
+                 storage: str) -> tuple:
+    """Search one set of lines in a worker process, returning the point found (or None) and the counters"""
+    lines, copies = _sharedLines
+    solver = QLinesSolver([], k=k, baseSize=baseSize, seed=seed, arithmetic=arithmetic, storage=storage)
+    solver._lines, solver._copies = lines, copies
+    point = solver._solve(list(indices), Q)
+    return point, (solver.arrangements, solver.regionsSearched, solver.pruned, solver.classical)
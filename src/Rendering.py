@@ -0,0 +1,174 @@
+from __future__ import annotations
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.figure import Figure
+except ImportError:
+    Figure = None
+
+try:
+    from .LineArrangement import LineArrangement
+except ImportError:
+    from LineArrangement import LineArrangement
+
+
+def exportArrays(arrangement: LineArrangement) -> dict:
+    """Flatten a constructed arrangement into NumPy arrays of float coordinates, in one traversal of its half edges
+
+    The faces are walked once each, which visits every half edge inside the box, then the perimeter. Each edge
+    is taken once, from the half edge running from its smaller endpoint to its larger one or, on the box, from
+    the half edge inside it, and each vertex at its incEdge().
+
+    return:
+        a dict of arrays:
+            segments: (E, 2, 2) the endpoints of every edge, the sides of the box included
+            segmentLines: (E,) the index in arrangement.lines of the line of each edge (the first, for a line
+                given more than once), or -1 on a side of the box
+            polygons: (C, 2) the corners of every face, counterclockwise, one face after the other in the order
+                of arrangement.faces()
+            faceOffsets: (F + 1,) the corners of face f are polygons[faceOffsets[f]:faceOffsets[f + 1]]
+            vertices: (V, 2) every vertex, the corners of the box included
+            degrees: (V,) the number of lines through each vertex, copies counted
+    """
+    if np is None:
+        raise ImportError("exportArrays needs NumPy")
+    lineIndex = {}
+    for i, line in enumerate(arrangement.lines):
+        lineIndex.setdefault(line, i)
+    segments = array('d')
+    segmentLines = array('i')
+    corners = array('d')
+    faceOffsets = array('q', [0])
+    vertices = array('d')
+    degrees = array('i')
+
+    def visit(edge, x, y):
+        origin, dest = edge.origin(), edge.dest()
+        if origin.incEdge() == edge:
+            vertices.extend((x, y))
+            degrees.append(origin.degree)
+        if not edge.boundedFace():
+            return  # an outside edge, taken from its twin inside the box
+        dx, dy = dest.fcoord()
+        # the exact coordinates break ties between endpoints rounded to the same floats
+        if not edge.twin().boundedFace() or (x, y) < (dx, dy) or ((x, y) == (dx, dy) and origin.coord() < dest.coord()):
+            segments.extend((x, y, dx, dy))
+            segmentLines.append(lineIndex.get(edge.line(), -1))
+
+    for face in arrangement.iterFaces():
+        for edge in arrangement.iterFaceBoundary(face.edge()):
+            x, y = edge.origin().fcoord()
+            corners.extend((x, y))
+            visit(edge, x, y)
+        faceOffsets.append(len(corners) // 2)
+    for edge in arrangement.iterPerimeter():
+        x, y = edge.origin().fcoord()
+        visit(edge, x, y)
+
+    return {"segments": np.frombuffer(segments, dtype=float).reshape(-1, 2, 2),
+            "segmentLines": np.frombuffer(segmentLines, dtype=np.int32),
+            "polygons": np.frombuffer(corners, dtype=float).reshape(-1, 2),
+            "faceOffsets": np.frombuffer(faceOffsets, dtype=np.int64),
+            "vertices": np.frombuffer(vertices, dtype=float).reshape(-1, 2),
+            "degrees": np.frombuffer(degrees, dtype=np.int32)}
+
+
+def drawArrangement(arrangement: LineArrangement, ax=None, arrays: dict = None, emphasize: list[int] = None,
+                    faceValues=None, showVertices: bool = True, zoom: tuple = None, inset: tuple = None):
+    """Draw an arrangement on matplotlib axes, with one collection per layer
+
+    The layers are the faces (a PolyCollection, rasterized in vector formats), the edges (a LineCollection, or
+    two when some lines are emphasized: the other lines dimmed under them) and the intersection points (one
+    scatter, sized and coloured by degree), so drawing takes a handful of calls however large the arrangement is.
+    The edges along each line are drawn as the one segment they make up, which looks the same with n segments
+    instead of O(n^2).
+
+    Args:
+        arrangement: a constructed LineArrangement
+        ax: the axes to draw on, by default those of a new Figure (which needs no display)
+        arrays: the result of exportArrays(arrangement), if already computed
+        emphasize: indices in arrangement.lines of lines to draw on top, with every other line dimmed
+        faceValues: a value per face, in the order of arrangement.faces(), to colour the faces by
+        showVertices: whether to draw the vertices
+        zoom: (left, right, bottom, top) of the region to show, by default the whole bounding box
+        inset: (left, right, bottom, top) of a region to also show enlarged in an inset, in the upper right
+
+    return:
+        the axes drawn on
+    """
+    if Figure is None:
+        raise ImportError("drawArrangement needs matplotlib")
+    if arrays is None:
+        arrays = exportArrays(arrangement)
+    if ax is None:
+        ax = Figure(figsize=(8, 8)).add_subplot()
+    _drawLayers(ax, arrays, emphasize, faceValues, showVertices)
+    ax.set_aspect("equal")
+    ax.set_xticks([])
+    ax.set_yticks([])
+    if zoom is not None:
+        ax.set_xlim(zoom[0], zoom[1])
+        ax.set_ylim(zoom[2], zoom[3])
+    else:
+        ax.autoscale_view()
+    if inset is not None:
+        inner = ax.inset_axes([0.6, 0.6, 0.38, 0.38])
+        _drawLayers(inner, arrays, emphasize, faceValues, showVertices)
+        inner.set_xlim(inset[0], inset[1])
+        inner.set_ylim(inset[2], inset[3])
+        inner.set_xticks([])
+        inner.set_yticks([])
+        ax.indicate_inset_zoom(inner, edgecolor="black")
+    return ax
+
+
+def saveImage(arrangement: LineArrangement, path: str, dpi: int = 150, **options):
+    """Draw an arrangement (see drawArrangement for the options) and write it to path, as PNG, SVG or any other
+    format matplotlib knows from the extension, without a display"""
+    ax = drawArrangement(arrangement, **options)
+    ax.figure.savefig(path, dpi=dpi, bbox_inches="tight")
+
+
+def _drawLayers(ax, arrays: dict, emphasize: list[int], faceValues, showVertices: bool):
+    offsets = arrays["faceOffsets"]
+    # the fills are rasterized in vector formats, where tens of thousands of polygons would dominate the file
+    faces = PolyCollection(np.split(arrays["polygons"], offsets[1:-1]) if len(offsets) > 1 else [],
+                           linewidths=0, facecolors="#e8eef7", zorder=0, rasterized=True)
+    if faceValues is not None:
+        faces.set_array(np.asarray(faceValues, dtype=float))
+        faces.set_cmap("viridis")
+    ax.add_collection(faces)
+
+    segments, segmentLines = _chords(arrays["segments"], arrays["segmentLines"])
+    if emphasize:
+        chosen = np.isin(segmentLines, np.asarray(emphasize, dtype=np.int32))
+        ax.add_collection(LineCollection(segments[~chosen], colors="#b0b0b0", linewidths=0.5, zorder=1))
+        ax.add_collection(LineCollection(segments[chosen], colors="#d62728", linewidths=1.5, zorder=2))
+    else:
+        ax.add_collection(LineCollection(segments, colors="#1f3b73", linewidths=0.6, zorder=1))
+
+    if showVertices:
+        inside = arrays["degrees"] > 1
+        degrees = arrays["degrees"][inside]
+        ax.scatter(arrays["vertices"][inside, 0], arrays["vertices"][inside, 1], s=4 + 4 * (degrees - 2),
+                   c=degrees, cmap="plasma", zorder=3, linewidths=0)
+
+
+def _chords(segments, segmentLines) -> tuple:
+    """Return the segments with the edges of each line joined into one, from its smallest endpoint to its
+    largest, and the sides of the box as they are, with the line of each"""
+    sides = segmentLines < 0
+    ids = np.repeat(segmentLines[~sides], 2)
+    points = segments[~sides].reshape(-1, 2)
+    order = np.lexsort((points[:, 1], points[:, 0], ids))
+    ids, points = ids[order], points[order]
+    lines, first = np.unique(ids, return_index=True)
+    last = np.append(first[1:], len(ids)) - 1
+    chords = np.stack((points[first], points[last]), axis=1)
+    return np.concatenate((chords, segments[sides])), np.concatenate((lines, segmentLines[sides]))
@@ -0,0 +1,72 @@
+import unittest
+
+from src.LineArrangement import *
+from helpers import topology
+
+
+class TestArithmetic(unittest.TestCase):
+    def setUp(self):
+        self.l1 = Line((0, 0), (1, 1))
+        self.l2 = Line((0, -5), (1, 5))
+        self.l3 = Line((Fraction(39, 4), 0), (0, 13))
+        self.l4 = Line((10, 5), (20, 5))
+        self.l5 = Line((13, 0), (13, 100))
+        self.l6 = Line((1, 0), (10, 15))
+        self.l7 = Line((6, 7), (8, 8))
+        self.l8 = Line((14, 0), (11, 6))
+        self.l9 = Line((6, 4), (0, 0))
+
+        self.lineSet1 = [self.l1, self.l2, self.l3, self.l4, self.l5]
+        self.lineSet2 = [self.l6, self.l7, self.l8, self.l9]
+        self.lineSet3 = [self.l1, self.l2, self.l3, self.l4, self.l5, self.l6, self.l7, self.l8, self.l9]
+        self.concurrentSet = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)),
+                              Line((0, 2), (2, 2)), Line((0, 0), (6, 1)), Line((0, 20), (1, 13))]
+
+    def construct(self, lines, arithmetic):
+        LA = LineArrangement(lines, arithmetic=arithmetic)
+        LA.constructArrangement()
+        return LA
+
+    def test_filteredMatchesExact(self):
+        for lines in (self.lineSet1, self.lineSet2, self.lineSet3, self.concurrentSet):
+            exact = self.construct(lines, "exact")
+            filtered = self.construct(lines, "filtered")
+            self.assertEqual(topology(exact), topology(filtered))
+            self.assertEqual(exact.maxIntersection(), filtered.maxIntersection())
+            self.assertEqual(exact.maxIntersectionVertex().coord(), filtered.maxIntersectionVertex().coord())
+
+    def test_float(self):
+        exact = self.construct(self.lineSet2, "exact")
+        approx = self.construct(self.lineSet2, "float")
+        exactEdges, exactVertices = topology(exact)
+        approxEdges, approxVertices = topology(approx)
+        self.assertEqual(len(exactEdges), len(approxEdges))
+        rounded = lambda vertices: sorted((round(float(x), 9), round(float(y), 9), d) for (x, y), d in vertices)
+        self.assertEqual(rounded(exactVertices), rounded(approxVertices))
+
+    def test_edgeIntFallback(self):
+        # (1/3, 1/10) lies on the line exactly, but neither coordinate is representable as a float
+        line = Line((0, 0), (10, 3))
+        edge = HalfEdge(Vertex((Fraction(1, 3), Fraction(1, 10)), None), Vertex((Fraction(1, 3), 5), None), None, None, None, None)
+        for arithmetic in ("exact", "filtered"):
+            LA = LineArrangement(None, arithmetic=arithmetic)
+            self.assertEqual((Fraction(1, 3), Fraction(1, 10)), LA.lineEdgeInt(line, edge))
+
+        # just above the line the filter has to decide the side exactly as well
+        edge = HalfEdge(Vertex((Fraction(1, 3), Fraction(1, 10) + Fraction(1, 10**30)), None), Vertex((Fraction(1, 3), 5), None), None, None, None, None)
+        for arithmetic in ("exact", "filtered"):
+            LA = LineArrangement(None, arithmetic=arithmetic)
+            self.assertIsNone(LA.lineEdgeInt(line, edge))
+
+    def test_approxSide(self):
+        line = Line((0, 0), (10, 3))
+        # -3x + 10y = 0
+        # the bound is 8 units of roundoff of |ax| + |by| + |c|, plus the underflow slack
+        self.assertEqual((7.0, 8 * 2.0**-53 * 13 + 2.0**-1000), line.approxSide((1.0, 1.0)))
+        vertical = Line((2, 0), (2, 1))
+        self.assertEqual((-1.0, 8 * 2.0**-53 * 3 + 2.0**-1000), vertical.approxSide((1.0, 0.0)))
+        self.assertEqual(-1, vertical.side((1, 0)))
+
+    def test_unknownArithmetic(self):
+        with self.assertRaises(ValueError):
+            LineArrangement([], arithmetic="interval")
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.ArrangementCache import *
+from src.LineArrangement import *
+from helpers import spreadLines, topology
+
+
+class TestArrangementCache(unittest.TestCase):
+    def setUp(self):
+        self.lines = spreadLines(8, 0)
+        self.others = spreadLines(8, 1)
+
+    def test_lineSetKey(self):
+        reordered = list(reversed(self.lines))
+        # the same lines through other points
+        respecified = [Line((line.x1(), line.y1()), (2*line.x2() - line.x1(), 2*line.y2() - line.y1()))
+                       for line in self.lines]
+        self.assertEqual(lineSetKey(self.lines), lineSetKey(reordered))
+        self.assertEqual(lineSetKey(self.lines), lineSetKey(respecified))
+        self.assertNotEqual(lineSetKey(self.lines), lineSetKey(self.others))
+        self.assertNotEqual(lineSetKey(self.lines), lineSetKey(self.lines + self.lines[:1]))
+
+    def test_hitsAndMisses(self):
+        cache = ArrangementCache()
+        LA = cache.arrangement(self.lines)
+        self.assertIs(LA, cache.arrangement(list(reversed(self.lines))))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+        expected = LineArrangement(sorted(self.lines, key=Line.coefficients))
+        expected.constructArrangement()
+        self.assertEqual(topology(expected), topology(LA))
+        self.assertEqual(expected.summary(), cache.summary(self.lines))
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+
+        # lines of which no two intersect have a summary but no arrangement
+        parallel = [Line((0, 0), (1, 1)), Line((0, 1), (1, 2))]
+        self.assertEqual((0, 0, 3), cache.summary(parallel))
+        self.assertEqual((0, 0, 3), cache.summary(parallel))
+        with self.assertRaises(ValueError):
+            cache.arrangement(parallel)
+
+    def test_eviction(self):
+        size = 2 * (8 + 4 + 2*8 + 2*28)
+        cache = ArrangementCache(maxHalfEdges=size + 1)
+        first = cache.arrangement(self.lines)
+        self.assertEqual(size, cache.size)
+        cache.arrangement(self.others)
+        self.assertEqual(size, cache.size)
+        self.assertIsNot(first, cache.arrangement(self.lines))
+        self.assertEqual(3, cache.misses)
+
+        # an arrangement over the budget is never kept
+        cache = ArrangementCache(maxHalfEdges=size - 1)
+        cache.arrangement(self.lines)
+        self.assertEqual(0, cache.size)
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ArrangementCache(directory=directory)
+            LA = cache.arrangement(self.lines)
+            self.assertEqual([lineSetKey(self.lines) + "-filtered-arrays.larr"], os.listdir(directory))
+
+            # a new cache finds the arrangement on disk instead of building it again
+            cache = ArrangementCache(directory=directory)
+            loaded = cache.arrangement(self.lines)
+            self.assertEqual((1, 1, 0), (cache.hits, cache.diskHits, cache.misses))
+            self.assertEqual(topology(LA), topology(loaded))
+            self.assertEqual(LA.maxIntersectionVertex().coord(), loaded.maxIntersectionVertex().coord())
+            self.assertEqual(LA.summary(), cache.summary(self.lines))
+
+    def test_directorySettings(self):
+        # caches with other arithmetic or storage share a directory without reading each other's files
+        with tempfile.TemporaryDirectory() as directory:
+            caches = [ArrangementCache(directory=directory, arithmetic=arithmetic, storage=storage)
+                      for arithmetic in ("filtered", "float") for storage in ("arrays", "objects")]
+            for cache in caches:
+                LA = cache.arrangement(self.lines)
+                self.assertEqual((0, 1), (cache.hits, cache.misses))
+                self.assertEqual(cache.arithmetic, LA.arithmetic)
+            self.assertEqual(4, len(os.listdir(directory)))
+
+            for settings in caches:
+                cache = ArrangementCache(directory=directory, arithmetic=settings.arithmetic, storage=settings.storage)
+                LA = cache.arrangement(self.lines)
+                self.assertEqual((1, 1, 0), (cache.hits, cache.diskHits, cache.misses))
+                self.assertEqual(settings.arithmetic, LA.arithmetic)
+
+    def test_directoryCopies(self):
+        lines = self.lines + self.lines[2:4] + self.lines[2:3]
+        expected = LineArrangement(sorted(lines, key=Line.coefficients))
+        expected.constructArrangement()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ArrangementCache(directory=directory)
+            LA = cache.arrangement(lines)
+            loaded = ArrangementCache(directory=directory).arrangement(list(reversed(lines)))
+            for built in (LA, loaded):
+                self.assertEqual(topology(expected), topology(built))
+                self.assertEqual(expected.summary(), built.summary())
+                self.assertEqual(expected.maxIntersectionVertex().coord(), built.maxIntersectionVertex().coord())
+
+            # a write that fails part way leaves nothing behind, under the key or the temporary name
+            def failingSave(arrangement, path):
+                with open(path, "wb") as f:
+                    f.write(b"partial")
+                raise OSError("disk full")
+
+            with mock.patch.object(LineArrangement, "save", failingSave):
+                with self.assertRaises(OSError):
+                    ArrangementCache(directory=directory).arrangement(self.others)
+            self.assertEqual([lineSetKey(lines) + "-filtered-arrays.larr"], os.listdir(directory))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import gc
+import random
+import tracemalloc
+import unittest
+
+from src.LineArrangement import *
+from src.LineArrangement import _RatioArray
+from helpers import halfEdges, topology
+
+
+class TestDCELArrays(unittest.TestCase):
+    def setUp(self):
+        self.l1 = Line((0, 0), (1, 1))
+        self.l2 = Line((0, -5), (1, 5))
+        self.l3 = Line((Fraction(39, 4), 0), (0, 13))
+        self.l4 = Line((10, 5), (20, 5))
+        self.l5 = Line((13, 0), (13, 100))
+        self.l6 = Line((1, 0), (10, 15))
+        self.l7 = Line((6, 7), (8, 8))
+        self.l8 = Line((14, 0), (11, 6))
+        self.l9 = Line((6, 4), (0, 0))
+        self.lineSet = [self.l1, self.l2, self.l3, self.l4, self.l5, self.l6, self.l7, self.l8, self.l9]
+
+        # six lines with four of them through (2, 2)
+        self.concurrentSet = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)),
+                              Line((0, 2), (2, 2)), Line((0, 0), (6, 1)), Line((0, 20), (1, 13))]
+
+    def test_sameTopology(self):
+        for lines in (self.lineSet, self.concurrentSet):
+            objects = LineArrangement(lines)
+            objects.constructArrangement()
+            arrays = LineArrangement(lines, storage="arrays")
+            arrays.constructArrangement()
+            self.assertEqual(topology(objects), topology(arrays))
+            self.assertEqual(objects.maxIntersection(), arrays.maxIntersection())
+            self.assertEqual(objects.maxIntersectionVertex().coord(), arrays.maxIntersectionVertex().coord())
+
+    def test_edgeLines(self):
+        for storage in ("objects", "arrays"):
+            LA = LineArrangement(self.concurrentSet + [Line((3, 0), (3, 1))], storage=storage)
+            LA.constructArrangement()
+            for edge in halfEdges(LA):
+                self.assertIs(edge.line(), edge.twin().line())
+                self.assertEqual(0, edge.line().side(edge.origin().coord()), edge.toString())
+                self.assertEqual(0, edge.line().side(edge.dest().coord()), edge.toString())
+                if edge.boundedFace() and edge.twin().boundedFace():
+                    self.assertTrue(any(edge.line() is line for line in LA.lines), edge.toString())
+
+    def test_boundingBox(self):
+        LA = LineArrangement(None, storage="arrays")
+        LA.boundingBox(0, 10, 10, 0)
+        corners = [(0, 10), (10, 10), (10, 0), (0, 0)]
+        edge = LA.outsideEdge
+        for corner in corners:
+            self.assertEqual(corner, edge.origin().coord())
+            self.assertFalse(edge.boundedFace())
+            self.assertTrue(edge.twin().boundedFace())
+            edge = edge.next()
+        self.assertEqual(LA.outsideEdge, edge)
+        self.assertEqual(4, LA.dcel.vertexCount())
+        self.assertEqual(8, LA.dcel.halfEdgeCount())
+
+    def test_views(self):
+        store = DCELArrays()
+        v1 = store.newVertex((0, 0), None)
+        v2 = store.newVertex((1, 2), None, 3)
+        edge = store.newHalfEdge(v1, v2, None, True, None, None)
+        self.assertIsNone(edge.twin())
+        self.assertEqual(v2, edge.dest())
+        self.assertNotEqual(v1, edge.dest())
+        self.assertEqual(3, edge.dest().degree)
+        edge.dest().degree += 1
+        self.assertEqual(4, v2.degree)
+        v1.setIncEdge(edge)
+        self.assertEqual(edge, v1.incEdge())
+        self.assertEqual("(0, 0)->(1, 2)", edge.toString())
+
+    def test_memory(self):
+        # storage="arrays" takes a fraction of the memory of "objects" (bench_memory gives the numbers, which
+        # depend on the Python version and its allocator)
+        rng = random.Random(0)
+        points = [((rng.randint(-1000, 1000), rng.randint(-1000, 1000)), (rng.randint(1001, 2000), rng.randint(-1000, 1000)))
+                  for _ in range(60)]
+        perHalfEdge = {}
+        for storage in ("objects", "arrays"):
+            lines = [Line(p, q) for p, q in points]
+            gc.collect()
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                LA = LineArrangement(lines, storage=storage)
+                LA.constructArrangement()
+                gc.collect()
+                size = tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+            perHalfEdge[storage] = size / sum(1 for _ in LA.iterHalfEdges())
+        self.assertLess(perHalfEdge["arrays"], perHalfEdge["objects"] / 3)
+
+    def test_ratioArray(self):
+        values = [Fraction(-3, 7), 5, Fraction(2**62, 3)]
+        coordinates = _RatioArray(values)
+        self.assertEqual(values, list(coordinates))
+        self.assertIsInstance(coordinates[1], int)
+        self.assertIsNone(coordinates._values)
+        coordinates[0] = Fraction(1, 2)
+        self.assertEqual(Fraction(1, 2), coordinates[0])
+        self.assertEqual(values[1:], list(coordinates.selected(bytearray([0, 1, 1]))))
+
+        # a value that does not fit in 64 bits, in either part, or a float, turns it into a list of the values
+        for big in (Fraction(2**63, 3), Fraction(1, 2**63), 2**70, 0.5):
+            appended = _RatioArray(values)
+            appended.append(big)
+            self.assertEqual(values + [big], list(appended))
+            changed = _RatioArray(values)
+            changed[1] = big
+            self.assertEqual([values[0], big, values[2]], list(changed))
+            self.assertEqual([values[0], values[2]], list(changed.selected(bytearray([1, 0, 1]))))
+
+        # coordinates past 64 bits in an arrangement
+        LA = LineArrangement([Line((0, 0), (1, 1)), Line((0, 2**70), (1, 2**70 - 1)), Line((0, 1), (1, 1))],
+                             storage="arrays")
+        LA.constructArrangement()
+        self.assertIsNotNone(LA.dcel.x._values)
+        self.assertIn((2**69, 2**69), [v.coord() for v in LA.iterVertices()])
+
+    def test_unknownStorage(self):
+        with self.assertRaises(ValueError):
+            LineArrangement([], storage="numpy")
@@ -0,0 +1,143 @@
+import random
+import unittest
+
+from src.LineArrangement import *
+from helpers import ArrangementAssertions, crowdedLines, innerDegrees, topology
+
+
+class TestDegenerate(ArrangementAssertions, unittest.TestCase):
+    def assertValid(self, LA: LineArrangement):
+        self.assertValidDCEL(LA)
+        self.assertValidFaces(LA)
+
+    def test_copies(self):
+        line = Line((0, 0), (1, 1))
+        LA = LineArrangement([line, Line((0, 1), (1, 0)), Line((0, 0), (2, 2)), line])
+        LA.constructArrangement()
+        self.assertValid(LA)
+        self.assertEqual(4, LA.maxIntersection())
+        self.assertEqual((Fraction(1, 2), Fraction(1, 2)), LA.maxIntersectionVertex().coord())
+        self.assertEqual((4, 1, 4), LA.summary())
+        self.assertEqual(4, LA.faceCount())
+
+        LA.removeLine(line)
+        self.assertEqual(3, LA.maxIntersection())
+        LA.insertLine(Line((1, 0), (0, 1)))
+        self.assertEqual(4, LA.maxIntersection())
+        self.assertEqual((4, 1, 4), LA.summary())
+        self.assertValid(LA)
+
+    def test_copyOrder(self):
+        # (0, 0) and (2, 2) both have degree 3, and (2, 2) is completed first once y = -x counts at its copy
+        lines = [Line((0, 0), (1, 1)), Line((0, 0), (1, -1)), Line((2, 0), (2, 1)), Line((0, 2), (1, 2)),
+                 Line((0, 0), (-1, 1))]
+        cases = [lines]
+        for seed in range(60):
+            lines = crowdedLines(random.Random(seed).randint(3, 8), seed)
+            rng = random.Random(seed)
+            for _ in range(rng.randint(1, 3)):
+                copy = rng.choice(lines)
+                lines.insert(rng.randint(0, len(lines)), Line(copy._p1, copy._p2))
+            if not all(line.isParallel(lines[0]) for line in lines):
+                cases.append(lines)
+
+        for lines in cases:
+            degree, point = maxConcurrency(lines)
+            for storage in ("objects", "arrays"):
+                LA = LineArrangement(list(lines), storage=storage)
+                LA.constructArrangement()
+                inserted = LineArrangement([], storage=storage)
+                for line in lines:
+                    inserted.insertLine(line)
+                for built in (LA, inserted):
+                    self.assertEqual(degree, built.maxIntersection())
+                    self.assertEqual(point, built.maxIntersectionVertex().coord())
+            slabs = LineArrangement(list(lines), storage="arrays")
+            slabs.constructArrangement(workers=2)
+            self.assertEqual(point, slabs.maxIntersectionVertex().coord())
+        self.assertEqual((3, (2, 2)), maxConcurrency(cases[0]))
+
+    def test_cornerLines(self):
+        # the box from the intersection points is [0, 3] x [0, 3], with y = x through two of its corners
+        LA = LineArrangement([Line((0, 0), (1, 1)), Line((0, 2), (2, 0)), Line((0, 4), (4, 0))])
+        LA.constructArrangement()
+        self.assertValid(LA)
+        self.assertEqual([((1, 1), 2), ((2, 2), 2)], innerDegrees(LA))
+        self.assertEqual((2, 2, 6), LA.summary())
+
+        # y = 0, x = 0 and y = x through (0, 0), and x + y = 5
+        LA = LineArrangement([Line((0, 0), (1, 0)), Line((0, 0), (0, 1)), Line((5, 0), (0, 5)), Line((-1, -1), (6, 6))])
+        LA.constructArrangement()
+        self.assertValid(LA)
+        self.assertEqual((3, 4, 10), LA.summary())
+
+        # a box of integers past 2^53, with y = x through two of its corners
+        n = 2**53 + 1
+        LA = LineArrangement([Line((0, 0), (1, 1)), Line((0, n + 2), (1, n + 2))])
+        LA.constructArrangement(box=(n, n + 4, n + 4, n))
+        self.assertValid(LA)
+        self.assertEqual((n - 1, n + 5), LA._box[:2])
+
+    def test_allParallel(self):
+        lines = [Line((0, 0), (1, 1)), Line((0, 1), (1, 2)), Line((0, 1), (2, 3))]
+        with self.assertRaises(ValueError):
+            LineArrangement(lines).constructArrangement()
+        self.assertEqual([(0, 0, 3)], buildMany([lines]))
+
+    def test_crossingLines(self):
+        for seed in range(30):
+            lines = crowdedLines(random.Random(seed).randint(3, 8), seed)
+            if all(line.isParallel(lines[0]) for line in lines):
+                continue
+            # other lines through the grid, the lines themselves, and the sides of a wider box given to build in
+            left, right, top, bottom = LineArrangement(lines).extremePoints()
+            box = (left - 2, right + 2, top + 2, bottom - 2)
+            sides = [Line((box[0], 0), (box[0], 1)), Line((0, box[2]), (1, box[2]))]
+            probes = crowdedLines(15, seed + 100) + lines + sides
+            for storage in ("objects", "arrays"):
+                LA = LineArrangement(list(lines), storage=storage)
+                LA.constructArrangement(box=box)
+                self.assertEqual(box[2:], LA._box[2:])
+                edges = list(LA.iterHalfEdges())
+                crossed = LA.crossingLines(probes)
+                self.assertEqual(edges, list(LA.iterHalfEdges()))
+                for face in LA.iterFaces():
+                    corners = [edge.origin().coord() for edge in face.boundary()]
+                    expected = [i for i, line in enumerate(probes)
+                                if any(line.side(p) > 0 for p in corners) and any(line.side(p) < 0 for p in corners)]
+                    self.assertEqual(expected, list(crossed.get(face, [])))
+
+    def test_random(self):
+        for seed in range(40):
+            lines = crowdedLines(random.Random(seed).randint(3, 10), seed)
+            if all(line.isParallel(lines[0]) for line in lines):
+                continue
+            LA = LineArrangement(list(lines))
+            LA.constructArrangement()
+            self.assertValid(LA)
+            self.assertEqual(maxConcurrency(lines)[0], LA.maxIntersection())
+
+            slabs = LineArrangement(list(lines), storage="arrays")
+            slabs.constructArrangement(workers=2)
+            self.assertEqual(topology(LA), topology(slabs))
+
+            inserted = LineArrangement([], storage="arrays")
+            for line in lines:
+                inserted.insertLine(line)
+            self.assertValid(inserted)
+            self.assertEqual(innerDegrees(LA), innerDegrees(inserted))
+            self.assertEqual(LA.summary(), inserted.summary())
+
+            random.Random(seed).shuffle(lines)
+            while len(lines) > 3:
+                inserted.removeLine(lines.pop())
+                self.assertValid(inserted)
+                if not all(line.isParallel(lines[0]) for line in lines):
+                    expected = LineArrangement(list(lines))
+                    expected.constructArrangement()
+                    self.assertEqual(innerDegrees(expected), innerDegrees(inserted))
+                    self.assertEqual(expected.summary(), inserted.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
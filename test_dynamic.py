@@ -0,0 +1,137 @@
+import random
+import unittest
+
+from src.LineArrangement import *
+from helpers import ArrangementAssertions, smallLines, topology
+
+
+class TestDynamic(ArrangementAssertions, unittest.TestCase):
+    def setUp(self):
+        # six lines with four of them through (2, 2)
+        self.concurrentSet = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)),
+                              Line((0, 2), (2, 2)), Line((0, 0), (6, 1)), Line((0, 20), (1, 13))]
+
+    def rebuild(self, lines: list[Line], box: tuple, storage: str) -> LineArrangement:
+        """Construct the arrangement of lines from scratch in the given bounding box"""
+        LA = LineArrangement(list(lines), storage=storage)
+        LA.boundingBox(*box)
+        for line in lines:
+            LA.addLine(line)
+        return LA
+
+    def test_insertLine(self):
+        for storage in ("objects", "arrays"):
+            for seed in range(10):
+                lines = smallLines(8, seed)
+                LA = LineArrangement([], storage=storage)
+                for line in lines:
+                    LA.insertLine(line)
+                self.assertValidDCEL(LA)
+                expected = self.rebuild(lines, LA._box, storage)
+                self.assertEqual(topology(expected), topology(LA))
+                self.assertEqual(expected.maxIntersection(), LA.maxIntersection())
+
+    def test_insertLineGrowsBox(self):
+        LA = LineArrangement([Line((0, 0), (1, 2)), Line((0, 1), (2, 0))])
+        LA.constructArrangement()
+        # nearly parallel to the first line, meeting it at (100, 200)
+        line = Line((0, Fraction(1, 10)), (100, 200))
+        LA.insertLine(line)
+        left, right, top, bottom = LA._box
+        self.assertTrue(left < 0 and right > 100 and top > 200 and bottom < 0)
+        self.assertValidDCEL(LA)
+        self.assertEqual(topology(self.rebuild(LA.lines, LA._box, "objects")), topology(LA))
+
+        # parallel to every line, and far from the box
+        line = Line((0, 500), (1, 501))
+        LA.insertLine(line)
+        self.assertValidDCEL(LA)
+        self.assertEqual(topology(self.rebuild(LA.lines, LA._box, "objects")), topology(LA))
+
+    def test_insertLineAlongBox(self):
+        # with y = x gone, the box is [-2, 2] x [-1, 1], and y = -1 and y = 1 lie along its bottom and top
+        for storage in ("objects", "arrays"):
+            for y in (-1, 1):
+                diagonal = Line((0, 0), (1, 1))
+                LA = LineArrangement([Line((0, 0), (1, 0)), diagonal], storage=storage)
+                LA.constructArrangement()
+                LA.removeLine(diagonal)
+                LA.insertLine(Line((0, y), (1, y)))
+                _, _, top, bottom = LA._box
+                self.assertTrue(bottom < y < top)
+                self.assertValidDCEL(LA)
+                self.assertEqual(topology(self.rebuild(LA.lines, LA._box, storage)), topology(LA))
+                LA.insertLine(diagonal)
+                self.assertValidDCEL(LA)
+                self.assertEqual(2, LA.maxIntersection())
+
+    def test_removeLine(self):
+        for storage in ("objects", "arrays"):
+            for seed in range(10):
+                lines = smallLines(8, seed)
+                LA = LineArrangement([], storage=storage)
+                for line in lines:
+                    LA.insertLine(line)
+                random.Random(seed).shuffle(lines)
+                while len(lines) > 2:
+                    LA.removeLine(lines.pop())
+                    self.assertValidDCEL(LA)
+                    expected = self.rebuild(lines, LA._box, storage)
+                    self.assertEqual(topology(expected), topology(LA))
+                    self.assertEqual(expected.maxIntersection(), LA.maxIntersection())
+
+    def test_degreeIndexStorage(self):
+        # the linked buckets of storage="arrays" list the vertices in the same order as the dicts of "objects"
+        for seed in range(10):
+            lines = smallLines(8, seed)
+            built = {}
+            for storage in ("objects", "arrays"):
+                LA = LineArrangement([], storage=storage)
+                for line in lines:
+                    LA.insertLine(line)
+                for line in random.Random(seed).sample(lines, 4):
+                    LA.removeLine(line)
+                built[storage] = LA
+            objects, arrays = built["objects"], built["arrays"]
+            self.assertTrue(all(isinstance(bucket, VertexBucket) for bucket in arrays._buckets().values()))
+            self.assertEqual([v.coord() for v in objects.verticesWithDegreeAtLeast(1)],
+                             [v.coord() for v in arrays.verticesWithDegreeAtLeast(1)])
+            self.assertEqual(objects.degreeHistogram(), arrays.degreeHistogram())
+            self.assertEqual(objects.maxIntersectionVertex().coord(), arrays.maxIntersectionVertex().coord())
+
+    def test_removeLineMaxIntersection(self):
+        LA = LineArrangement(list(self.concurrentSet))
+        LA.constructArrangement()
+        self.assertEqual(4, LA.maxIntersection())
+        LA.removeLine(self.concurrentSet[0])
+        self.assertEqual(3, LA.maxIntersection())
+        self.assertEqual((2, 2), LA.maxIntersectionVertex().coord())
+        LA.removeLine(self.concurrentSet[1])
+        self.assertEqual(2, LA.maxIntersection())
+        LA.insertLine(self.concurrentSet[0])
+        self.assertEqual(3, LA.maxIntersection())
+        self.assertEqual((2, 2), LA.maxIntersectionVertex().coord())
+
+    def test_removeMissingLine(self):
+        LA = LineArrangement(list(self.concurrentSet))
+        LA.constructArrangement()
+        with self.assertRaises(ValueError):
+            LA.removeLine(Line((0, 0), (2, 2)))
+
+    def test_removeBeforeBuilt(self):
+        # lines inserted while no two of them intersect are only recorded, and removed the same way
+        line, parallel = Line((0, 0), (1, 1)), Line((0, 1), (1, 2))
+        LA = LineArrangement([])
+        LA.insertLine(line)
+        LA.insertLine(parallel)
+        LA.removeLine(line)
+        self.assertEqual([parallel], LA.lines)
+        with self.assertRaises(ValueError):
+            LA.removeLine(line)
+        LA.insertLine(Line((0, 0), (1, -1)))
+        self.assertValidDCEL(LA)
+        self.assertEqual(2, LA.maxIntersection())
+
+
+if __name__ == '__main__':
+    unittest.main()
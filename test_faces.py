@@ -0,0 +1,92 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.LineArrangement import *
+from helpers import ArrangementAssertions, smallLines, spreadLines
+
+
+class TestFaces(ArrangementAssertions, unittest.TestCase):
+    def setUp(self):
+        # six lines with four of them through (2, 2)
+        self.concurrentSet = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)),
+                              Line((0, 2), (2, 2)), Line((0, 0), (6, 1)), Line((0, 20), (1, 13))]
+
+    def test_construct(self):
+        for storage in ("objects", "arrays"):
+            LA = LineArrangement(None, storage=storage)
+            LA.boundingBox(0, 10, 10, 0)
+            self.assertEqual(1, LA.faceCount())
+            self.assertEqual(4, LA.faces()[0].size())
+
+            for lines in (self.concurrentSet, spreadLines(15, 0)):
+                LA = LineArrangement(list(lines), storage=storage)
+                LA.constructArrangement()
+                self.assertValidFaces(LA)
+
+    def test_insertAndRemove(self):
+        for storage in ("objects", "arrays"):
+            for seed in range(5):
+                lines = smallLines(8, seed)
+                LA = LineArrangement([], storage=storage)
+                for line in lines:
+                    LA.insertLine(line)
+                    if LA.outsideEdge is not None:
+                        self.assertValidFaces(LA)
+                random.Random(seed).shuffle(lines)
+                while len(lines) > 2:
+                    LA.removeLine(lines.pop())
+                    self.assertValidFaces(LA)
+
+    def test_faceTableStorage(self):
+        # the face table of storage="arrays" lists the faces left after removals in the order of "objects"
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in range(5):
+                lines = smallLines(8, seed)
+                built = {}
+                for storage in ("objects", "arrays"):
+                    LA = LineArrangement([], storage=storage)
+                    for line in lines:
+                        LA.insertLine(line)
+                    for line in random.Random(seed).sample(lines, 3):
+                        LA.removeLine(line)
+                    built[storage] = LA
+                self.assertIsInstance(built["arrays"]._faceTable(), FaceTable)
+                path = os.path.join(directory, f"{seed}.bin")
+                built["arrays"].save(path)
+                built["loaded"] = LineArrangement.load(path)
+                sizes = {storage: [face.size() for face in LA.faces()] for storage, LA in built.items()}
+                self.assertEqual(sizes["objects"], sizes["arrays"])
+                self.assertEqual(sizes["objects"], sizes["loaded"])
+                self.assertEqual(len(sizes["objects"]), built["loaded"].faceCount())
+
+    def test_growBox(self):
+        LA = LineArrangement([Line((0, 0), (1, 2)), Line((0, 1), (2, 0))])
+        LA.constructArrangement()
+        LA.insertLine(Line((0, Fraction(1, 10)), (100, 200)))
+        self.assertValidFaces(LA)
+        LA.insertLine(Line((0, 500), (1, 501)))
+        self.assertValidFaces(LA)
+
+    def test_parallel(self):
+        LA = LineArrangement(spreadLines(20, 1), storage="arrays")
+        LA.constructArrangement(workers=3)
+        self.assertValidFaces(LA)
+
+    def test_saveAndLoad(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for storage in ("objects", "arrays"):
+                LA = LineArrangement(list(self.concurrentSet), storage=storage)
+                LA.constructArrangement()
+                path = os.path.join(directory, storage + ".bin")
+                LA.save(path)
+                loaded = LineArrangement.load(path)
+                self.assertEqual(LA.faceCount(), loaded.faceCount())
+                self.assertValidFaces(loaded)
+                self.assertEqual(sorted(face.size() for face in LA.faces()),
+                                 sorted(face.size() for face in loaded.faces()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,4 +47,14 @@ class TestLine(unittest.TestCase):
 
     def test_l2_intersection(self):
         for i, line in enumerate(self.lines):
-            self.assertEqual(self.l2.intercept(line), self.l2Intersections[i], f"Error: l2, l{i+1} intersection is wrong")
\ No newline at end of file
+            self.assertEqual(self.l2.intercept(line), self.l2Intersections[i], f"Error: l2, l{i+1} intersection is wrong")
+
+    def test_coefficients(self):
+        coefficients = [(-1, 1, 0), (-10, 1, -5), (4, 3, 39), (0, 1, 5), (1, 0, 13)]
+        for i, line in enumerate(self.lines):
+            self.assertEqual(coefficients[i], line.coefficients(), f"Error: coefficients wrong for line {i+1}")
+            reverse = Line((line.x2(), line.y2()), (line.x1(), line.y1()))
+            self.assertEqual(coefficients[i], reverse.coefficients(), f"Error: coefficients depend on point order for line {i+1}")
+
+    def test_samePoints(self):
+        self.assertRaises(ValueError, Line, (1, 2), (1, 2))
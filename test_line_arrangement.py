@@ -1,5 +1,7 @@
+import random
 import unittest
 
+import src.LineArrangement
 from src.LineArrangement import *
 
 class TestLine(unittest.TestCase):
@@ -30,6 +32,31 @@ class TestLine(unittest.TestCase):
         test = LineArrangement(self.lineSet3)
         self.assertEqual(test.extremePoints(), (0-1, 24+1, 125+1, -17-1))
 
+    def test_ExtremePoints_pairwise(self):
+        # compare with intersecting every pair, on lines with repeated slopes, horizontals and verticals
+        rng = random.Random(7)
+        for trial in range(20):
+            lines = []
+            for i in range(12):
+                x1, y1 = rng.randint(-6, 6), rng.randint(-6, 6)
+                dx, dy = rng.choice([(0, 1), (1, 0), (1, 1), (2, 1), (1, -3)])
+                lines.append(Line((x1, y1), (x1 + dx, y1 + dy)))
+            points = [p for i, l1 in enumerate(lines) for l2 in lines[i+1:] if (p := l1.intercept(l2)) is not None]
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            expected = (min(xs)-1, max(xs)+1, max(ys)+1, min(ys)-1)
+            self.assertEqual(expected, LineArrangement(lines).extremePoints(), f"Error in trial {trial}")
+
+    def test_ExtremePoints_float(self):
+        expected = LineArrangement(self.lineSet3).extremePoints()
+        result = LineArrangement(self.lineSet3, arithmetic="float").extremePoints()
+        for e, r in zip(expected, result):
+            self.assertAlmostEqual(float(e), r)
+
+    def test_ExtremePoints_parallel(self):
+        test = LineArrangement([Line((0, 0), (1, 1)), Line((0, 1), (1, 2))])
+        self.assertRaises(ValueError, test.extremePoints)
+
     def test_boundingBox_1(self):
          result = self.boundingBoxSetUp(Fraction(5, 9), 13, 125, Fraction(-13, 3))
          self.assertEqual(None, result, result)
@@ -244,34 +271,115 @@ class TestLine(unittest.TestCase):
         result = LA.maxIntersection()
         self.assertEqual(expected, result, f"Error: expected max intersection={expected} but result={result}")
 
-    def perimeterTraversal(self, LA: LineArrangement, start: tuple):
-        """Output a list of visited coordinates on the outside face."""
+    def test_degreeIndex(self):
+        lines = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)),
+                 Line((0, 2), (2, 2)), Line((0, 0), (6, 1)), Line((0, 20), (1, 13)), Line((0, 0), (1, -3))]
+        LA = LineArrangement(lines)
+        LA.constructArrangement()
+
+        # count the degree of every vertex by a traversal of the whole DCEL
+        degrees = {}
+        stack = [LA.outsideEdge]
+        visited = set()
+        while stack:
+            edge = stack.pop()
+            if edge not in visited:
+                visited.add(edge)
+                degrees[edge.origin().coord()] = edge.origin().degree
+                stack.extend((edge.next(), edge.twin()))
+
+        for k in range(1, 6):
+            expected = sorted(coord for coord, degree in degrees.items() if degree >= k)
+            result = sorted(v.coord() for v in LA.verticesWithDegreeAtLeast(k))
+            self.assertEqual(expected, result, f"Error in vertices with degree at least {k}")
+        histogram = {}
+        for degree in degrees.values():
+            if degree > 0:
+                histogram[degree] = histogram.get(degree, 0) + 1
+        self.assertEqual(histogram, LA.degreeHistogram())
+
+        top = LA.topK(3)
+        self.assertEqual((2, 2), top[0].coord())
+        self.assertEqual([4, 3, 2], [v.degree for v in top])
+        self.assertEqual((0, 0), top[1].coord())
+        self.assertEqual(len(degrees) - 4, len(LA.topK(1000)))
+        self.assertEqual([], LA.topK(0))
+
+    def test_maxConcurrency(self):
+        rng = random.Random(5)
+        for trial in range(20):
+            lines = []
+            while len(lines) < 10:
+                p = (rng.randint(-6, 6), rng.randint(-6, 6))
+                q = (rng.randint(-6, 6), rng.randint(-6, 6))
+                if p != q and all(Line(p, q).coefficients() != l.coefficients() for l in lines):
+                    lines.append(Line(p, q))
+            LA = LineArrangement([])
+            for line in lines:
+                LA.insertLine(line)
+            expected = (LA.maxIntersection(), LA.maxIntersectionVertex().coord())
+            self.assertEqual(expected, maxConcurrency(lines), f"Error in trial {trial}")
+
+            coefficients = [line.coefficients() for line in lines]
+            degree, completed, x, y = src.LineArrangement._maxConcurrencyPython(coefficients, [1] * 10, list(range(10)))
+            self.assertEqual(expected, (degree, (x, y)), f"Error in trial {trial}")
+
+    def test_maxConcurrency_copies(self):
+        lines = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)), Line((0, 0), (6, 1)),
+                 Line((0, 1), (6, 2)), Line((0, 0), (6, 1)), Line((0, 2), (6, 3))]
+        self.assertEqual((3, (2, 2)), maxConcurrency(lines))
+        # the copies of y = x/6 meet y = x at the origin, which is completed before (2, 2)
+        self.assertEqual((3, (0, 0)), maxConcurrency(lines[:1] + lines[3:] + lines[1:3]))
+        with self.assertRaises(ValueError):
+            maxConcurrency(lines[3:])
+
+    def test_leftMostEdge_index(self):
+        # the indexed lookup should agree with scanning the whole perimeter as lines are added
+        rng = random.Random(3)
+        lines = []
+        while len(lines) < 25:
+            x1, y1 = rng.randint(-8, 8), rng.randint(-8, 8)
+            dx, dy = rng.choice([(0, 1), (1, 0), (1, 1), (3, 1), (1, -2), (2, 5)])
+            line = Line((x1, y1), (x1 + dx, y1 + dy))
+            if all(line.coefficients() != l.coefficients() for l in lines):
+                lines.append(line)
+        for storage in ("objects", "arrays"):
+            LA = LineArrangement(lines, storage=storage)
+            LA.boundingBox(*LA.extremePoints())
+            for i, line in enumerate(lines):
+                for other in lines:
+                    expected = self.perimeterLeftMostEdge(LA, other)
+                    result = LA.leftMostedge(other)
+                    self.assertEqual(expected.toString(), result.toString(), f"Error in leftmost edge of {other.toString()} after {i} lines")
+                LA.addLine(line)
+
+    def perimeterLeftMostEdge(self, LA: LineArrangement, line: Line) -> HalfEdge:
+        """Find the leftmost outside edge intersecting the line by checking every edge on the perimeter"""
+        leftMostIntersection = None
+        leftMostEdge = None
         edge = LA.outsideEdge
-        # print("\nOutside edge:", edge.toString())
-        while (edge.origin().coord() != start):
+        while True:
+            intersection = LA.lineEdgeInt(line, edge)
+            if intersection is not None and (leftMostIntersection is None or intersection[0] <= leftMostIntersection[0]):
+                leftMostIntersection = intersection
+                leftMostEdge = edge
             edge = edge.next()
+            if edge == LA.outsideEdge:
+                break
+        if leftMostEdge.origin().coord() == leftMostIntersection:
+            leftMostEdge = leftMostEdge.prev()
+        return leftMostEdge
 
-        # print(edge.toString())
-        edgeList = [edge.origin().coord()]
-        edge = edge.next()
-        while edge.origin().coord() != edgeList[0]:
-            edgeList.append(edge.origin().coord())
-            edge = edge.next()
-            # print(f"edge: {edge.toSring()}, {edge}. \nNext edge: {edge.next().toSring()}, {edge.next()}")
-        return edgeList
+    def perimeterTraversal(self, LA: LineArrangement, start: tuple):
+        """Output a list of visited coordinates on the outside face."""
+        coords = [edge.origin().coord() for edge in LA.iterPerimeter()]
+        i = coords.index(start)
+        return coords[i:] + coords[:i]
 
 
     def faceTraversal(self, LA: LineArrangement, edge: HalfEdge):
         """traverse the vertices of a face"""
-        vertexList = [edge.origin().coord()]
-        edge = edge.next()
-        count = 0
-        while edge.origin().coord() != vertexList[0]:
-            vertexList.append(edge.origin().coord())
-            edge = edge.next()
-            count +=1
-
-        return vertexList
+        return [e.origin().coord() for e in LA.iterFaceBoundary(edge)]
 
 
     def lineTraversal(self, LA: LineArrangement, line: Line) -> list[tuple]:
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from src.LineArrangement import *
+from src.LineRanking import *
+from helpers import crowdedLines, spreadLines
+
+
+def bruteOrder(lines: list[Line], x) -> list[int]:
+    """Return the ranked lines from the top just right of x, each copy as the first of them"""
+    first = {}
+    order = []
+    for i, line in enumerate(lines):
+        if not line.isVertical():
+            a, b, c = line.coefficients()
+            order.append(((c - a*x) / Fraction(b), Fraction(-a, b), i, first.setdefault((a, b, c), i)))
+    return [copy for *_, copy in sorted(order, reverse=True)]
+
+
+class TestLineRanking(unittest.TestCase):
+    def test_queries(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            lines = crowdedLines(rng.randint(1, 12), seed)
+            if seed % 2 == 0:
+                lines += [Line((0, 0), (0, 1)), Line((1, 1), (2, 2))]  # a vertical line and a copy of y = x
+            ranking = LineRanking(lines)
+            xs = [Fraction(rng.randint(-40, 40), rng.randint(1, 6)) for _ in range(20)] + [0, 0.5]
+            for x in xs:
+                order = bruteOrder(lines, Fraction(x))
+                self.assertEqual(order, [ranking.kthLineAt(x, k) for k in range(1, ranking.count + 1)])
+                for y in [Fraction(rng.randint(-40, 40), rng.randint(1, 4)) for _ in range(5)]:
+                    expected = sum(1 for line in lines if not line.isVertical() and line.side((x, y)) < 0)
+                    self.assertEqual(expected, ranking.countAbove((x, y)))
+
+            for k in range(1, ranking.count + 1):
+                points, levelLines = ranking.kLevel(k)
+                self.assertEqual(len(points) + 1, len(levelLines))
+                for point, before, after in zip(points, levelLines, levelLines[1:]):
+                    self.assertEqual(0, lines[before].side(point))
+                    self.assertEqual(0, lines[after].side(point))
+                    self.assertEqual(after, ranking.kthLineAt(point[0], k))
+                    self.assertEqual(before, ranking.kthLineAt(point[0] - Fraction(1, 10**6), k))
+
+    def test_many(self):
+        lines = spreadLines(30, 0)
+        ranking = LineRanking(lines)
+        rng = random.Random(0)
+        left, right = -3000, 3000
+        xs = [rng.uniform(left, right) for _ in range(200)]
+        ks = [rng.randint(1, ranking.count) for _ in xs]
+        points = [(x, rng.uniform(left, right)) for x in xs]
+        self.assertEqual([ranking.kthLineAt(x, k) for x, k in zip(xs, ks)], ranking.kthLineAtMany(xs, ks))
+        self.assertEqual([ranking.kthLineAt(x, 3) for x in xs], ranking.kthLineAtMany(xs, 3))
+        self.assertEqual([ranking.countAbove(p) for p in points], ranking.countAboveMany(points))
+
+        # queries at the vertices themselves, which the floats cannot place
+        vertices = [point for k in range(1, ranking.count + 1) for point in ranking.kLevel(k)[0]][:100]
+        xs = [float(x) for x, _ in vertices]
+        self.assertEqual([ranking.kthLineAt(x, 2) for x in xs], ranking.kthLineAtMany(xs, 2))
+        points = [(float(x), float(y)) for x, y in vertices]
+        self.assertEqual([ranking.countAbove(p) for p in points], ranking.countAboveMany(points))
+
+    def test_errors(self):
+        ranking = LineRanking([Line((0, 0), (1, 1)), Line((0, 0), (0, 1))])
+        self.assertEqual(1, ranking.count)
+        with self.assertRaises(ValueError):
+            ranking.kthLineAt(0, 2)
+        with self.assertRaises(ValueError):
+            ranking.kthLineAtMany([0, 1], 0)
+        self.assertEqual([], LineRanking([]).kthLineAtMany([], 1))
+        self.assertEqual([0], LineRanking([]).countAboveMany([(0, 0)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
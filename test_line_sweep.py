@@ -0,0 +1,57 @@
+import itertools
+import random
+import unittest
+
+from src.LineArrangement import *
+from src.LineSweep import *
+from helpers import crowdedLines, innerDegrees, spreadLines
+
+
+def bruteForce(lines: list[Line]) -> list[tuple]:
+    """Return the intersection points of the lines with the indices of the lines through them, sorted"""
+    points = {}
+    for i, j in itertools.combinations(range(len(lines)), 2):
+        p = lines[i].intercept(lines[j])
+        if p is not None:
+            points.setdefault(p, set()).update((i, j))
+    return sorted((p, sorted(indices)) for p, indices in points.items())
+
+
+class TestLineSweep(unittest.TestCase):
+    def test_degenerate(self):
+        for seed in range(60):
+            lines = crowdedLines(random.Random(seed).randint(1, 14), seed)
+            if seed % 2 == 0:
+                # two copies of x = 0 and another vertical line
+                lines += [Line((0, 0), (0, 1)), Line((2, 0), (2, 5)), Line((0, 0), (0, 3))]
+            swept = list(sweepVertices(lines))
+            self.assertEqual(bruteForce(lines), sorted(swept))
+            self.assertOrderAlongLines(swept)
+
+    def test_arrangement(self):
+        lines = spreadLines(40, 0)
+        LA = LineArrangement(list(lines))
+        LA.constructArrangement()
+        vertices = sorted((point, len(indices)) for point, indices in sweepVertices(lines))
+        self.assertEqual(innerDegrees(LA), vertices)
+
+    def assertOrderAlongLines(self, swept: list[tuple]):
+        # from left to right along every line, and from the bottom up along a vertical one
+        seen = {}
+        for point, indices in swept:
+            for i in indices:
+                seen.setdefault(i, []).append(point)
+        for i, points in seen.items():
+            self.assertEqual(sorted(points), points)
+
+    def test_orderAlongLines(self):
+        self.assertOrderAlongLines(list(sweepVertices(spreadLines(30, 1))))
+
+    def test_noIntersections(self):
+        self.assertEqual([], list(sweepVertices([])))
+        self.assertEqual([], list(sweepVertices([Line((0, 0), (1, 1)), Line((0, 1), (1, 2)), Line((0, 0), (1, 1))])))
+        self.assertEqual([], list(sweepVertices([Line((0, 0), (0, 1)), Line((1, 0), (1, 1))])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from src.LineArrangement import *
+from helpers import halfEdges, spreadLines, topology
+
+
+class TestParallel(unittest.TestCase):
+    def assertSameArrangement(self, serial: LineArrangement, parallel: LineArrangement):
+        self.assertEqual(topology(serial), topology(parallel))
+        self.assertEqual(serial.dcel.halfEdgeCount(), parallel.dcel.halfEdgeCount())
+        self.assertEqual(serial.dcel.vertexCount(), parallel.dcel.vertexCount())
+        self.assertEqual(serial.maxIntersection(), parallel.maxIntersection())
+        self.assertEqual(serial.maxIntersectionVertex().coord(), parallel.maxIntersectionVertex().coord())
+        self.assertEqual([v.coord() for v in serial.verticesWithDegreeAtLeast(1)],
+                         [v.coord() for v in parallel.verticesWithDegreeAtLeast(1)])
+
+    def test_sameAsSerial(self):
+        for seed in range(3):
+            lines = spreadLines(20, seed)
+            serial = LineArrangement(lines, storage="arrays")
+            serial.constructArrangement()
+            for workers in (2, 3):
+                parallel = LineArrangement(lines, storage="arrays")
+                parallel.constructArrangement(workers=workers)
+                self.assertSameArrangement(serial, parallel)
+
+    def test_concurrent(self):
+        # vertices where many lines meet, including vertical and horizontal lines
+        lines = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)), Line((0, 2), (2, 2)),
+                 Line((0, 0), (6, 1)), Line((0, 20), (1, 13)), Line((2, 0), (2, 1)), Line((-3, 0), (-3, 1)),
+                 Line((0, 0), (1, -3)), Line((7, 0), (7, 1)), Line((0, 1), (5, 1))]
+        serial = LineArrangement(lines, storage="arrays")
+        serial.constructArrangement()
+        parallel = LineArrangement(lines, storage="arrays")
+        parallel.constructArrangement(workers=4)
+        self.assertSameArrangement(serial, parallel)
+
+        # the stitched arrangement can still be updated
+        line = Line((0, 3), (1, 5))
+        serial.insertLine(line)
+        parallel.insertLine(line)
+        self.assertEqual(topology(serial), topology(parallel))
+
+    def test_buildMany(self):
+        rng = random.Random(0)
+        lines = spreadLines(30, 1)
+        subsets = [rng.sample(lines, rng.randint(2, 8)) for _ in range(20)]
+        subsets.append([Line((0, 0), (1, 1)), Line((0, 1), (1, 2))])
+        subsets.append([])
+        expected = []
+        for subset in subsets:
+            if all(subset[0].isParallel(line) for line in subset):
+                expected.append((0, 0, len(subset) + 1))
+                continue
+            LA = LineArrangement(subset)
+            LA.constructArrangement()
+            # every bounded face of the DCEL, one per cycle of half edges
+            cycles = set()
+            for edge in halfEdges(LA):
+                if edge.boundedFace():
+                    cycle = [edge]
+                    while cycle[-1].next() != edge:
+                        cycle.append(cycle[-1].next())
+                    cycles.add(frozenset(id(e) for e in cycle))
+            expected.append((LA.maxIntersection(), len(LA.verticesWithDegreeAtLeast(2)), len(cycles)))
+        self.assertEqual(expected, buildMany(subsets))
+        self.assertEqual(expected, buildMany(subsets, workers=2, storage="arrays"))
+
+    def test_needsArrays(self):
+        with self.assertRaises(ValueError):
+            LineArrangement(spreadLines(5, 0)).constructArrangement(workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from src.LineArrangement import *
+from src.PointLocation import *
+from helpers import spreadLines
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def cross(edge: HalfEdge, point: tuple):
+    """Return a value positive if point is left of the half edge, negative if right and 0 if on its line"""
+    (x1, y1), (x2, y2) = edge.origin().coord(), edge.dest().coord()
+    return (x2 - x1) * (point[1] - y1) - (y2 - y1) * (point[0] - x1)
+
+
+def bruteLocate(LA: LineArrangement, point: tuple):
+    """Return what contains the point, found by testing every vertex, edge and face, in a comparable form"""
+    edges = [edge for face in LA.faces() for edge in face.boundary()]
+    for edge in edges:
+        if edge.origin().coord() == point:
+            return ("vertex", point)
+    for edge in edges:
+        (x1, y1), (x2, y2) = edge.origin().coord(), edge.dest().coord()
+        if cross(edge, point) == 0 and min(x1, x2) <= point[0] <= max(x1, x2) and min(y1, y2) <= point[1] <= max(y1, y2):
+            return ("edge", frozenset((edge.origin().coord(), edge.dest().coord())))
+    for face in LA.faces():
+        if all(cross(edge, point) > 0 for edge in face.boundary()):
+            return ("face", face)
+    return None
+
+
+def comparable(result):
+    if isinstance(result, Vertex):
+        return ("vertex", result.coord())
+    if isinstance(result, HalfEdge):
+        return ("edge", frozenset((result.origin().coord(), result.dest().coord())))
+    return None if result is None else ("face", result)
+
+
+class TestPointLocation(unittest.TestCase):
+    def queries(self, LA: LineArrangement, rng: random.Random) -> list[tuple]:
+        """Return points on vertices, inside edges, on lines and at random, some outside the box"""
+        points = []
+        for face in LA.faces()[:20]:
+            edge = face.edge()
+            points.append(edge.origin().coord())
+            points.append(tuple((u + v) / 2 for u, v in zip(edge.origin().coord(), edge.dest().coord())))
+        for line in LA.lines[:5]:
+            a, b, c = line.coefficients()
+            points.append((Fraction(c, a), 0) if b == 0 else (0, Fraction(c, b)))
+        left, right, top, bottom = LA._box
+        for _ in range(100):
+            points.append((rng.randint(int(left) - 100, int(right) + 100), rng.randint(int(bottom) - 100, int(top) + 100)))
+        return points
+
+    def test_locate(self):
+        for storage in ("objects", "arrays"):
+            for seed in range(2):
+                LA = LineArrangement(spreadLines(12, seed), storage=storage)
+                LA.constructArrangement()
+                locator = PointLocator(LA, seed=seed)
+                for point in self.queries(LA, random.Random(seed)):
+                    self.assertEqual(bruteLocate(LA, point), comparable(locator.locate(point)), point)
+
+    def test_axisParallelLines(self):
+        lines = [Line((0, 0), (0, 1)), Line((3, 0), (3, 1)), Line((0, 2), (1, 2)), Line((0, 0), (1, 1)),
+                 Line((0, 5), (1, 3))]
+        LA = LineArrangement(lines)
+        LA.constructArrangement()
+        locator = PointLocator(LA)
+        for point in self.queries(LA, random.Random(0)) + [(0, 2), (3, 2), (0, 1), (3, Fraction(5, 2))]:
+            self.assertEqual(bruteLocate(LA, point), comparable(locator.locate(point)), point)
+        self.assertIsNone(locator.locate((LA._box[1] + 1, 0)))
+
+    @unittest.skipIf(np is None, "needs NumPy")
+    def test_locateMany(self):
+        LA = LineArrangement(spreadLines(15, 3), storage="arrays")
+        LA.constructArrangement()
+        locator = PointLocator(LA)
+        points = [(float(x), float(y)) for x, y in self.queries(LA, random.Random(3))]
+        expected = [locator.locate(point) for point in points]
+        self.assertEqual(expected, locator.locateMany(np.array(points)))
+        self.assertEqual(expected, locator.locateMany(points))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import time
+import unittest
+from array import array
+from unittest import mock
+
+from src.LineArrangement import *
+from src.QLinesSolver import *
+import src.QLinesSolver
+from helpers import crowdedLines
+
+
+def slowUnlessFirst(indices, Q, *options):
+    """Stand in for the search of a set in a worker: the set starting with line 0 holds a point at once, any
+    other takes seconds"""
+    if indices[0] == 0:
+        return (0, 0), (0, 0, 0, 0)
+    time.sleep(3)
+    return None, (0, 0, 0, 0)
+
+
+class TestQLinesSolver(unittest.TestCase):
+    def assertSolves(self, lines: list[Line], **options):
+        try:
+            best = maxConcurrency(lines)[0]
+        except ValueError:
+            best = 0
+        for Q in sorted({2, 3, 4, best, best + 1} - {0, 1}):
+            point = QLinesSolver(lines, **options).solve(Q)
+            if Q <= best:
+                self.assertIsNotNone(point, (Q, best))
+                self.assertGreaterEqual(sum(1 for line in lines if line.side(point) == 0), Q)
+            else:
+                self.assertIsNone(point, (Q, best))
+
+    def test_solve(self):
+        for seed in range(30):
+            rng = random.Random(seed)
+            lines = crowdedLines(rng.randint(5, 60), seed, rng.choice([3, 10, 100]))
+            self.assertSolves(lines, k=rng.choice([None, 4, 8]), baseSize=rng.choice([4, 8]), seed=seed)
+
+    def test_parallelAndCopies(self):
+        parallel = [Line((0, i), (1, i + 2)) for i in range(10)]
+        self.assertIsNone(QLinesSolver(parallel, baseSize=2).solve(2))
+        line = Line((0, 0), (1, 1))
+        lines = parallel + [line, Line((0, 0), (3, 3)), line]
+        self.assertEqual(3, maxConcurrency(lines)[0] - 1)
+        self.assertSolves(lines, baseSize=2)
+
+    def test_workers(self):
+        lines = crowdedLines(60, 1, 10)
+        self.assertSolves(lines, k=6, baseSize=8, workers=2)
+
+    def test_workersStopEarly(self):
+        # the search returns with the first point, without waiting for the set still being searched
+        solver = QLinesSolver(crowdedLines(10, 0, 3))
+        with mock.patch.object(src.QLinesSolver, "_solveShared", slowUnlessFirst):
+            start = time.perf_counter()
+            point = solver._solveParallel([array('i', [1]), array('i', [0]), array('i', [2]), array('i', [3])], 2, 2)
+            seconds = time.perf_counter() - start
+        self.assertEqual((0, 0), point)
+        self.assertLess(seconds, 2)
+
+    def test_regions(self):
+        lines = crowdedLines(30, 2, 20)
+        solver = QLinesSolver(lines)
+        indices = list(range(len(solver._lines)))
+        sample = indices[:6]
+        LA, crossed = solver.regions(indices, sample)
+        for face in LA.iterFaces():
+            corners = [edge.origin().coord() for edge in face.boundary()]
+            expected = [i for i in indices[6:]
+                        if any(solver._lines[i].side(p) > 0 for p in corners)
+                        and any(solver._lines[i].side(p) < 0 for p in corners)]
+            self.assertEqual(expected, list(crossed.get(face, [])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from src.LineArrangement import *
+from src.Rendering import *
+from helpers import crowdedLines, halfEdges, spreadLines
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
+
+
+@unittest.skipIf(np is None, "needs NumPy")
+class TestRendering(unittest.TestCase):
+    def test_exportArrays(self):
+        for storage in ("objects", "arrays"):
+            for lines in (spreadLines(15, 0), crowdedLines(10, 3)):
+                LA = LineArrangement(list(lines), storage=storage)
+                LA.constructArrangement()
+                arrays = exportArrays(LA)
+
+                first = {}
+                for i, line in enumerate(lines):
+                    first.setdefault(line.coefficients(), i)
+                sides = set(LA._boxSides)
+                edges = {frozenset((e.origin().fcoord(), e.dest().fcoord())):
+                         -1 if e.line() in sides else first[e.line().coefficients()] for e in halfEdges(LA)}
+                segments = {frozenset(map(tuple, segment)): i
+                            for segment, i in zip(arrays["segments"].tolist(), arrays["segmentLines"].tolist())}
+                self.assertEqual(len(halfEdges(LA)) // 2, len(arrays["segments"]))
+                self.assertEqual(edges, segments)
+
+                offsets = arrays["faceOffsets"].tolist()
+                self.assertEqual(LA.faceCount() + 1, len(offsets))
+                for f, face in enumerate(LA.faces()):
+                    expected = [edge.origin().fcoord() for edge in face.boundary()]
+                    corners = arrays["polygons"][offsets[f]:offsets[f + 1]].tolist()
+                    self.assertEqual(expected, list(map(tuple, corners)))
+
+                vertices = sorted((v.fcoord(), v.degree) for v in LA.iterVertices())
+                exported = zip(map(tuple, arrays["vertices"].tolist()), arrays["degrees"].tolist())
+                self.assertEqual(vertices, sorted(exported))
+
+    @unittest.skipIf(matplotlib is None, "needs matplotlib")
+    def test_saveImage(self):
+        LA = LineArrangement(spreadLines(12, 1))
+        LA.constructArrangement()
+        left, right, top, bottom = (float(v) for v in LA._box)
+        with tempfile.TemporaryDirectory() as directory:
+            png = os.path.join(directory, "arrangement.png")
+            svg = os.path.join(directory, "arrangement.svg")
+            saveImage(LA, png, dpi=50, emphasize=[0, 3], inset=(left, (left + right) / 2, bottom, (top + bottom) / 2))
+            saveImage(LA, svg, faceValues=[face.size() for face in LA.faces()], showVertices=False)
+            with open(png, "rb") as file:
+                self.assertEqual(b"\x89PNG", file.read(4))
+            with open(svg) as file:
+                self.assertIn("<svg", file.read())
+        ax = drawArrangement(LA, zoom=(0, 1, 0, 1))
+        self.assertEqual((0, 1), ax.get_xlim())
+        self.assertEqual(3, len(ax.collections))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+from src.LineArrangement import *
+from helpers import smallLines, topology
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        # six lines with four of them through (2, 2)
+        self.concurrentSet = [Line((0, 0), (2, 2)), Line((0, -8), (2, 2)), Line((0, 22), (2, 2)),
+                              Line((0, 2), (2, 2)), Line((0, 0), (6, 1)), Line((0, 20), (1, 13))]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def roundTrip(self, LA: LineArrangement, name: str = "arrangement.bin") -> LineArrangement:
+        path = os.path.join(self.directory, name)
+        LA.save(path)
+        return LineArrangement.load(path)
+
+    def assertSameArrangement(self, expected: LineArrangement, loaded: LineArrangement):
+        self.assertEqual(topology(expected), topology(loaded))
+        self.assertEqual(expected.maxIntersection(), loaded.maxIntersection())
+        self.assertEqual(expected.maxIntersectionVertex().coord(), loaded.maxIntersectionVertex().coord())
+        self.assertEqual([v.coord() for v in expected.verticesWithDegreeAtLeast(1)],
+                         [v.coord() for v in loaded.verticesWithDegreeAtLeast(1)])
+        self.assertEqual([line.coefficients() for line in expected.lines],
+                         [line.coefficients() for line in loaded.lines])
+
+    def test_roundTrip(self):
+        for storage in ("objects", "arrays"):
+            for lines in (self.concurrentSet, smallLines(12, 3)):
+                LA = LineArrangement(list(lines), storage=storage)
+                LA.constructArrangement()
+                loaded = self.roundTrip(LA)
+                self.assertSameArrangement(LA, loaded)
+                self.assertEqual(LA.degreeHistogram(), loaded.degreeHistogram())
+                # the boundary index is rebuilt, so lines can still be located on the box
+                line = Line((0, 3), (1, 5))
+                self.assertEqual(LA.leftMostedge(line).origin().coord(), loaded.leftMostedge(line).origin().coord())
+
+    def test_copies(self):
+        # the copies of a line are saved as the line the half edges refer to
+        lines = [Line((0, 0), (1, 1)), Line((0, 1), (1, 0)), Line((2, 2), (3, 3))]
+        for storage in ("objects", "arrays"):
+            for lineSet in (lines, self.concurrentSet + self.concurrentSet[:2] + smallLines(5, 4)):
+                LA = LineArrangement(list(lineSet), storage=storage)
+                LA.constructArrangement()
+                loaded = self.roundTrip(LA)
+                self.assertSameArrangement(LA, loaded)
+                self.assertEqual(LA.degreeHistogram(), loaded.degreeHistogram())
+                self.assertEqual(LA.summary(), loaded.summary())
+
+    def test_float(self):
+        LA = LineArrangement(list(self.concurrentSet), arithmetic="float", storage="arrays")
+        LA.constructArrangement()
+        self.assertSameArrangement(LA, self.roundTrip(LA))
+
+    def test_wideCoordinates(self):
+        # coordinates whose numerators and denominators overflow 64-bit integers
+        lines = [Line((0, Fraction(1, 3**50)), (1, 2**70)), Line((0, 0), (1, 1)), Line((0, 5), (1, 3))]
+        LA = LineArrangement(lines)
+        LA.constructArrangement()
+        loaded = self.roundTrip(LA)
+        self.assertSameArrangement(LA, loaded)
+        # a loaded arrangement can be saved again, to another file than the one it is mapped from
+        self.assertSameArrangement(LA, self.roundTrip(loaded, "copy.bin"))
+
+    def test_readOnly(self):
+        LA = LineArrangement(list(self.concurrentSet))
+        LA.constructArrangement()
+        loaded = self.roundTrip(LA)
+        with self.assertRaises(ValueError):
+            loaded.insertLine(Line((0, 3), (1, 5)))
+        with self.assertRaises(ValueError):
+            loaded.removeLine(loaded.lines[0])
+
+    def test_notAnArrangement(self):
+        path = os.path.join(self.directory, "lines.txt")
+        with open(path, "wb") as f:
+            f.write(b"not an arrangement")
+        with self.assertRaises(ValueError):
+            LineArrangement.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
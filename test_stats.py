@@ -0,0 +1,64 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from src.LineArrangement import *
+from src.LineArrangement import _sideFiltered
+from helpers import halfEdges, spreadLines, topology
+
+
+class TestStats(unittest.TestCase):
+    def test_counters(self):
+        for storage in ("objects", "arrays"):
+            for arithmetic in ("filtered", "exact", "float"):
+                lines = spreadLines(15, 0)
+                expected = LineArrangement(lines, arithmetic=arithmetic, storage=storage)
+                expected.constructArrangement()
+                LA = LineArrangement(lines, arithmetic=arithmetic, storage=storage)
+                stats = LA.enableStats()
+                LA.constructArrangement()
+                self.assertEqual(topology(expected), topology(LA))
+
+                self.assertEqual(15, stats.calls["addLine"])
+                self.assertEqual(1, stats.calls["extremePoints"])
+                self.assertEqual(15, len(stats.edgesPerLine))
+                self.assertEqual(stats.sideTests, sum(stats.edgesPerLine))
+                self.assertEqual(LA.faceCount(), stats.facesCreated)
+                self.assertEqual(len(halfEdges(LA)), stats.halfEdgesCreated)
+                self.assertEqual(len({edge.origin() for edge in halfEdges(LA)}), stats.verticesCreated)
+                self.assertGreaterEqual(stats.seconds["addLine"], stats.seconds["faceSplit"])
+                if arithmetic == "float":
+                    self.assertEqual(0, stats.maxBitLength)
+                else:
+                    self.assertGreater(stats.maxBitLength, 10)
+                self.assertIn("faceSplit", stats.report())
+
+    def test_callbackAndDisable(self):
+        LA = LineArrangement(spreadLines(10, 1))
+        events = []
+        stats = LA.enableStats(lambda phase, seconds, stats: events.append(phase))
+        LA.constructArrangement()
+        self.assertEqual(stats.calls["faceSplit"], events.count("faceSplit"))
+        self.assertEqual(sum(stats.calls.values()), len(events))
+
+        LA.disableStats()
+        self.assertIsNone(LA.stats)
+        self.assertNotIn("addLine", LA.__dict__)
+        self.assertIs(_sideFiltered, LA._side)
+        LA.insertLine(Line((0, 1), (3, 7)))
+        self.assertEqual(len(events), sum(stats.calls.values()))
+
+    def test_profileConstruction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "construction.prof")
+            LA = LineArrangement(spreadLines(10, 2))
+            profile = LA.profileConstruction(path)
+            self.assertGreater(LA.faceCount(), 10)
+            functions = {name for _, _, name in pstats.Stats(path).stats}
+            self.assertIn("faceSplit", functions)
+            self.assertIn("constructArrangement", {name for _, _, name in profile.stats})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from src.LineArrangement import *
+from helpers import halfEdges, smallLines, spreadLines
+
+
+class TestTraversal(unittest.TestCase):
+    def assertVisitsAll(self, LA: LineArrangement):
+        expected = halfEdges(LA)
+        edges = list(LA.iterHalfEdges())
+        self.assertEqual(len(expected), len(edges))
+        self.assertEqual(set(expected), set(edges))
+
+        origins = {edge.origin() for edge in expected}
+        vertices = list(LA.iterVertices())
+        self.assertEqual(len(origins), len(vertices))
+        self.assertEqual(origins, set(vertices))
+
+        for v in vertices:
+            incident = list(LA.iterIncidentEdges(v))
+            self.assertEqual({edge for edge in expected if edge.origin() == v}, set(incident))
+            self.assertEqual(len(set(incident)), len(incident))
+
+        self.assertEqual(LA.faces(), list(LA.iterFaces()))
+        for face in LA.iterFaces():
+            self.assertEqual(list(face.boundary()), list(LA.iterFaceBoundary(face.edge())))
+
+    def test_construct(self):
+        for storage in ("objects", "arrays"):
+            for seed in range(3):
+                LA = LineArrangement(spreadLines(15, seed), storage=storage)
+                LA.constructArrangement()
+                self.assertVisitsAll(LA)
+        LA = LineArrangement(spreadLines(15, 0), storage="arrays")
+        LA.constructArrangement(workers=3)
+        self.assertVisitsAll(LA)
+
+    def test_insertAndRemove(self):
+        for storage in ("objects", "arrays"):
+            for seed in range(3):
+                lines = smallLines(8, seed)
+                LA = LineArrangement([], storage=storage)
+                for line in lines:
+                    LA.insertLine(line)
+                self.assertVisitsAll(LA)
+                for line in lines[:5]:
+                    LA.removeLine(line)
+                    self.assertVisitsAll(LA)
+
+    def test_perimeter(self):
+        LA = LineArrangement([Line((0, 1), (4, 9)), Line((3, 0), (0, 12))])
+        LA.boundingBox(0, 10, 10, 0)
+        for line in LA.lines:
+            LA.addLine(line)
+        LA.outsideEdge = next(edge for edge in LA.iterPerimeter() if edge.origin().coord() == (0, 10))
+        self.assertEqual([(0, 10), (Fraction(1, 2), 10), (Fraction(9, 2), 10), (10, 10), (10, 0), (3, 0), (0, 0),
+                          (0, 1)], [edge.origin().coord() for edge in LA.iterPerimeter()])
+        self.assertTrue(all(edge.face() is None for edge in LA.iterPerimeter()))
+
+    def test_loaded(self):
+        LA = LineArrangement(spreadLines(10, 1), storage="arrays")
+        LA.constructArrangement()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "arrangement.bin")
+            LA.save(path)
+            loaded = LineArrangement.load(path)
+            self.assertEqual(LA.faceCount(), sum(1 for _ in loaded.iterFaces()))
+            self.assertIsNotNone(loaded._savedFaces)  # the face table is left unfilled
+            self.assertEqual(sorted(v.coord() for v in LA.iterVertices()),
+                             sorted(v.coord() for v in loaded.iterVertices()))
+            del loaded
+
+
+if __name__ == '__main__':
+    unittest.main()